@@ -1,5 +1,49 @@
-from .api_client import ApiClient
-from .data import User, Post, Comment
-from .menu import Menu
+# The public names are loaded on first access (PEP 562), so that `import app` or `from app import User`
+# does not pull in requests, aiohttp and the menu unless they are used.
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
 
-__all__ = ["ApiClient", "User", "Post", "Comment", "Menu"]
\ No newline at end of file
+if TYPE_CHECKING:
+    from .api_client import ApiClient
+    from .async_client import AsyncApiClient
+    from .cache import ResponseCache, SqliteCache
+    from .data import User, Post, Comment, UserProfile
+    from .hedging import HedgePolicy
+    from .menu import Menu
+    from .scheduler import AdaptiveScheduler
+    from .store import SnapshotStore
+    from .sync import DeltaSync
+    from .tables import CommentTable, PostTable
+
+_MODULES: Dict[str, str] = {
+    "ApiClient": ".api_client",
+    "AsyncApiClient": ".async_client",
+    "ResponseCache": ".cache",
+    "SqliteCache": ".cache",
+    "HedgePolicy": ".hedging",
+    "AdaptiveScheduler": ".scheduler",
+    "User": ".data",
+    "Post": ".data",
+    "Comment": ".data",
+    "UserProfile": ".data",
+    "Menu": ".menu",
+    "PostTable": ".tables",
+    "CommentTable": ".tables",
+    "SnapshotStore": ".store",
+    "DeltaSync": ".sync",
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
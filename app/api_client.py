@@ -1,5 +1,128 @@
+import functools
+import hashlib
+import json
+import time
 import requests
-from typing import Dict
+from requests.adapters import BaseAdapter
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from urllib.parse import urlencode
+
+from app.cache import Cache
+from app.codec import Codec, get_codec
+from app.data import Comment, Post, User, UserProfile
+from app.hedging import HedgePolicy
+from app.instrumentation import (
+    ClientStats,
+    ConnectionTiming,
+    Hook,
+    RequestEvent,
+    TimedHTTPAdapter,
+    request_size,
+    start_timing,
+)
+from app.scheduler import THROTTLED, AdaptiveScheduler, parse_retry_after
+from app.singleflight import SingleFlight
+from app.jsonstream import iter_json_array
+from app.projection import Projection, compile_fields, project
+
+Timeout = Union[float, Tuple[float, float]]
+
+DEFAULT_TIMEOUT: Timeout = (3.05, 30.0)
+
+DEFAULT_PAGE_SIZE = 100
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+
+def to_payload(item: Union[Dict, Post, Comment, User]) -> Dict:
+    """Get the JSON data to send for a dictionary or a model."""
+    return item if isinstance(item, dict) else item.to_json()
+
+
+def request_body(data: Dict) -> Dict:
+    """Drop the fields set to None, which the server would take as values to clear, from a request body."""
+    return {key: value for key, value in data.items() if value is not None}
+
+
+def payload_key(payload: Dict) -> str:
+    """Get a short digest identifying identical payloads, whatever the order of their fields."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def field_projection(
+    fields: Optional[Iterable[str]], as_model: bool = False
+) -> Optional[Projection]:
+    """Get the projection of the `fields` argument of a read method.
+
+    Args:
+        fields (Optional[Iterable[str]]): The dotted paths to keep, None to keep everything.
+        as_model (bool): Whether the method returns models, which need all their fields (default is False).
+
+    Returns:
+        Optional[Projection]: The projection, or None if `fields` is None.
+    """
+    if fields is not None and as_model:
+        raise ValueError("fields cannot be combined with as_model.")
+    return compile_fields(fields)
+
+
+def bulk_summary(results: List[Dict], deduplicated: int, seconds: float) -> Dict:
+    """Summarize the results of a bulk write.
+
+    Args:
+        results (List[Dict]): The created data or the error message of each item.
+        deduplicated (int): The number of items that reused the request of an identical item.
+        seconds (float): The duration of the bulk write.
+
+    Returns:
+        Dict: The number of items, of successes, of failures and of deduplicated items, the number of
+          requests sent, the duration in seconds and the throughput in items per second.
+    """
+    failed = sum(1 for result in results if "error" in result)
+    return {
+        "items": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "deduplicated": deduplicated,
+        "requests": len(results) - deduplicated,
+        "seconds": seconds,
+        "items_per_second": len(results) / seconds if seconds > 0 else 0.0,
+    }
+
+
+class Reply(NamedTuple):
+    """The fully read response of the server.
+
+    Args:
+        status_code (int): The HTTP status code.
+        reason (Optional[str]): The HTTP reason phrase.
+        content (bytes): The raw body.
+        headers (Mapping[str, str]): The response headers.
+    """
+
+    status_code: int
+    reason: Optional[str]
+    content: bytes
+    headers: Mapping[str, str]
 
 
 class ApiClient:
@@ -7,25 +130,315 @@ class ApiClient:
     Client to interact with the JSONPlaceholder API. It includes methods to get, create, update and delete data
     from the JSONPlaceholder API.
 
+    All the methods share a single pooled `requests.Session`, so repeated calls to the same host reuse
+    the already opened keep-alive connections instead of doing a new TCP and TLS handshake every time.
+    The client can be used as a context manager to release the pooled connections when done.
+
+    Reads can optionally go through a `ResponseCache`, or a `SqliteCache` persisted across runs: fresh
+    entries are served without a request, stale ones are revalidated with `If-None-Match`, and successful
+    updates or deletions invalidate the post.
+    They can also be hedged with a `HedgePolicy` to cut the tail latency caused by slow responses. An
+    `AdaptiveScheduler` can pace every request of the client to the rate and concurrency the server accepts.
+    Concurrent reads of the same resource are coalesced: the callers share a single request in flight and
+    all get its result, error included. The bodies are encoded and decoded with a pluggable JSON codec,
+    `orjson` when it is installed.
+
+    Every exchange with the server is described by a `RequestEvent`, with its endpoint template, status,
+    sizes, timings and connection reuse, and passed to the hooks of the client. The events are also
+    aggregated per endpoint into latency histograms and error counts, returned by `stats`.
+
     Args:
         url_adress (str): The base URL for the JSONPlaceholder API.
+        pool_connections (int): The number of per-host connection pools to keep (default is 10).
+        pool_maxsize (int): The maximum number of connections kept open per host (default is 10).
+        keep_alive (bool): Whether connections are kept open between requests (default is True).
+        timeout (Timeout): The default (connect, read) timeout in seconds for every request
+            (default is DEFAULT_TIMEOUT).
+        cache (Optional[Cache]): The `ResponseCache` or `SqliteCache` used for the read methods
+            (default is None).
+        hedge (Optional[HedgePolicy]): The hedging policy of the read methods (default is None).
+        scheduler (Optional[AdaptiveScheduler]): The scheduler pacing all the requests (default is None).
+        hooks (Optional[Iterable[Hook]]): The functions called with the `RequestEvent` of every request
+            (default is None).
+        coalesce (bool): Whether concurrent reads of the same resource share one request (default is True).
+        codec (Optional[Codec]): The JSON codec of the bodies (default is None, `get_codec()`).
+        transport (Optional[BaseAdapter]): The transport adapter of the session, for example a
+            `RecordingTransport` or a `ReplayTransport` (default is None, a pooled `TimedHTTPAdapter`
+            sized by `pool_connections` and `pool_maxsize`).
     """
 
-    def __init__(self, url_adress) -> None:
+    def __init__(
+        self,
+        url_adress: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        timeout: Optional[Timeout] = DEFAULT_TIMEOUT,
+        cache: Optional[Cache] = None,
+        hedge: Optional[HedgePolicy] = None,
+        scheduler: Optional[AdaptiveScheduler] = None,
+        hooks: Optional[Iterable[Hook]] = None,
+        coalesce: bool = True,
+        codec: Optional[Codec] = None,
+        transport: Optional[BaseAdapter] = None,
+    ) -> None:
         self.url = url_adress
+        self.timeout = timeout
+        self.cache = cache
+        self.hedge = hedge
+        self.scheduler = scheduler
+        self.pool_maxsize = pool_maxsize
+        self.codec = get_codec() if codec is None else codec
+        self.hooks: List[Hook] = list(hooks or [])
+        self._stats = ClientStats()
+        self._flights = SingleFlight() if coalesce else None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        if hedge is not None:
+            self._hedge_executor = ThreadPoolExecutor(
+                max_workers=2 * pool_maxsize, thread_name_prefix="hedge"
+            )
+        self.session = requests.Session()
+        adapter = transport
+        if adapter is None:
+            adapter = TimedHTTPAdapter(
+                pool_connections=pool_connections, pool_maxsize=pool_maxsize
+            )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def __enter__(self) -> "ApiClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the session and all the pooled connections."""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def add_hook(self, hook: Hook) -> None:
+        """Call a function with the `RequestEvent` of every request sent from now on.
+
+        Args:
+            hook (Hook): The function to call. It runs on the thread that sent the request.
+        """
+        self.hooks.append(hook)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the statistics of the requests sent so far.
+
+        Returns:
+            Dict[str, Any]: The `endpoints` statistics of `ClientStats.snapshot`, along with the counters of
+              the `hedge` policy, the `scheduler` and the `coalescing` if the client has them.
+        """
+        stats: Dict[str, Any] = {"endpoints": self._stats.snapshot()}
+        if self.hedge is not None:
+            stats["hedge"] = self.hedge.stats()
+        if self.scheduler is not None:
+            stats["scheduler"] = self.scheduler.stats()
+        if self._flights is not None:
+            stats["coalescing"] = self._flights.stats()
+        return stats
+
+    def _emit(self, event: RequestEvent) -> None:
+        """Record an event and pass it to the hooks."""
+        self._stats(event)
+        for hook in self.hooks:
+            hook(event)
+
+    def _emit_error(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        exc: requests.RequestException,
+        start: float,
+        timing: ConnectionTiming,
+    ) -> None:
+        """Record the event of a request that failed without a response."""
+        request = exc.request
+        self._emit(
+            RequestEvent(
+                method,
+                endpoint,
+                url,
+                None,
+                (
+                    request_size(request)
+                    if isinstance(request, requests.PreparedRequest)
+                    else 0
+                ),
+                0,
+                time.perf_counter() - start,
+                dns=timing.dns,
+                connect=timing.connect,
+                reused=timing.reused,
+                error=str(exc),
+            )
+        )
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        endpoint: Optional[str] = None,
+    ) -> Reply:
+        """Send a request through the pooled session, under the scheduler if the client has one.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The path of the endpoint, relative to the base URL.
+            data (Optional[Dict]): The data sent as the JSON body of the request (default is None).
+            headers (Optional[Dict[str, str]]): Extra headers of the request (default is None).
+            endpoint (Optional[str]): The endpoint template reported to the hooks, for example
+                `/posts/{id}` (default is None, the path without its query string).
+
+        Returns:
+            Reply: The response of the server.
+        """
+        url = self.url + path
+        template = path.partition("?")[0] if endpoint is None else endpoint
+        body = None
+        if data is not None:
+            body = self.codec.dumps(request_body(data))
+            headers = {**JSON_HEADERS, **(headers or {})}
+
+        def send() -> Reply:
+            timing = start_timing()
+            start = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method, url, data=body, headers=headers, timeout=self.timeout
+                )
+                content = response.content
+            except requests.RequestException as exc:
+                self._emit_error(method, template, url, exc, start, timing)
+                raise
+            self._emit(
+                RequestEvent(
+                    method,
+                    template,
+                    url,
+                    response.status_code,
+                    request_size(response.request),
+                    len(content),
+                    time.perf_counter() - start,
+                    response.elapsed.total_seconds(),
+                    timing.dns,
+                    timing.connect,
+                    timing.reused,
+                )
+            )
+            return Reply(
+                response.status_code, response.reason, content, response.headers
+            )
+
+        if self.scheduler is None:
+            return send()
+        return self.scheduler.run(send, endpoint=template)
 
-    def get_posts(self, post_id: str) -> Dict:
+    def _get(self, endpoint: str, path: str) -> Reply:
+        """Send a GET request, sharing the request already in flight for the same path if coalescing is on.
+
+        Args:
+            endpoint (str): The endpoint template of the path, for example `/posts/{id}`.
+            path (str): The path of the endpoint, relative to the base URL.
+
+        Returns:
+            Reply: The response of the server, or a 200 reply built from the cache.
+        """
+        if self._flights is None:
+            return self._cached_get(endpoint, path)
+        return self._flights.do(
+            self.url + path, lambda: self._cached_get(endpoint, path)
+        )
+
+    def _cached_get(self, endpoint: str, path: str) -> Reply:
+        """Send a GET request, going through the cache if the client has one.
+
+        Args:
+            endpoint (str): The endpoint template of the path, for example `/posts/{id}`.
+            path (str): The path of the endpoint, relative to the base URL.
+
+        Returns:
+            Reply: The response of the server, or a 200 reply built from the cache.
+        """
+        if self.cache is None:
+            return self._read(endpoint, path)
+        key = self.url + path
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh():
+            return Reply(200, "OK", entry.content, {})
+        headers = None
+        if entry is not None and entry.etag:
+            headers = {"If-None-Match": entry.etag}
+        response = self._read(endpoint, path, headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key, endpoint)
+            return Reply(200, "OK", entry.content, response.headers)
+        if response.status_code == 200:
+            self.cache.set(
+                key, endpoint, response.content, response.headers.get("ETag")
+            )
+        return response
+
+    def _read(
+        self, endpoint: str, path: str, headers: Optional[Dict[str, str]] = None
+    ) -> Reply:
+        """Send an idempotent GET request, hedged if the client has a hedging policy.
+
+        Args:
+            endpoint (str): The endpoint template of the path, for example `/posts/{id}`.
+            path (str): The path of the endpoint, relative to the base URL.
+            headers (Optional[Dict[str, str]]): Extra headers of the request (default is None).
+
+        Returns:
+            Reply: The response of the first attempt to answer.
+        """
+        if self.hedge is None or self._hedge_executor is None:
+            return self._send("GET", path, headers=headers, endpoint=endpoint)
+        return self.hedge.run(
+            lambda: self._send("GET", path, headers=headers, endpoint=endpoint),
+            self._hedge_executor,
+        )
+
+    def _invalidate(self, path: str) -> None:
+        """Drop a path from the cache after a successful write.
+
+        Args:
+            path (str): The path of the endpoint, relative to the base URL.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(self.url + path)
+
+    def get_posts(
+        self,
+        post_id: str,
+        as_model: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Union[Dict, Post]:
         """Get a post based on the post ID.
 
         Args:
             post_id (str): The ID of the post to retrieve.
+            as_model (bool): Whether to return a `Post` instead of a dictionary (default is False).
+            fields (Optional[Iterable[str]]): The dotted paths to keep, such as `["id", "title"]`
+                (default is None, all the fields).
 
         Returns:
             Dict: Dictionary containing the post data if the post is found, otherwise an error message
         """
-        response = requests.get(self.url + "/posts/" + post_id)
+        projection = field_projection(fields, as_model)
+        response = self._get("/posts/{id}", "/posts/" + post_id)
         if response.status_code == 200:
-            return response.json()
+            post = self.codec.loads(response.content)
+            return Post.from_json(post) if as_model else project(post, projection)
         else:
             return {
                 "error": f"Failed to fetch post {post_id}.",
@@ -33,18 +446,30 @@ class ApiClient:
                 "reason": response.reason,
             }
 
-    def get_comments(self, comment_id: str) -> Dict:
+    def get_comments(
+        self,
+        comment_id: str,
+        as_model: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Union[Dict, Comment]:
         """Get a comment based on the comment ID.
 
         Args:
             comment_id (str): The ID of the comment to retrieve.
+            as_model (bool): Whether to return a `Comment` instead of a dictionary (default is False).
+            fields (Optional[Iterable[str]]): The dotted paths to keep, such as `["id", "body"]`
+                (default is None, all the fields).
 
         Returns:
             Dict: Dictionary containing the comment data if the comment is found, otherwise an error message
         """
-        response = requests.get(self.url + "/comments/" + comment_id)
+        projection = field_projection(fields, as_model)
+        response = self._get("/comments/{id}", "/comments/" + comment_id)
         if response.status_code == 200:
-            return response.json()
+            comment = self.codec.loads(response.content)
+            return (
+                Comment.from_json(comment) if as_model else project(comment, projection)
+            )
         else:
             return {
                 "error": f"Failed to fetch comment {comment_id}.",
@@ -52,18 +477,28 @@ class ApiClient:
                 "reason": response.reason,
             }
 
-    def get_user(self, user_id: str) -> Dict:
+    def get_user(
+        self,
+        user_id: str,
+        as_model: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Union[Dict, User]:
         """Get a user based on the user ID.
 
         Args:
             user_id (str): The ID of the user to retrieve.
+            as_model (bool): Whether to return a `User` instead of a dictionary (default is False).
+            fields (Optional[Iterable[str]]): The dotted paths to keep, such as
+                `["id", "name", "address.city"]` (default is None, all the fields).
 
         Returns:
             Dict: Dictionary containing the user data if the user is found, otherwise an error message
         """
-        response = requests.get(self.url + "/users/" + user_id)
+        projection = field_projection(fields, as_model)
+        response = self._get("/users/{id}", "/users/" + user_id)
         if response.status_code == 200:
-            return response.json()
+            user = self.codec.loads(response.content)
+            return User.from_json(user) if as_model else project(user, projection)
         else:
             return {
                 "error": f"Failed to fetch data for user {user_id}.",
@@ -71,15 +506,26 @@ class ApiClient:
                 "reason": response.reason,
             }
 
-    def get_all_users(self) -> Dict:
+    def get_all_users(
+        self, as_model: bool = False, fields: Optional[Iterable[str]] = None
+    ) -> Union[Dict, List[User]]:
         """Get all the users.
 
+        Args:
+            as_model (bool): Whether to return a list of `User` instead of dictionaries (default is False).
+            fields (Optional[Iterable[str]]): The dotted paths to keep, such as
+                `["id", "name", "address.city"]` (default is None, all the fields).
+
         Returns:
             Dict: Dictionary containing the data of all users if the request is successful, otherwise an error message
         """
-        response = requests.get(self.url + "/users")
+        projection = field_projection(fields, as_model)
+        response = self._get("/users", "/users")
         if response.status_code == 200:
-            return response.json()
+            users = self.codec.loads(response.content)
+            if as_model:
+                return [User.from_json(user) for user in users]
+            return project(users, projection)
         else:
             return {
                 "error": "Failed to fetch data for all users.",
@@ -87,6 +533,526 @@ class ApiClient:
                 "reason": response.reason,
             }
 
+    def _get_json(self, endpoint: str, path: str, error: str) -> Any:
+        """Get the decoded data of a path, or an error message if the request fails.
+
+        Args:
+            endpoint (str): The endpoint template of the path, for example `/users/{id}/posts`.
+            path (str): The path, relative to the base URL.
+            error (str): The error message returned if the request fails.
+
+        Returns:
+            Any: The decoded data, or the error message.
+        """
+        response = self._get(endpoint, path)
+        if response.status_code == 200:
+            return self.codec.loads(response.content)
+        return {
+            "error": error,
+            "status_code": response.status_code,
+            "reason": response.reason,
+        }
+
+    def get_user_with_posts_and_comments(
+        self, user_id: str, max_workers: Optional[int] = None
+    ) -> Union[Dict, UserProfile]:
+        """Get a user with all their posts and the comments of each post.
+
+        The user and their posts, through `/users/{id}/posts`, are requested in parallel, then the comments
+        of all the posts in parallel through `/posts/{id}/comments`, so the profile takes two round trips
+        whatever the number of posts and comments.
+
+        Args:
+            user_id (str): The ID of the user to retrieve.
+            max_workers (Optional[int]): The maximum number of concurrent requests
+                (default is the size of the connection pool).
+
+        Returns:
+            Union[Dict, UserProfile]: The profile of the user, or the error message of the first request
+              that failed
+        """
+        with ThreadPoolExecutor(
+            max_workers=max_workers or self.pool_maxsize
+        ) as executor:
+            user_future = executor.submit(
+                self._get_json,
+                "/users/{id}",
+                "/users/" + user_id,
+                f"Failed to fetch data for user {user_id}.",
+            )
+            posts_future = executor.submit(
+                self._get_json,
+                "/users/{id}/posts",
+                f"/users/{user_id}/posts",
+                f"Failed to fetch posts of user {user_id}.",
+            )
+            user, posts = user_future.result(), posts_future.result()
+            for result in (user, posts):
+                if isinstance(result, dict) and "error" in result:
+                    return result
+            comments = list(
+                executor.map(
+                    lambda post: self._get_json(
+                        "/posts/{id}/comments",
+                        f"/posts/{post['id']}/comments",
+                        f"Failed to fetch comments of post {post['id']}.",
+                    ),
+                    posts,
+                )
+            )
+        for result in comments:
+            if isinstance(result, dict):
+                return result
+        return UserProfile.from_json(user, posts, comments)
+
+    def _fetch_many(
+        self,
+        fetch: Callable[[str], Any],
+        ids: Iterable,
+        error: str,
+        max_workers: Optional[int],
+    ) -> List[Dict]:
+        """Run `fetch` for every ID on a bounded thread pool, keeping the order of the IDs.
+
+        Args:
+            fetch (Callable[[str], Any]): The single item method to call for each ID.
+            ids (Iterable): The IDs to fetch.
+            error (str): The error message template, formatted with the ID when the request fails
+                without a response from the server.
+            max_workers (Optional[int]): The maximum number of concurrent requests
+                (default is the size of the connection pool).
+
+        Returns:
+            List[Dict]: The data or the error message for each ID, in the same order as the IDs.
+        """
+        ids = [str(item_id) for item_id in ids]
+        if not ids:
+            return []
+
+        def fetch_one(item_id: str) -> Dict:
+            try:
+                return fetch(item_id)
+            except requests.RequestException as exc:
+                return {
+                    "error": error.format(item_id),
+                    "status_code": None,
+                    "reason": str(exc),
+                }
+
+        workers = min(max_workers or self.pool_maxsize, len(ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fetch_one, ids))
+
+    def get_posts_many(
+        self,
+        post_ids: Iterable,
+        max_workers: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get several posts concurrently based on their IDs.
+
+        Args:
+            post_ids (Iterable): The IDs of the posts to retrieve.
+            max_workers (Optional[int]): The maximum number of concurrent requests
+                (default is the size of the connection pool).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Returns:
+            List[Dict]: The post data or an error message for each ID, in the same order as the IDs
+        """
+        return self._fetch_many(
+            functools.partial(self.get_posts, fields=fields),
+            post_ids,
+            "Failed to fetch post {}.",
+            max_workers,
+        )
+
+    def get_comments_many(
+        self,
+        comment_ids: Iterable,
+        max_workers: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get several comments concurrently based on their IDs.
+
+        Args:
+            comment_ids (Iterable): The IDs of the comments to retrieve.
+            max_workers (Optional[int]): The maximum number of concurrent requests
+                (default is the size of the connection pool).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Returns:
+            List[Dict]: The comment data or an error message for each ID, in the same order as the IDs
+        """
+        return self._fetch_many(
+            functools.partial(self.get_comments, fields=fields),
+            comment_ids,
+            "Failed to fetch comment {}.",
+            max_workers,
+        )
+
+    def get_users_many(
+        self,
+        user_ids: Iterable,
+        max_workers: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get several users concurrently based on their IDs.
+
+        Args:
+            user_ids (Iterable): The IDs of the users to retrieve.
+            max_workers (Optional[int]): The maximum number of concurrent requests
+                (default is the size of the connection pool).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Returns:
+            List[Dict]: The user data or an error message for each ID, in the same order as the IDs
+        """
+        return self._fetch_many(
+            functools.partial(self.get_user, fields=fields),
+            user_ids,
+            "Failed to fetch data for user {}.",
+            max_workers,
+        )
+
+    def _iter_pages(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        page_size: int,
+        name: str,
+        projection: Optional[Projection] = None,
+    ) -> Iterator[Dict]:
+        """Walk a collection page by page with the `_start`/`_limit` pagination of the server.
+
+        The next page is requested in the background while the caller consumes the current one, so at most
+        two pages are held in memory. If a page request fails, its error message is yielded and the
+        iteration stops.
+
+        Args:
+            path (str): The path of the collection, relative to the base URL.
+            params (Dict[str, Any]): Extra query parameters, for example a filter on `userId`.
+            page_size (int): The number of records requested per page.
+            name (str): The name of the collection, used in the error message.
+            projection (Optional[Projection]): The fields kept in each record, applied as soon as a page is
+                decoded (default is None, all the fields).
+
+        Yields:
+            Dict: The records of the collection, followed by an error message if a page request fails
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+
+        def fetch(start: int) -> Reply:
+            query = urlencode({**params, "_start": start, "_limit": page_size})
+            return self._send("GET", f"{path}?{query}")
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            start = 0
+            future: Optional[Future] = executor.submit(fetch, start)
+            while future is not None:
+                response = future.result()
+                if response.status_code != 200:
+                    yield {
+                        "error": f"Failed to fetch {name} from {start}.",
+                        "status_code": response.status_code,
+                        "reason": response.reason,
+                    }
+                    return
+                page = project(self.codec.loads(response.content), projection)
+                start += page_size
+                future = (
+                    executor.submit(fetch, start) if len(page) == page_size else None
+                )
+                yield from page
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_posts(
+        self,
+        user_id: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict]:
+        """Iterate over all the posts, optionally only those of a user, one page at a time.
+
+        Args:
+            user_id (Optional[str]): The ID of the user whose posts to retrieve (default is None, all posts).
+            page_size (int): The number of posts requested per page (default is DEFAULT_PAGE_SIZE).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Yields:
+            Dict: The data of each post, followed by an error message if a page request fails
+        """
+        params = {} if user_id is None else {"userId": user_id}
+        return self._iter_pages(
+            "/posts", params, page_size, "posts", compile_fields(fields)
+        )
+
+    def iter_comments(
+        self,
+        post_id: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict]:
+        """Iterate over all the comments, optionally only those of a post, one page at a time.
+
+        Args:
+            post_id (Optional[str]): The ID of the post whose comments to retrieve
+                (default is None, all comments).
+            page_size (int): The number of comments requested per page (default is DEFAULT_PAGE_SIZE).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Yields:
+            Dict: The data of each comment, followed by an error message if a page request fails
+        """
+        params = {} if post_id is None else {"postId": post_id}
+        return self._iter_pages(
+            "/comments", params, page_size, "comments", compile_fields(fields)
+        )
+
+    def iter_users(
+        self,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict]:
+        """Iterate over all the users, one page at a time.
+
+        Args:
+            page_size (int): The number of users requested per page (default is DEFAULT_PAGE_SIZE).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Yields:
+            Dict: The data of each user, followed by an error message if a page request fails
+        """
+        return self._iter_pages(
+            "/users", {}, page_size, "users", compile_fields(fields)
+        )
+
+    def _stream(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        name: str,
+        projection: Optional[Projection] = None,
+    ) -> Iterator[Dict]:
+        """Download a collection in a single request and decode its records while they arrive.
+
+        Args:
+            path (str): The path of the collection, relative to the base URL.
+            params (Dict[str, Any]): Extra query parameters, for example a filter on `userId`.
+            name (str): The name of the collection, used in the error message.
+            projection (Optional[Projection]): The fields kept in each record, applied as soon as the record
+                is decoded (default is None, all the fields).
+
+        Yields:
+            Dict: The records of the collection, or an error message if the request fails
+        """
+        url = self.url + path
+        received = 0
+        timing = start_timing()
+        start = time.perf_counter()
+
+        def emit(response: requests.Response, start: float) -> None:
+            self._emit(
+                RequestEvent(
+                    "GET",
+                    path,
+                    response.url,
+                    response.status_code,
+                    request_size(response.request),
+                    received,
+                    time.perf_counter() - start,
+                    response.elapsed.total_seconds(),
+                    timing.dns,
+                    timing.connect,
+                    timing.reused,
+                )
+            )
+
+        def send() -> requests.Response:
+            nonlocal timing, start
+            timing = start_timing()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(
+                    url, params=params, stream=True, timeout=self.timeout
+                )
+            except requests.RequestException as exc:
+                self._emit_error("GET", path, url, exc, start, timing)
+                raise
+            if self.scheduler is not None and response.status_code in THROTTLED:
+                # Only the status of a throttled response is used, whether it is retried or not.
+                response.close()
+                emit(response, start)
+            return response
+
+        if self.scheduler is None:
+            response = send()
+        else:
+            # The slot of the scheduler is held until the whole body has been read.
+            response = self.scheduler.run(send, hold=True, endpoint=path)
+        try:
+            if response.status_code != 200:
+                yield {
+                    "error": f"Failed to fetch {name}.",
+                    "status_code": response.status_code,
+                    "reason": response.reason,
+                }
+                return
+
+            def chunks() -> Iterator[bytes]:
+                nonlocal received
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    received += len(chunk)
+                    yield chunk
+
+            records = iter_json_array(chunks())
+            if projection is None:
+                yield from records
+            else:
+                for record in records:
+                    yield project(record, projection)
+        finally:
+            response.close()
+            if self.scheduler is not None:
+                self.scheduler.release(
+                    response.elapsed.total_seconds(),
+                    response.status_code,
+                    parse_retry_after(response.headers.get("Retry-After")),
+                    path,
+                )
+            if self.scheduler is None or response.status_code not in THROTTLED:
+                emit(response, start)
+
+    def stream_posts(
+        self, user_id: Optional[str] = None, fields: Optional[Iterable[str]] = None
+    ) -> Iterator[Dict]:
+        """Stream all the posts, optionally only those of a user, decoding them while they are downloaded.
+
+        Args:
+            user_id (Optional[str]): The ID of the user whose posts to retrieve (default is None, all posts).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Yields:
+            Dict: The data of each post, or an error message if the request fails
+        """
+        params = {} if user_id is None else {"userId": user_id}
+        return self._stream("/posts", params, "posts", compile_fields(fields))
+
+    def stream_comments(
+        self, post_id: Optional[str] = None, fields: Optional[Iterable[str]] = None
+    ) -> Iterator[Dict]:
+        """Stream all the comments, optionally only those of a post, decoding them while they are downloaded.
+
+        Args:
+            post_id (Optional[str]): The ID of the post whose comments to retrieve
+                (default is None, all comments).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Yields:
+            Dict: The data of each comment, or an error message if the request fails
+        """
+        params = {} if post_id is None else {"postId": post_id}
+        return self._stream("/comments", params, "comments", compile_fields(fields))
+
+    def stream_users(self, fields: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """Stream all the users, decoding them while they are downloaded.
+
+        Args:
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Yields:
+            Dict: The data of each user, or an error message if the request fails
+        """
+        return self._stream("/users", {}, "users", compile_fields(fields))
+
+    def _warm(self, path: str, item_endpoint: str, item_path: str) -> int:
+        """Fetch a collection through the cache and also cache each of its records on its own path.
+
+        Args:
+            path (str): The path of the collection, relative to the base URL, with its query string.
+            item_endpoint (str): The endpoint template of a record, for example `/posts/{id}`.
+            item_path (str): The path of a record, formatted with its ID, for example `/posts/{}`.
+
+        Returns:
+            int: The number of records cached, 0 if the client has no cache or the request failed.
+        """
+        if self.cache is None:
+            return 0
+        response = self._get(path.partition("?")[0], path)
+        if response.status_code != 200:
+            return 0
+        records = self.codec.loads(response.content)
+        for record in records:
+            key = self.url + item_path.format(record["id"])
+            self.cache.set(key, item_endpoint, self.codec.dumps(record), None)
+        return len(records)
+
+    def warm_users(self) -> int:
+        """Cache the list of users and each user, so that the following reads are served locally.
+
+        Returns:
+            int: The number of users cached, 0 if the client has no cache or the request failed
+        """
+        return self._warm("/users", "/users/{id}", "/users/{}")
+
+    def warm_posts_of_user(self, user_id: str) -> int:
+        """Cache the posts of a user with a single request, so that reading them is served locally.
+
+        Args:
+            user_id (str): The ID of the user whose posts to cache.
+
+        Returns:
+            int: The number of posts cached, 0 if the client has no cache or the request failed
+        """
+        query = urlencode({"userId": user_id})
+        return self._warm(f"/posts?{query}", "/posts/{id}", "/posts/{}")
+
+    def warm_comments_of_post(self, post_id: str) -> int:
+        """Cache the comments of a post with a single request, so that reading them is served locally.
+
+        Args:
+            post_id (str): The ID of the post whose comments to cache.
+
+        Returns:
+            int: The number of comments cached, 0 if the client has no cache or the request failed
+        """
+        query = urlencode({"postId": post_id})
+        return self._warm(f"/comments?{query}", "/comments/{id}", "/comments/{}")
+
+    def conditional_get(
+        self,
+        path: str,
+        etag: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Reply:
+        """Send a GET request that the server can answer with 304 if the resource did not change.
+
+        Args:
+            path (str): The path of the resource, relative to the base URL, for example `/posts`.
+            etag (Optional[str]): The `ETag` of the copy held by the caller, sent as `If-None-Match`
+                (default is None).
+            params (Optional[Dict[str, Any]]): The query parameters (default is None).
+
+        Returns:
+            Reply: The response of the server, with a 304 status code if the copy of the caller is current.
+        """
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        headers = {"If-None-Match": etag} if etag else None
+        return self._send("GET", path, headers=headers)
+
     def create_post(self, data: Dict) -> Dict:
         """Create a new post using the provided data.
 
@@ -97,9 +1063,9 @@ class ApiClient:
             Dict: Dictionary containing the created post data if the request is successful,
               otherwise an error message
         """
-        response = requests.post(self.url + "/posts", data)
+        response = self._send("POST", "/posts", data)
         if response.status_code == 201:
-            return response.json()
+            return self.codec.loads(response.content)
         else:
             return {
                 "error": "Failed to create post.",
@@ -118,9 +1084,10 @@ class ApiClient:
             Dict: Dictionary containing the updated post data if the request is successful,
               otherwise an error message
         """
-        response = requests.put(self.url + "/posts/" + post_id, data)
+        response = self._send("PUT", "/posts/" + post_id, data, endpoint="/posts/{id}")
         if response.status_code == 200:
-            return response.json()
+            self._invalidate("/posts/" + post_id)
+            return self.codec.loads(response.content)
         else:
             return {
                 "error": "Failed to update post.",
@@ -137,8 +1104,9 @@ class ApiClient:
         Returns:
             Dict: Dictionary containing a success message if the request is successful, otherwise an error message
         """
-        response = requests.delete(self.url + "/posts/" + post_id)
+        response = self._send("DELETE", "/posts/" + post_id, endpoint="/posts/{id}")
         if response.status_code == 200:
+            self._invalidate("/posts/" + post_id)
             return {"message": f"Post {post_id} deleted successfully."}
         else:
             return {
@@ -157,9 +1125,10 @@ class ApiClient:
             Dict: Dictionary containing the created user data if the request is successful,
               otherwise an error message
         """
-        response = requests.post(self.url + "/users", data)
+        response = self._send("POST", "/users", data)
         if response.status_code == 201:
-            return response.json()
+            self._invalidate("/users")
+            return self.codec.loads(response.content)
         else:
             return {
                 "error": "Failed to create user.",
@@ -177,12 +1146,123 @@ class ApiClient:
             Dict: Dictionary containing the created comment data if the request is successful,
               otherwise an error message
         """
-        response = requests.post(self.url + "/comments", data)
+        response = self._send("POST", "/comments", data)
         if response.status_code == 201:
-            return response.json()
+            return self.codec.loads(response.content)
         else:
             return {
                 "error": "Failed to create comment.",
                 "status_code": response.status_code,
                 "reason": response.reason,
             }
+
+    def _write_many(
+        self,
+        write: Callable[[Dict], Dict],
+        items: Iterable[Union[Dict, Post, Comment]],
+        error: str,
+        max_workers: Optional[int],
+        dedup: bool,
+    ) -> Dict:
+        """Run `write` for every item on a bounded thread pool, keeping the order of the items.
+
+        The items are consumed lazily: at most two requests per worker are queued, so a large iterable is
+        never loaded at once and the producer waits while the server is slow. With `dedup`, the digest and
+        the result of every distinct payload are kept until the end, so that memory grows with the number
+        of distinct payloads.
+
+        Args:
+            write (Callable[[Dict], Dict]): The single item method to call for each payload.
+            items (Iterable[Union[Dict, Post, Comment]]): The dictionaries or models to write.
+            error (str): The error message when the request fails without a response from the server.
+            max_workers (Optional[int]): The maximum number of concurrent requests
+                (default is the size of the connection pool).
+            dedup (bool): Whether identical payloads are sent once and share the result.
+
+        Returns:
+            Dict: The `results`, the created data or an error message for each item in the same order as
+              the items, and the `summary` of `bulk_summary`.
+        """
+        workers = max_workers or self.pool_maxsize
+        start = time.perf_counter()
+
+        def write_one(payload: Dict) -> Dict:
+            try:
+                return write(payload)
+            except requests.RequestException as exc:
+                return {"error": error, "status_code": None, "reason": str(exc)}
+
+        results: List[Dict] = []
+        pending: Deque[Future] = deque()
+        seen: Dict[str, Future] = {}
+        deduplicated = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for item in items:
+                payload = to_payload(item)
+                key = payload_key(payload) if dedup else None
+                future = seen.get(key) if key is not None else None
+                if future is not None:
+                    deduplicated += 1
+                else:
+                    future = executor.submit(write_one, payload)
+                    if key is not None:
+                        seen[key] = future
+                pending.append(future)
+                if len(pending) >= 2 * workers:
+                    results.append(dict(pending.popleft().result()))
+            while pending:
+                results.append(dict(pending.popleft().result()))
+        return {
+            "results": results,
+            "summary": bulk_summary(results, deduplicated, time.perf_counter() - start),
+        }
+
+    def create_posts_bulk(
+        self,
+        posts: Iterable[Union[Dict, Post]],
+        max_workers: Optional[int] = None,
+        dedup: bool = False,
+    ) -> Dict:
+        """Create many posts concurrently.
+
+        Args:
+            posts (Iterable[Union[Dict, Post]]): The posts to create, as dictionaries or `Post` objects.
+            max_workers (Optional[int]): The maximum number of concurrent requests
+                (default is the size of the connection pool).
+            dedup (bool): Whether identical posts are created once and share the result (default is False).
+
+        Returns:
+            Dict: The `results`, the created post data or an error message for each post in the same
+              order as the posts, and a `summary` with the counts and the throughput
+        """
+        return self._write_many(
+            self.create_post, posts, "Failed to create post.", max_workers, dedup
+        )
+
+    def create_comments_bulk(
+        self,
+        comments: Iterable[Union[Dict, Comment]],
+        max_workers: Optional[int] = None,
+        dedup: bool = False,
+    ) -> Dict:
+        """Create many comments concurrently.
+
+        Args:
+            comments (Iterable[Union[Dict, Comment]]): The comments to create, as dictionaries or
+                `Comment` objects.
+            max_workers (Optional[int]): The maximum number of concurrent requests
+                (default is the size of the connection pool).
+            dedup (bool): Whether identical comments are created once and share the result
+                (default is False).
+
+        Returns:
+            Dict: The `results`, the created comment data or an error message for each comment in the same
+              order as the comments, and a `summary` with the counts and the throughput
+        """
+        return self._write_many(
+            self.create_comment,
+            comments,
+            "Failed to create comment.",
+            max_workers,
+            dedup,
+        )
@@ -0,0 +1,637 @@
+import aiohttp
+import asyncio
+import functools
+import time
+from collections import deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from app.api_client import (
+    DEFAULT_TIMEOUT,
+    JSON_HEADERS,
+    Timeout,
+    bulk_summary,
+    field_projection,
+    payload_key,
+    request_body,
+    to_payload,
+)
+from app.codec import Codec, get_codec
+from app.data import Comment, Post, User, UserProfile
+from app.projection import project
+from app.singleflight import AsyncSingleFlight
+
+
+class AsyncApiClient:
+    """
+    Asyncio client to interact with the JSONPlaceholder API. It mirrors the methods of `ApiClient` as
+    coroutines and returns the same data and error dictionaries.
+
+    All the coroutines share a single `aiohttp.ClientSession` backed by a pooled connector, so thousands of
+    requests can be in flight on one event loop while reusing the keep-alive connections. The session is
+    created on first use, inside the running event loop, and the client can be used as an async context
+    manager to release the pooled connections when done. Concurrent reads of the same resource are
+    coalesced: the tasks share a single request in flight and all get its result, error included.
+
+    Args:
+        url_adress (str): The base URL for the JSONPlaceholder API.
+        limit (int): The maximum number of simultaneous connections (default is 100).
+        limit_per_host (int): The maximum number of simultaneous connections per host, 0 means no limit
+            (default is 0).
+        keep_alive (bool): Whether connections are kept open between requests (default is True).
+        timeout (Timeout): The default (connect, read) timeout in seconds for every request
+            (default is DEFAULT_TIMEOUT).
+        coalesce (bool): Whether concurrent reads of the same resource share one request (default is True).
+        codec (Optional[Codec]): The JSON codec of the bodies (default is None, `get_codec()`).
+    """
+
+    def __init__(
+        self,
+        url_adress: str,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keep_alive: bool = True,
+        timeout: Optional[Timeout] = DEFAULT_TIMEOUT,
+        coalesce: bool = True,
+        codec: Optional[Codec] = None,
+    ) -> None:
+        self.url = url_adress
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.codec = get_codec() if codec is None else codec
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._flights = AsyncSingleFlight() if coalesce else None
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session and all the pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The pooled session, created on first use inside the running event loop."""
+        if self._session is None or self._session.closed:
+            if isinstance(self.timeout, tuple):
+                timeout = aiohttp.ClientTimeout(
+                    sock_connect=self.timeout[0], sock_read=self.timeout[1]
+                )
+            else:
+                timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                force_close=not self.keep_alive,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def _send(
+        self, method: str, path: str, data: Optional[Dict] = None
+    ) -> Tuple[int, Optional[str], bytes]:
+        """Send a request through the pooled session.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The path of the endpoint, relative to the base URL.
+            data (Optional[Dict]): The data sent as the JSON body of the request (default is None).
+
+        Returns:
+            Tuple[int, Optional[str], bytes]: The status code, the reason and the body of the response.
+        """
+        body = None if data is None else self.codec.dumps(request_body(data))
+        headers = None if data is None else JSON_HEADERS
+        async with self.session.request(
+            method, self.url + path, data=body, headers=headers
+        ) as response:
+            return response.status, response.reason, await response.read()
+
+    async def _get(self, path: str) -> Tuple[int, Optional[str], bytes]:
+        """Send a GET request, sharing the request already in flight for the same path if coalescing is on.
+
+        Args:
+            path (str): The path of the endpoint, relative to the base URL.
+
+        Returns:
+            Tuple[int, Optional[str], bytes]: The status code, the reason and the body of the response.
+        """
+        if self._flights is None:
+            return await self._send("GET", path)
+        return await self._flights.do(self.url + path, lambda: self._send("GET", path))
+
+    async def get_posts(
+        self,
+        post_id: str,
+        as_model: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Union[Dict, Post]:
+        """Get a post based on the post ID.
+
+        Args:
+            post_id (str): The ID of the post to retrieve.
+            as_model (bool): Whether to return a `Post` instead of a dictionary (default is False).
+            fields (Optional[Iterable[str]]): The dotted paths to keep, such as `["id", "title"]`
+                (default is None, all the fields).
+
+        Returns:
+            Dict: Dictionary containing the post data if the post is found, otherwise an error message
+        """
+        projection = field_projection(fields, as_model)
+        status_code, reason, body = await self._get("/posts/" + post_id)
+        if status_code == 200:
+            post = self.codec.loads(body)
+            return Post.from_json(post) if as_model else project(post, projection)
+        else:
+            return {
+                "error": f"Failed to fetch post {post_id}.",
+                "status_code": status_code,
+                "reason": reason,
+            }
+
+    async def get_comments(
+        self,
+        comment_id: str,
+        as_model: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Union[Dict, Comment]:
+        """Get a comment based on the comment ID.
+
+        Args:
+            comment_id (str): The ID of the comment to retrieve.
+            as_model (bool): Whether to return a `Comment` instead of a dictionary (default is False).
+            fields (Optional[Iterable[str]]): The dotted paths to keep, such as `["id", "body"]`
+                (default is None, all the fields).
+
+        Returns:
+            Dict: Dictionary containing the comment data if the comment is found, otherwise an error message
+        """
+        projection = field_projection(fields, as_model)
+        status_code, reason, body = await self._get("/comments/" + comment_id)
+        if status_code == 200:
+            comment = self.codec.loads(body)
+            return (
+                Comment.from_json(comment) if as_model else project(comment, projection)
+            )
+        else:
+            return {
+                "error": f"Failed to fetch comment {comment_id}.",
+                "status_code": status_code,
+                "reason": reason,
+            }
+
+    async def get_user(
+        self,
+        user_id: str,
+        as_model: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Union[Dict, User]:
+        """Get a user based on the user ID.
+
+        Args:
+            user_id (str): The ID of the user to retrieve.
+            as_model (bool): Whether to return a `User` instead of a dictionary (default is False).
+            fields (Optional[Iterable[str]]): The dotted paths to keep, such as
+                `["id", "name", "address.city"]` (default is None, all the fields).
+
+        Returns:
+            Dict: Dictionary containing the user data if the user is found, otherwise an error message
+        """
+        projection = field_projection(fields, as_model)
+        status_code, reason, body = await self._get("/users/" + user_id)
+        if status_code == 200:
+            user = self.codec.loads(body)
+            return User.from_json(user) if as_model else project(user, projection)
+        else:
+            return {
+                "error": f"Failed to fetch data for user {user_id}.",
+                "status_code": status_code,
+                "reason": reason,
+            }
+
+    async def get_all_users(
+        self, as_model: bool = False, fields: Optional[Iterable[str]] = None
+    ) -> Union[Dict, List[User]]:
+        """Get all the users.
+
+        Args:
+            as_model (bool): Whether to return a list of `User` instead of dictionaries (default is False).
+            fields (Optional[Iterable[str]]): The dotted paths to keep, such as
+                `["id", "name", "address.city"]` (default is None, all the fields).
+
+        Returns:
+            Dict: Dictionary containing the data of all users if the request is successful, otherwise an error message
+        """
+        projection = field_projection(fields, as_model)
+        status_code, reason, body = await self._get("/users")
+        if status_code == 200:
+            users = self.codec.loads(body)
+            if as_model:
+                return [User.from_json(user) for user in users]
+            return project(users, projection)
+        else:
+            return {
+                "error": "Failed to fetch data for all users.",
+                "status_code": status_code,
+                "reason": reason,
+            }
+
+    async def _get_json(self, path: str, error: str) -> Any:
+        """Get the decoded data of a path, or an error message if the request fails.
+
+        Args:
+            path (str): The path, relative to the base URL.
+            error (str): The error message returned if the request fails.
+
+        Returns:
+            Any: The decoded data, or the error message.
+        """
+        status_code, reason, body = await self._get(path)
+        if status_code == 200:
+            return self.codec.loads(body)
+        return {"error": error, "status_code": status_code, "reason": reason}
+
+    async def get_user_with_posts_and_comments(
+        self, user_id: str, concurrency: Optional[int] = None
+    ) -> Union[Dict, UserProfile]:
+        """Get a user with all their posts and the comments of each post.
+
+        The user and their posts, through `/users/{id}/posts`, are requested concurrently, then the
+        comments of all the posts concurrently through `/posts/{id}/comments`, so the profile takes two
+        round trips whatever the number of posts and comments.
+
+        Args:
+            user_id (str): The ID of the user to retrieve.
+            concurrency (Optional[int]): The maximum number of requests in flight
+                (default is the connection limit).
+
+        Returns:
+            Union[Dict, UserProfile]: The profile of the user, or the error message of the first request
+              that failed
+        """
+        user, posts = await asyncio.gather(
+            self._get_json(
+                "/users/" + user_id, f"Failed to fetch data for user {user_id}."
+            ),
+            self._get_json(
+                f"/users/{user_id}/posts", f"Failed to fetch posts of user {user_id}."
+            ),
+        )
+        for result in (user, posts):
+            if isinstance(result, dict) and "error" in result:
+                return result
+        semaphore = asyncio.Semaphore(concurrency or self.limit or 100)
+
+        async def fetch_comments(post: Dict) -> Any:
+            async with semaphore:
+                return await self._get_json(
+                    f"/posts/{post['id']}/comments",
+                    f"Failed to fetch comments of post {post['id']}.",
+                )
+
+        comments = await asyncio.gather(*(fetch_comments(post) for post in posts))
+        for result in comments:
+            if isinstance(result, dict):
+                return result
+        return UserProfile.from_json(user, posts, list(comments))
+
+    async def _fetch_many(
+        self,
+        fetch: Callable[[str], Awaitable[Any]],
+        ids: Iterable,
+        error: str,
+        concurrency: Optional[int],
+    ) -> List[Dict]:
+        """Await `fetch` for every ID with bounded concurrency, keeping the order of the IDs.
+
+        Args:
+            fetch (Callable[[str], Awaitable[Any]]): The single item coroutine to call for each ID.
+            ids (Iterable): The IDs to fetch.
+            error (str): The error message template, formatted with the ID when the request fails
+                without a response from the server.
+            concurrency (Optional[int]): The maximum number of requests in flight
+                (default is the connection limit).
+
+        Returns:
+            List[Dict]: The data or the error message for each ID, in the same order as the IDs.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.limit or 100)
+
+        async def fetch_one(item_id: str) -> Dict:
+            async with semaphore:
+                try:
+                    return await fetch(item_id)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    return {
+                        "error": error.format(item_id),
+                        "status_code": None,
+                        "reason": str(exc) or type(exc).__name__,
+                    }
+
+        return list(await asyncio.gather(*(fetch_one(str(i)) for i in ids)))
+
+    async def get_posts_many(
+        self,
+        post_ids: Iterable,
+        concurrency: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get several posts concurrently based on their IDs.
+
+        Args:
+            post_ids (Iterable): The IDs of the posts to retrieve.
+            concurrency (Optional[int]): The maximum number of requests in flight
+                (default is the connection limit).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Returns:
+            List[Dict]: The post data or an error message for each ID, in the same order as the IDs
+        """
+        return await self._fetch_many(
+            functools.partial(self.get_posts, fields=fields),
+            post_ids,
+            "Failed to fetch post {}.",
+            concurrency,
+        )
+
+    async def get_comments_many(
+        self,
+        comment_ids: Iterable,
+        concurrency: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get several comments concurrently based on their IDs.
+
+        Args:
+            comment_ids (Iterable): The IDs of the comments to retrieve.
+            concurrency (Optional[int]): The maximum number of requests in flight
+                (default is the connection limit).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Returns:
+            List[Dict]: The comment data or an error message for each ID, in the same order as the IDs
+        """
+        return await self._fetch_many(
+            functools.partial(self.get_comments, fields=fields),
+            comment_ids,
+            "Failed to fetch comment {}.",
+            concurrency,
+        )
+
+    async def get_users_many(
+        self,
+        user_ids: Iterable,
+        concurrency: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get several users concurrently based on their IDs.
+
+        Args:
+            user_ids (Iterable): The IDs of the users to retrieve.
+            concurrency (Optional[int]): The maximum number of requests in flight
+                (default is the connection limit).
+            fields (Optional[Iterable[str]]): The dotted paths to keep in each record
+                (default is None, all the fields).
+
+        Returns:
+            List[Dict]: The user data or an error message for each ID, in the same order as the IDs
+        """
+        return await self._fetch_many(
+            functools.partial(self.get_user, fields=fields),
+            user_ids,
+            "Failed to fetch data for user {}.",
+            concurrency,
+        )
+
+    async def create_post(self, data: Dict) -> Dict:
+        """Create a new post using the provided data.
+
+        Args:
+            data (Dict): The post data to be created.
+
+        Returns:
+            Dict: Dictionary containing the created post data if the request is successful,
+              otherwise an error message
+        """
+        status_code, reason, body = await self._send("POST", "/posts", data)
+        if status_code == 201:
+            return self.codec.loads(body)
+        else:
+            return {
+                "error": "Failed to create post.",
+                "status_code": status_code,
+                "reason": reason,
+            }
+
+    async def update_post(self, post_id: str, data: Dict) -> Dict:
+        """Update a post based on a post ID using the provided data.
+
+        Args:
+            post_id (str): The ID of the post to be updated.
+            data (Dict): Dictionary containing the new data to update the post.
+
+        Returns:
+            Dict: Dictionary containing the updated post data if the request is successful,
+              otherwise an error message
+        """
+        status_code, reason, body = await self._send("PUT", "/posts/" + post_id, data)
+        if status_code == 200:
+            return self.codec.loads(body)
+        else:
+            return {
+                "error": "Failed to update post.",
+                "status_code": status_code,
+                "reason": reason,
+            }
+
+    async def delete_post(self, post_id: str) -> Dict:
+        """Delete a post based on the post ID.
+
+        Args:
+            post_id (str): The ID of the post to be deleted.
+
+        Returns:
+            Dict: Dictionary containing a success message if the request is successful, otherwise an error message
+        """
+        status_code, reason, _ = await self._send("DELETE", "/posts/" + post_id)
+        if status_code == 200:
+            return {"message": f"Post {post_id} deleted successfully."}
+        else:
+            return {
+                "error": f"Failed to delete post {post_id}.",
+                "status_code": status_code,
+                "reason": reason,
+            }
+
+    async def create_user(self, data: Dict) -> Dict:
+        """Create a new user using the provided data.
+
+        Args:
+            data (Dict): The user data to be created.
+
+        Returns:
+            Dict: Dictionary containing the created user data if the request is successful,
+              otherwise an error message
+        """
+        status_code, reason, body = await self._send("POST", "/users", data)
+        if status_code == 201:
+            return self.codec.loads(body)
+        else:
+            return {
+                "error": "Failed to create user.",
+                "status_code": status_code,
+                "reason": reason,
+            }
+
+    async def create_comment(self, data: Dict) -> Dict:
+        """Create a new comment using the provided data.
+
+        Args:
+            data (Dict): The comment data to be created.
+
+        Returns:
+            Dict: Dictionary containing the created comment data if the request is successful,
+              otherwise an error message
+        """
+        status_code, reason, body = await self._send("POST", "/comments", data)
+        if status_code == 201:
+            return self.codec.loads(body)
+        else:
+            return {
+                "error": "Failed to create comment.",
+                "status_code": status_code,
+                "reason": reason,
+            }
+
+    async def _write_many(
+        self,
+        write: Callable[[Dict], Awaitable[Dict]],
+        items: Iterable[Union[Dict, Post, Comment]],
+        error: str,
+        concurrency: Optional[int],
+        dedup: bool,
+    ) -> Dict:
+        """Await `write` for every item with bounded concurrency, keeping the order of the items.
+
+        The items are consumed lazily: at most `concurrency` requests are in flight, so a large iterable is
+        never loaded at once and the producer waits while the server is slow. With `dedup`, the digest and
+        the result of every distinct payload are kept until the end, so that memory grows with the number
+        of distinct payloads.
+
+        Args:
+            write (Callable[[Dict], Awaitable[Dict]]): The single item coroutine to call for each payload.
+            items (Iterable[Union[Dict, Post, Comment]]): The dictionaries or models to write.
+            error (str): The error message when the request fails without a response from the server.
+            concurrency (Optional[int]): The maximum number of requests in flight
+                (default is the connection limit).
+            dedup (bool): Whether identical payloads are sent once and share the result.
+
+        Returns:
+            Dict: The `results`, the created data or an error message for each item in the same order as
+              the items, and the `summary` of `bulk_summary`.
+        """
+        window = concurrency or self.limit or 100
+        start = time.perf_counter()
+
+        async def write_one(payload: Dict) -> Dict:
+            try:
+                return await write(payload)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                return {
+                    "error": error,
+                    "status_code": None,
+                    "reason": str(exc) or type(exc).__name__,
+                }
+
+        results: List[Dict] = []
+        pending: Deque[asyncio.Future] = deque()
+        seen: Dict[str, asyncio.Future] = {}
+        deduplicated = 0
+        for item in items:
+            payload = to_payload(item)
+            key = payload_key(payload) if dedup else None
+            task = seen.get(key) if key is not None else None
+            if task is not None:
+                deduplicated += 1
+            else:
+                task = asyncio.ensure_future(write_one(payload))
+                if key is not None:
+                    seen[key] = task
+            pending.append(task)
+            if len(pending) >= window:
+                results.append(dict(await pending.popleft()))
+        while pending:
+            results.append(dict(await pending.popleft()))
+        return {
+            "results": results,
+            "summary": bulk_summary(results, deduplicated, time.perf_counter() - start),
+        }
+
+    async def create_posts_bulk(
+        self,
+        posts: Iterable[Union[Dict, Post]],
+        concurrency: Optional[int] = None,
+        dedup: bool = False,
+    ) -> Dict:
+        """Create many posts concurrently.
+
+        Args:
+            posts (Iterable[Union[Dict, Post]]): The posts to create, as dictionaries or `Post` objects.
+            concurrency (Optional[int]): The maximum number of requests in flight
+                (default is the connection limit).
+            dedup (bool): Whether identical posts are created once and share the result (default is False).
+
+        Returns:
+            Dict: The `results`, the created post data or an error message for each post in the same
+              order as the posts, and a `summary` with the counts and the throughput
+        """
+        return await self._write_many(
+            self.create_post, posts, "Failed to create post.", concurrency, dedup
+        )
+
+    async def create_comments_bulk(
+        self,
+        comments: Iterable[Union[Dict, Comment]],
+        concurrency: Optional[int] = None,
+        dedup: bool = False,
+    ) -> Dict:
+        """Create many comments concurrently.
+
+        Args:
+            comments (Iterable[Union[Dict, Comment]]): The comments to create, as dictionaries or
+                `Comment` objects.
+            concurrency (Optional[int]): The maximum number of requests in flight
+                (default is the connection limit).
+            dedup (bool): Whether identical comments are created once and share the result
+                (default is False).
+
+        Returns:
+            Dict: The `results`, the created comment data or an error message for each comment in the same
+              order as the comments, and a `summary` with the counts and the throughput
+        """
+        return await self._write_many(
+            self.create_comment,
+            comments,
+            "Failed to create comment.",
+            concurrency,
+            dedup,
+        )
@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+import requests
+
+from app.api_client import ApiClient
+
+# The batch actions, mirroring the menu: the `ApiClient` method and the fields of the command passed to it.
+ACTIONS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "get_all_users": ("get_all_users", ()),
+    "get_user": ("get_user", ("user_id",)),
+    "get_post": ("get_posts", ("post_id",)),
+    "get_comment": ("get_comments", ("comment_id",)),
+    "create_post": ("create_post", ("data",)),
+    "update_post": ("update_post", ("post_id", "data")),
+    "delete_post": ("delete_post", ("post_id",)),
+    "create_user": ("create_user", ("data",)),
+    "create_comment": ("create_comment", ("data",)),
+}
+
+
+def parse_command(line: str) -> Tuple[str, List[Any]]:
+    """Parse a batch command, a JSON object such as `{"action": "get_user", "user_id": 1}`.
+
+    Args:
+        line (str): The JSON text of the command.
+
+    Returns:
+        Tuple[str, List[Any]]: The name of the action and the arguments of its `ApiClient` method.
+    """
+    try:
+        command = json.loads(line)
+    except ValueError as exc:
+        raise ValueError(f"Invalid JSON: {exc}.") from None
+    if not isinstance(command, dict):
+        raise ValueError("A command must be a JSON object.")
+    action = command.get("action")
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown action {action!r}.")
+    _, fields = ACTIONS[action]
+    arguments: List[Any] = []
+    for field in fields:
+        if field not in command:
+            raise ValueError(f"Missing field {field!r} for {action}.")
+        value = command[field]
+        if field == "data":
+            if not isinstance(value, dict):
+                raise ValueError("The data must be a JSON object.")
+            arguments.append(value)
+        else:
+            arguments.append(str(value))
+    return action, arguments
+
+
+def run_batch(
+    api_client: ApiClient,
+    lines: Iterable[str],
+    output: TextIO,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run batch commands concurrently and write one NDJSON result line per command as it completes.
+
+    Each result line holds the `line` number of the command, its `action`, whether it is `ok`, the
+    `result` of the `ApiClient` method (the data or its error message) and the `seconds` it took. A command
+    that cannot be parsed gets an `error` instead of a result. The lines are read lazily, with at most two
+    commands per worker waiting, so the input can be a large file or a pipe. Blank lines and lines starting
+    with `#` are skipped.
+
+    Args:
+        api_client (ApiClient): The client running the commands.
+        lines (Iterable[str]): The JSON commands, one per line.
+        output (TextIO): The stream receiving the NDJSON results.
+        max_workers (Optional[int]): The maximum number of concurrent commands
+            (default is the size of the connection pool of the client).
+
+    Returns:
+        Dict[str, Any]: The number of commands, of successes and of failures, and the duration in seconds.
+    """
+    workers = max_workers or api_client.pool_maxsize
+    start = time.perf_counter()
+    counts = {"commands": 0, "succeeded": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def write(result: Dict[str, Any]) -> None:
+        with lock:
+            counts["commands"] += 1
+            counts["succeeded" if result["ok"] else "failed"] += 1
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+    def execute(number: int, action: str, arguments: List[Any]) -> None:
+        method, _ = ACTIONS[action]
+        command_start = time.perf_counter()
+        try:
+            result = getattr(api_client, method)(*arguments)
+        except (requests.RequestException, ValueError) as exc:
+            # A failed request, or a response body that is not valid JSON.
+            result = {
+                "error": f"Failed to run {action}.",
+                "status_code": None,
+                "reason": str(exc),
+            }
+        write(
+            {
+                "line": number,
+                "action": action,
+                "ok": not (isinstance(result, dict) and "error" in result),
+                "result": result,
+                "seconds": time.perf_counter() - command_start,
+            }
+        )
+
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                action, arguments = parse_command(line)
+            except ValueError as exc:
+                write({"line": number, "ok": False, "error": str(exc)})
+                continue
+            pending.add(executor.submit(execute, number, action, arguments))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+        for future in pending:
+            future.result()
+    return dict(counts, seconds=time.perf_counter() - start)
@@ -0,0 +1,325 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Optional, Union
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+@dataclass
+class CacheEntry:
+    """Represents a cached response body.
+
+    Args:
+        content (bytes): The raw body of the response.
+        etag (Optional[str]): The `ETag` sent by the server, used to revalidate the entry.
+        expires_at (float): The `time.monotonic()` timestamp after which the entry is stale.
+    """
+
+    content: bytes
+    etag: Optional[str]
+    expires_at: float
+
+    def is_fresh(self) -> bool:
+        """Whether the entry can be served without asking the server."""
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache for the bodies of GET responses.
+
+    The entries are evicted in least recently used order when there are more than `max_entries` of them or
+    when their total size goes over `max_bytes`. Each entry lives for the TTL of its endpoint; once stale it
+    is kept so that it can be revalidated with `If-None-Match` if the server sent an `ETag`. The raw bodies
+    are stored instead of the decoded JSON, so every caller gets its own copy of the data.
+
+    Args:
+        max_entries (int): The maximum number of cached responses (default is 1024).
+        max_bytes (int): The maximum total size of the cached bodies in bytes (default is 16 MiB).
+        default_ttl (float): The time to live in seconds of an entry (default is 60).
+        ttls (Optional[Dict[str, float]]): The time to live in seconds per endpoint template, for example
+            `{"/users": 300}`, overriding `default_ttl` (default is None).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        default_ttl: float = 60.0,
+        ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.size = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl(self, endpoint: str) -> float:
+        """Get the time to live in seconds of the entries of an endpoint.
+
+        Args:
+            endpoint (str): The endpoint template, for example `/posts/{id}`.
+
+        Returns:
+            float: The time to live of the entries of the endpoint.
+        """
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry, fresh or stale, and mark it as recently used.
+
+        Args:
+            key (str): The URL of the cached response.
+
+        Returns:
+            Optional[CacheEntry]: The cached entry, or None if the URL is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, endpoint: str, content: bytes, etag: Optional[str]) -> None:
+        """Store a response body, evicting the least recently used entries if needed.
+
+        Args:
+            key (str): The URL of the response.
+            endpoint (str): The endpoint template of the URL, used to pick the TTL.
+            content (bytes): The raw body of the response.
+            etag (Optional[str]): The `ETag` of the response.
+        """
+        size = len(content)
+        if size > self.max_bytes:
+            return
+        entry = CacheEntry(content, etag, time.monotonic() + self.ttl(endpoint))
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.content)
+            self._entries[key] = entry
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.content)
+
+    def refresh(self, key: str, endpoint: str) -> None:
+        """Make a stale entry fresh again after the server confirmed it did not change.
+
+        Args:
+            key (str): The URL of the cached response.
+            endpoint (str): The endpoint template of the URL, used to pick the TTL.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl(endpoint)
+
+    def invalidate(self, key: str) -> None:
+        """Remove an entry from the cache.
+
+        Args:
+            key (str): The URL of the cached response.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= len(entry.content)
+
+    def clear(self) -> None:
+        """Remove all the entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class SqliteCache:
+    """
+    Persistent cache for the bodies of GET responses, stored in a SQLite database so that it survives
+    restarts and is shared by the processes using the same file.
+
+    It has the same interface and behavior as `ResponseCache`: LRU eviction past `max_entries` or
+    `max_bytes`, a TTL per endpoint, and stale entries kept for revalidation. The expiry times are stored as
+    wall clock timestamps so that every process agrees on them. The database runs in WAL mode, so readers
+    do not block the writer, and every write is a short transaction retried by SQLite while another process
+    holds the lock, for up to `busy_timeout` seconds. Each thread gets its own connection, and the file is
+    memory-mapped to serve the reads without copying through the page cache.
+
+    Args:
+        path (str): The path of the database file, created if missing.
+        max_entries (int): The maximum number of cached responses (default is 10000).
+        max_bytes (int): The maximum total size of the cached bodies in bytes (default is 64 MiB).
+        default_ttl (float): The time to live in seconds of an entry (default is 60).
+        ttls (Optional[Dict[str, float]]): The time to live in seconds per endpoint template, for example
+            `{"/users": 300}`, overriding `default_ttl` (default is None).
+        busy_timeout (float): How long in seconds to wait for another process holding the lock
+            (default is 5).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = 60.0,
+        ttls: Optional[Dict[str, float]] = None,
+        busy_timeout: float = 5.0,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, content BLOB NOT NULL, etag TEXT, "
+                "expires_at REAL NOT NULL, size INTEGER NOT NULL, used_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_used_at ON entries (used_at)"
+            )
+
+    def _connection(self) -> "sqlite3.Connection":
+        """Get the connection of the current thread, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Imported here so that the clients using the in-memory cache do not pay for loading sqlite3.
+            import sqlite3
+
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={self.max_bytes * 2}")
+            self._local.connection = connection
+        return connection
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """The total size of the cached bodies in bytes."""
+        query = "SELECT COALESCE(SUM(size), 0) FROM entries"
+        return self._connection().execute(query).fetchone()[0]
+
+    def ttl(self, endpoint: str) -> float:
+        """Get the time to live in seconds of the entries of an endpoint.
+
+        Args:
+            endpoint (str): The endpoint template, for example `/posts/{id}`.
+
+        Returns:
+            float: The time to live of the entries of the endpoint.
+        """
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry, fresh or stale, and mark it as recently used.
+
+        Args:
+            key (str): The URL of the cached response.
+
+        Returns:
+            Optional[CacheEntry]: The cached entry, or None if the URL is not cached.
+        """
+        with self._connection() as connection:
+            # Take the write lock first, a read upgraded to a write could fail while another process writes.
+            connection.execute(
+                "UPDATE entries SET used_at = ? WHERE key = ?", (time.time(), key)
+            )
+            row = connection.execute(
+                "SELECT content, etag, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        content, etag, expires_at = row
+        # Turn the wall clock expiry shared by the processes into the monotonic one of `CacheEntry`.
+        return CacheEntry(content, etag, expires_at - time.time() + time.monotonic())
+
+    def set(self, key: str, endpoint: str, content: bytes, etag: Optional[str]) -> None:
+        """Store a response body, evicting the least recently used entries if needed.
+
+        Args:
+            key (str): The URL of the response.
+            endpoint (str): The endpoint template of the URL, used to pick the TTL.
+            content (bytes): The raw body of the response.
+            etag (Optional[str]): The `ETag` of the response.
+        """
+        size = len(content)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (key, content, etag, now + self.ttl(endpoint), size, now),
+            )
+            self._evict(connection)
+
+    def _evict(self, connection: "sqlite3.Connection") -> None:
+        """Delete the least recently used entries until the cache is within its limits."""
+        count, total = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM entries ORDER BY used_at"
+        ):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total -= size
+        connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+
+    def refresh(self, key: str, endpoint: str) -> None:
+        """Make a stale entry fresh again after the server confirmed it did not change.
+
+        Args:
+            key (str): The URL of the cached response.
+            endpoint (str): The endpoint template of the URL, used to pick the TTL.
+        """
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE entries SET expires_at = ? WHERE key = ?",
+                (time.time() + self.ttl(endpoint), key),
+            )
+
+    def invalidate(self, key: str) -> None:
+        """Remove an entry from the cache.
+
+        Args:
+            key (str): The URL of the cached response.
+        """
+        with self._connection() as connection:
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove all the entries from the cache."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Close the connection of the current thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+# The caches accepted by the clients.
+Cache = Union[ResponseCache, SqliteCache]
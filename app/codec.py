@@ -0,0 +1,68 @@
+import json
+from typing import Any, Optional, Protocol, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+
+class Codec(Protocol):
+    """Encodes the request bodies to JSON and decodes the response bodies from JSON."""
+
+    name: str
+
+    def dumps(self, data: Any) -> bytes: ...
+
+    def loads(self, content: Union[bytes, str]) -> Any: ...
+
+
+class StdlibCodec:
+    """JSON codec of the standard library, always available."""
+
+    name = "json"
+
+    def dumps(self, data: Any) -> bytes:
+        """Encode data to compact UTF-8 JSON."""
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def loads(self, content: Union[bytes, str]) -> Any:
+        """Decode a JSON document."""
+        return json.loads(content)
+
+
+class OrjsonCodec:
+    """JSON codec backed by `orjson`, several times faster than the standard library."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed.")
+
+    def dumps(self, data: Any) -> bytes:
+        """Encode data to compact UTF-8 JSON."""
+        return orjson.dumps(data)
+
+    def loads(self, content: Union[bytes, str]) -> Any:
+        """Decode a JSON document."""
+        return orjson.loads(content)
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """Get a JSON codec by name, or the fastest one installed.
+
+    Args:
+        name (Optional[str]): `"orjson"` or `"json"` (default is None, `orjson` if it is installed and the
+            standard library otherwise).
+
+    Returns:
+        Codec: The codec.
+    """
+    if name is None:
+        name = "json" if orjson is None else "orjson"
+    if name == "orjson":
+        return OrjsonCodec()
+    if name == "json":
+        return StdlibCodec()
+    raise ValueError(f"Unknown JSON codec {name!r}.")
@@ -1,8 +1,18 @@
-from dataclasses import dataclass, asdict
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
+# The models are slotted to keep their instances small, and they convert from and to JSON with explicit
+# field lists instead of `dataclasses.asdict`, which deep-copies every value recursively. The nested values
+# (the address and company of a user) are shared with the source dictionary, not copied.
 
-@dataclass
+# The collections of the API and the formats they can be exported to. They are defined with the models,
+# not in `app.export`, so that `main.py` can offer them as choices without loading the export machinery.
+COLLECTIONS = ("users", "posts", "comments")
+
+FORMATS = ("ndjson", "csv")
+
+
+@dataclass(slots=True)
 class User:
     """Represents an user with information details.
 
@@ -10,32 +20,64 @@ class User:
         name (str): The name of the user.
         username (str): The username of the user.
         email (str): The email address of the user.
-        address (Optional[str]): The user's address (default is None).
+        adress (Optional[Dict]): The user's address, stored under the `address` JSON key
+            (default is None).
         phone (Optional[str]): The user's phone number (default is None).
         website (Optional[str]): The user's website (default is None).
-        company (Optional[str]): The company of the user (default is None).
+        company (Optional[Dict]): The company of the user (default is None).
         id (Optional[int]): The user ID (default is None).
     """
 
     name: str
     username: str
     email: str
-    adress: Optional[str] = None
+    adress: Optional[Dict] = None
     phone: Optional[str] = None
     website: Optional[str] = None
-    company: Optional[str] = None
+    company: Optional[Dict] = None
     id: Optional[int] = None
 
+    @classmethod
+    def from_json(cls, data: Dict) -> "User":
+        """Creates a user instance from a JSON dictionary.
+
+        Args:
+            data (Dict): The user data, as returned by the API.
+
+        Returns:
+            User: The user instance.
+        """
+        get = data.get
+        return cls(
+            data["name"],
+            data["username"],
+            data["email"],
+            get("address"),
+            get("phone"),
+            get("website"),
+            get("company"),
+            get("id"),
+        )
+
     def to_json(self) -> Dict:
         """Converts the user instance to a JSON dictionary.
 
         Returns:
             Dict: A dictionary representation of the user instance.
         """
-        return asdict(self)
-
-
-@dataclass
+        return {
+            "name": self.name,
+            "username": self.username,
+            "email": self.email,
+            "address": self.adress,
+            "phone": self.phone,
+            "website": self.website,
+            "company": self.company,
+            "id": self.id,
+        }
+
+
+@dataclass(slots=True)
 class Post:
     """Represents a post with information details.
 
@@ -51,16 +93,34 @@ class Post:
     id: Optional[int] = None
     userId: Optional[int] = None
 
+    @classmethod
+    def from_json(cls, data: Dict) -> "Post":
+        """Creates a post instance from a JSON dictionary.
+
+        Args:
+            data (Dict): The post data, as returned by the API.
+
+        Returns:
+            Post: The post instance.
+        """
+        get = data.get
+        return cls(data["title"], data["body"], get("id"), get("userId"))
+
     def to_json(self) -> Dict:
         """Converts the post instance to a JSON dictionary.
 
         Returns:
             Dict: A dictionary representation of the post instance.
         """
-        return asdict(self)
+        return {
+            "title": self.title,
+            "body": self.body,
+            "id": self.id,
+            "userId": self.userId,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Comment:
     """Represents a comment with information details.
 
@@ -78,10 +138,87 @@ class Comment:
     id: Optional[int] = None
     postId: Optional[int] = None
 
+    @classmethod
+    def from_json(cls, data: Dict) -> "Comment":
+        """Creates a comment instance from a JSON dictionary.
+
+        Args:
+            data (Dict): The comment data, as returned by the API.
+
+        Returns:
+            Comment: The comment instance.
+        """
+        get = data.get
+        return cls(data["name"], data["email"], data["body"], get("id"), get("postId"))
+
     def to_json(self) -> Dict:
         """Converts the comment instance to a JSON dictionary.
 
         Returns:
             Dict: A dictionary representation of the comment instance.
         """
-        return asdict(self)
+        return {
+            "name": self.name,
+            "email": self.email,
+            "body": self.body,
+            "id": self.id,
+            "postId": self.postId,
+        }
+
+
+@dataclass(slots=True)
+class UserProfile:
+    """Represents a user with their posts and the comments of each post.
+
+    Args:
+        user (User): The user.
+        posts (List[Post]): The posts of the user.
+        comments (Dict[int, List[Comment]]): The comments of each post, by post ID.
+    """
+
+    user: User
+    posts: List[Post]
+    comments: Dict[int, List[Comment]]
+
+    @classmethod
+    def from_json(
+        cls, user: Dict, posts: List[Dict], comments: List[List[Dict]]
+    ) -> "UserProfile":
+        """Creates a profile instance from the JSON data of a user, of their posts and of their comments.
+
+        Args:
+            user (Dict): The user data, as returned by the API.
+            posts (List[Dict]): The posts data of the user, as returned by the API.
+            comments (List[List[Dict]]): The comments data of each post, in the same order as the posts.
+
+        Returns:
+            UserProfile: The profile instance.
+        """
+        return cls(
+            User.from_json(user),
+            [Post.from_json(post) for post in posts],
+            {
+                post["id"]: [Comment.from_json(comment) for comment in post_comments]
+                for post, post_comments in zip(posts, comments)
+            },
+        )
+
+    def to_json(self) -> Dict:
+        """Converts the profile instance to a JSON dictionary, the user with its posts and their comments.
+
+        Returns:
+            Dict: A dictionary representation of the profile instance.
+        """
+        return {
+            **self.user.to_json(),
+            "posts": [
+                {
+                    **post.to_json(),
+                    "comments": [
+                        comment.to_json()
+                        for comment in self.comments.get(post.id, [])  # type: ignore[arg-type]
+                    ],
+                }
+                for post in self.posts
+            ],
+        }
@@ -0,0 +1,263 @@
+import csv
+import gzip
+import io
+import itertools
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+from app.codec import get_codec
+from app.data import COLLECTIONS, FORMATS
+
+if TYPE_CHECKING:
+    from app.api_client import ApiClient
+
+# The number of records encoded together, by a worker process once a collection has more than one chunk.
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def flatten(record: Dict, prefix: str = "") -> Dict[str, Any]:
+    """Flatten the nested objects of a record into dotted keys, such as `address.geo.lat`, for CSV.
+
+    Args:
+        record (Dict): The record to flatten.
+        prefix (str): The prefix of the keys, used for the nested objects (default is "").
+
+    Returns:
+        Dict[str, Any]: The values of the record by dotted key.
+    """
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def encode_chunk(
+    records: List[Dict],
+    fmt: str,
+    columns: List[str],
+    header: bool,
+    compress: bool,
+    codec_name: str,
+) -> bytes:
+    """Encode records to NDJSON or CSV, as a standalone gzip member if `compress` is set.
+
+    It runs in the worker processes, so it takes the name of the codec rather than the codec itself.
+    Concatenated gzip members form a valid gzip file, so the chunks can be compressed independently.
+
+    Args:
+        records (List[Dict]): The records to encode.
+        fmt (str): The output format, `ndjson` or `csv`.
+        columns (List[str]): The CSV columns, as dotted keys.
+        header (bool): Whether to start the CSV with the header row.
+        compress (bool): Whether to gzip the encoded records.
+        codec_name (str): The name of the JSON codec.
+
+    Returns:
+        bytes: The encoded records.
+    """
+    if fmt == "csv":
+        text = io.StringIO()
+        writer = csv.DictWriter(
+            text, columns, extrasaction="ignore", lineterminator="\n"
+        )
+        if header:
+            writer.writeheader()
+        writer.writerows(flatten(record) for record in records)
+        data = text.getvalue().encode()
+    else:
+        dumps = get_codec(codec_name).dumps
+        data = b"".join(dumps(record) + b"\n" for record in records)
+    return gzip.compress(data, compresslevel=6) if compress else data
+
+
+def _chunks(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Group records into lists of `size` records, the last one possibly shorter."""
+    chunk: List[Dict] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_collection(
+    records: Iterable[Dict],
+    path: str,
+    fmt: str = "ndjson",
+    compress: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    submit: Optional[Callable[..., Future]] = None,
+    window: int = 4,
+    codec_name: str = "json",
+) -> Dict[str, Any]:
+    """Write a stream of records to a file, holding at most `window` chunks in memory.
+
+    A collection of a single chunk is encoded in the calling thread. Otherwise each chunk is passed to
+    `submit`, usually the `submit` method of a process pool, and the encoded chunks are written in order.
+
+    Args:
+        records (Iterable[Dict]): The records, followed by an error message if fetching them failed.
+        path (str): The path of the output file.
+        fmt (str): The output format, `ndjson` or `csv` (default is "ndjson").
+        compress (bool): Whether to gzip the output (default is False).
+        chunk_size (int): The number of records encoded together (default is DEFAULT_CHUNK_SIZE).
+        submit (Optional[Callable[..., Future]]): Runs `encode_chunk` with its arguments, for example in a
+            process pool (default is None, encode in the calling thread).
+        window (int): The maximum number of chunks being encoded at once (default is 4).
+        codec_name (str): The name of the JSON codec used for NDJSON (default is "json").
+
+    Returns:
+        Dict[str, Any]: The path, the number of records and of bytes written, the duration in seconds and
+          the error message if fetching the records failed.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}.")
+    start = time.perf_counter()
+    report: Dict[str, Any] = {"path": path, "records": 0, "bytes": 0}
+    columns: List[str] = []
+    pending: Deque[Future] = deque()
+
+    def valid() -> Iterator[Dict]:
+        for record in records:
+            if "error" in record:
+                report["error"] = record
+                return
+            yield record
+
+    chunks = _chunks(valid(), chunk_size)
+    head = [chunk for chunk in (next(chunks, None), next(chunks, None)) if chunk]
+    if fmt == "csv" and head:
+        columns = list(flatten(head[0][0]))
+    # A collection of a single chunk is not worth the round trip to a worker process.
+    pool = submit if len(head) > 1 else None
+    with open(path, "wb") as output:
+
+        def write(data: bytes) -> None:
+            output.write(data)
+            report["bytes"] += len(data)
+
+        for index, chunk in enumerate(itertools.chain(head, chunks)):
+            report["records"] += len(chunk)
+            arguments = (chunk, fmt, columns, index == 0, compress, codec_name)
+            if pool is None:
+                write(encode_chunk(*arguments))
+                continue
+            pending.append(pool(encode_chunk, *arguments))
+            if len(pending) >= window:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def _download(api_client: "ApiClient", name: str) -> Iterator[Dict]:
+    """Stream a collection, turning a connection failure into an error message."""
+    # Imported here, as the worker processes import this module but never download anything.
+    import requests
+
+    try:
+        yield from getattr(api_client, f"stream_{name}")()
+    except requests.RequestException as exc:
+        yield {
+            "error": f"Failed to fetch {name}.",
+            "status_code": None,
+            "reason": str(exc),
+        }
+
+
+def export_dataset(
+    api_client: "ApiClient",
+    directory: str,
+    collections: Iterable[str] = COLLECTIONS,
+    fmt: str = "ndjson",
+    compress: bool = False,
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Export collections to `<directory>/<collection>.<fmt>`, with a `.gz` suffix if compressed.
+
+    The collections are downloaded in parallel, each with a single streamed request, and their records are
+    written while they arrive, so no collection is held in memory. The nested objects of the records are
+    flattened into dotted columns in CSV. The large collections are encoded and compressed by a pool of
+    `processes` worker processes.
+
+    Args:
+        api_client (ApiClient): The client downloading the collections.
+        directory (str): The directory of the output files, created if needed.
+        collections (Iterable[str]): The collections to export (default is COLLECTIONS, all of them).
+        fmt (str): The output format, `ndjson` or `csv` (default is "ndjson").
+        compress (bool): Whether to gzip the output files (default is False).
+        processes (Optional[int]): The number of worker processes, 0 to encode in the downloading threads
+            (default is None, the number of CPUs).
+        chunk_size (int): The number of records encoded together (default is DEFAULT_CHUNK_SIZE).
+
+    Returns:
+        Dict[str, Any]: The report of each collection, the total number of records and of bytes written,
+          the duration in seconds and the throughput in records and bytes per second.
+    """
+    names = list(collections)
+    for name in names:
+        if name not in COLLECTIONS:
+            raise ValueError(
+                f"Unknown collection {name!r}, expected one of {COLLECTIONS}."
+            )
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}.")
+    os.makedirs(directory, exist_ok=True)
+    start = time.perf_counter()
+    suffix = f".{fmt}.gz" if compress else f".{fmt}"
+    # The workers are spawned rather than forked, as forking while the downloading threads run is unsafe;
+    # they only import this module and the codecs.
+    pool = None
+    if processes != 0:
+        pool = ProcessPoolExecutor(processes, multiprocessing.get_context("spawn"))
+    try:
+        with ThreadPoolExecutor(max_workers=len(names) or 1) as executor:
+            futures = {
+                name: executor.submit(
+                    export_collection,
+                    _download(api_client, name),
+                    os.path.join(directory, name + suffix),
+                    fmt,
+                    compress,
+                    chunk_size,
+                    pool.submit if pool is not None else None,
+                    codec_name=api_client.codec.name,
+                )
+                for name in names
+            }
+            reports = {name: future.result() for name, future in futures.items()}
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    seconds = time.perf_counter() - start
+    records = sum(report["records"] for report in reports.values())
+    written = sum(report["bytes"] for report in reports.values())
+    return {
+        "collections": reports,
+        "records": records,
+        "bytes": written,
+        "seconds": seconds,
+        "records_per_second": records / seconds if seconds else 0.0,
+        "bytes_per_second": written / seconds if seconds else 0.0,
+    }
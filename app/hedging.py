@@ -0,0 +1,149 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, TimeoutError, wait
+from typing import Callable, Deque, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """
+    Policy to hedge idempotent requests: if the first attempt has not answered after a delay taken from a
+    percentile of the recent latencies, a second attempt is sent and the first one to answer wins.
+
+    The extra load is capped by a budget: every request earns `budget` hedge tokens, up to `burst` tokens,
+    and every hedge spends one, so at most about `budget` of the requests are hedged over time. A running
+    attempt cannot be interrupted by `requests`, so the losing attempt is cancelled if it has not started
+    yet and its response is discarded otherwise.
+
+    Args:
+        percentile (float): The percentile of the recent latencies used as hedge delay (default is 95).
+        initial_delay (float): The hedge delay in seconds until `min_samples` latencies are known
+            (default is 0.1).
+        min_delay (float): The lower bound of the hedge delay in seconds (default is 0.005).
+        max_delay (float): The upper bound of the hedge delay in seconds (default is 2.0).
+        budget (float): The fraction of the requests that may be hedged (default is 0.05).
+        burst (float): The maximum number of hedge tokens that can be saved up (default is 10).
+        window (int): The number of recent latencies kept to compute the percentile (default is 1000).
+        min_samples (int): The number of latencies needed before using the percentile (default is 20).
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 0.1,
+        min_delay: float = 0.005,
+        max_delay: float = 2.0,
+        budget: float = 0.05,
+        burst: float = 10.0,
+        window: int = 1000,
+        min_samples: int = 20,
+    ) -> None:
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.burst = burst
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self._delay = initial_delay
+        self._tokens = burst
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._samples = 0
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """The current hedge delay in seconds."""
+        return self._delay
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a request and update the hedge delay every few samples.
+
+        Args:
+            latency (float): The latency of the request in seconds.
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            # The window stops growing once full, so the samples are counted apart to keep updating.
+            self._samples += 1
+            if self._samples == self.min_samples or (
+                self._samples > self.min_samples and self._samples % 16 == 0
+            ):
+                count = len(self._latencies)
+                ordered = sorted(self._latencies)
+                # Nearest-rank percentile: the smallest latency with `percentile` % of them at or below it.
+                rank = math.ceil(count * self.percentile / 100)
+                index = min(count - 1, max(0, rank - 1))
+                self._delay = min(self.max_delay, max(self.min_delay, ordered[index]))
+
+    def _admit(self) -> None:
+        """Count a new request and give it its share of hedge tokens."""
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.burst, self._tokens + self.budget)
+
+    def _take_token(self) -> bool:
+        """Spend a hedge token if one is left."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedges_fired += 1
+            return True
+
+    def run(self, send: Callable[[], T], executor: Executor) -> T:
+        """Send a request, hedging it if it is slower than the hedge delay.
+
+        Args:
+            send (Callable[[], T]): The function sending the request, called once per attempt.
+            executor (Executor): The executor running the attempts.
+
+        Returns:
+            T: The result of the first attempt to answer.
+        """
+        self._admit()
+        start = time.perf_counter()
+        first = executor.submit(send)
+        try:
+            result = first.result(timeout=self._delay)
+        except TimeoutError:
+            pass
+        else:
+            self.record(time.perf_counter() - start)
+            return result
+        if not self._take_token():
+            result = first.result()
+            self.record(time.perf_counter() - start)
+            return result
+
+        second = executor.submit(send)
+        done, _ = wait([first, second], return_when=FIRST_COMPLETED)
+        winner, loser = (first, second) if first in done else (second, first)
+        if winner.exception() is None:
+            loser.cancel()
+        else:
+            winner = loser
+        result = winner.result()
+        self.record(time.perf_counter() - start)
+        if winner is second:
+            with self._lock:
+                self.hedges_won += 1
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        """Get the counters of the policy.
+
+        Returns:
+            Dict[str, float]: The number of requests, hedges fired and hedges won, and the current delay.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges_fired": self.hedges_fired,
+                "hedges_won": self.hedges_won,
+                "delay": self._delay,
+            }
@@ -0,0 +1,251 @@
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket holds everything slower.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+@dataclass(slots=True)
+class RequestEvent:
+    """Describes one exchange with the server, passed to the hooks of the client.
+
+    Args:
+        method (str): The HTTP method.
+        endpoint (str): The endpoint template, for example `/posts/{id}`.
+        url (str): The full URL of the request.
+        status_code (Optional[int]): The status code, or None if the request failed without a response.
+        bytes_out (int): The approximate size of the request line, headers and body.
+        bytes_in (int): The size of the response body.
+        total (float): The time in seconds from sending the request to reading the whole body.
+        ttfb (Optional[float]): The time in seconds until the response headers were received.
+        dns (Optional[float]): The time in seconds spent resolving the host, if a connection was opened.
+        connect (Optional[float]): The time in seconds spent on the TCP and TLS handshakes, if a
+            connection was opened.
+        reused (Optional[bool]): Whether a pooled connection was reused, None if unknown.
+        error (Optional[str]): The error of a request which failed without a response.
+    """
+
+    method: str
+    endpoint: str
+    url: str
+    status_code: Optional[int]
+    bytes_out: int
+    bytes_in: int
+    total: float
+    ttfb: Optional[float] = None
+    dns: Optional[float] = None
+    connect: Optional[float] = None
+    reused: Optional[bool] = None
+    error: Optional[str] = None
+
+
+Hook = Callable[[RequestEvent], None]
+
+
+class ConnectionTiming:
+    """Timings of the connection used by the request running on the current thread."""
+
+    __slots__ = ("pooled", "opened", "dns", "connect")
+
+    def __init__(self) -> None:
+        self.pooled = False
+        # Whether the request opened a new connection, even one that failed to connect.
+        self.opened = False
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+
+    @property
+    def reused(self) -> Optional[bool]:
+        """Whether the request reused a pooled connection, None if it did not go through the pool."""
+        return not self.opened if self.pooled else None
+
+
+_local = threading.local()
+
+
+def start_timing() -> ConnectionTiming:
+    """Start recording the connection timings of the request about to be sent on this thread."""
+    timing = ConnectionTiming()
+    _local.timing = timing
+    return timing
+
+
+def _current_timing() -> Optional[ConnectionTiming]:
+    return getattr(_local, "timing", None)
+
+
+class _TimedConnectionMixin:
+    """Records the DNS and connect times of new connections in the timing of the current thread."""
+
+    _dns_host: str
+    port: int
+
+    def connect(self) -> None:
+        start = time.perf_counter()
+        super().connect()  # type: ignore[misc]
+        timing = _current_timing()
+        if timing is not None:
+            timing.connect = time.perf_counter() - start - (timing.dns or 0.0)
+
+    def _new_conn(self) -> socket.socket:
+        timing = _current_timing()
+        if timing is None:
+            return super()._new_conn()  # type: ignore[misc]
+        timing.opened = True
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(
+                self._dns_host, self.port, type=socket.SOCK_STREAM
+            )
+        except OSError:
+            # Let urllib3 resolve again and raise its own error.
+            return super()._new_conn()  # type: ignore[misc]
+        timing.dns = time.perf_counter() - start
+        hosts = {str(address[4][0]) for address in addresses}
+        if len(hosts) != 1:
+            # urllib3 tries each address in turn, let it resolve the name itself.
+            return super()._new_conn()  # type: ignore[misc]
+        # Connect once to the only address just resolved instead of resolving it twice.
+        host = self._dns_host
+        self._dns_host = hosts.pop()
+        try:
+            return super()._new_conn()  # type: ignore[misc]
+        finally:
+            self._dns_host = host
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTP adapter whose pooled connections report their DNS and connect times and their reuse."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs) -> requests.Response:
+        timing = _current_timing()
+        if timing is not None:
+            timing.pooled = True
+        return super().send(request, *args, **kwargs)
+
+
+def request_size(request: requests.PreparedRequest) -> int:
+    """Get the approximate size in bytes of a request on the wire.
+
+    Args:
+        request (requests.PreparedRequest): The request sent.
+
+    Returns:
+        int: The size of the request line, the headers and the body.
+    """
+    size = len(request.method or "") + len(request.path_url) + 11
+    size += sum(len(name) + len(value) + 4 for name, value in request.headers.items())
+    body = request.body
+    if body is not None:
+        size += len(body.encode() if isinstance(body, str) else body)
+    return size
+
+
+class ClientStats:
+    """
+    Aggregates the events of a client per endpoint: the number of requests, the errors, the status codes
+    and a histogram of the latencies, with the bucket bounds of `LATENCY_BUCKETS`.
+    """
+
+    def __init__(self) -> None:
+        self._endpoints: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        """Record an event. The instance can be used directly as a hook."""
+        key = f"{event.method} {event.endpoint}"
+        bucket = len(LATENCY_BUCKETS)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if event.total <= bound:
+                bucket = index
+                break
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = {
+                    "count": 0,
+                    "errors": 0,
+                    "status_codes": {},
+                    "bytes_in": 0,
+                    "bytes_out": 0,
+                    "latency_sum": 0.0,
+                    "latency_buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+                }
+            stats["count"] += 1
+            if event.status_code is None or event.status_code >= 400:
+                stats["errors"] += 1
+            if event.status_code is not None:
+                codes = stats["status_codes"]
+                codes[event.status_code] = codes.get(event.status_code, 0) + 1
+            stats["bytes_in"] += event.bytes_in
+            stats["bytes_out"] += event.bytes_out
+            stats["latency_sum"] += event.total
+            stats["latency_buckets"][bucket] += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Get a copy of the statistics of every endpoint.
+
+        Returns:
+            Dict[str, Dict]: The statistics per `"<method> <endpoint>"`, with the latency histogram given
+              as the number of requests per bucket upper bound in seconds (`"+Inf"` for the last one).
+        """
+        bounds: List[str] = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        with self._lock:
+            return {
+                key: dict(
+                    stats,
+                    status_codes=dict(stats["status_codes"]),
+                    latency_buckets=dict(zip(bounds, stats["latency_buckets"])),
+                )
+                for key, stats in self._endpoints.items()
+            }
+
+    def reset(self) -> None:
+        """Forget all the recorded events."""
+        with self._lock:
+            self._endpoints.clear()
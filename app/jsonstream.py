@@ -0,0 +1,91 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+
+# Values starting with one of these characters end with a delimiter, so they are complete as soon as they
+# decode. Numbers and literals at the end of the buffer may still continue in the next chunk.
+_DELIMITED = '{["'
+
+# A number split inside its fraction or exponent decodes up to the split, before one of these characters.
+_NUMBER_TAIL = ".eE+-"
+
+_START, _FIRST, _VALUE, _AFTER = range(4)
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Decode a JSON array incrementally and yield its elements one at a time.
+
+    Only the undecoded tail of the body is kept in memory, so the peak memory does not depend on the size of
+    the array, and the first element is available as soon as its bytes have arrived.
+
+    Args:
+        chunks (Iterable[bytes]): The body of the response, in chunks of any size.
+
+    Yields:
+        Any: The decoded elements of the array.
+
+    Raises:
+        ValueError: If the body is not a well formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunk_iterator = iter(chunks)
+    buffer = ""
+    position = 0
+    eof = False
+    state = _START
+
+    def read_more() -> bool:
+        nonlocal buffer, position, eof
+        if eof:
+            return False
+        buffer = buffer[position:]
+        position = 0
+        chunk = next(chunk_iterator, None)
+        if chunk is None:
+            eof = True
+            buffer += utf8.decode(b"", final=True)
+        else:
+            buffer += utf8.decode(chunk)
+        return True
+
+    while True:
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        if position == len(buffer):
+            if not read_more():
+                raise ValueError("Unexpected end of the JSON array.")
+            continue
+
+        char = buffer[position]
+        if state == _START:
+            if char != "[":
+                raise ValueError("Expected a JSON array.")
+            position += 1
+            state = _FIRST
+        elif char == "]" and state in (_FIRST, _AFTER):
+            return
+        elif state == _AFTER:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' but got {char!r}.")
+            position += 1
+            state = _VALUE
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                end = -1
+            incomplete = end == -1 or (
+                char not in _DELIMITED
+                and not eof
+                and not buffer[end:].strip(_WHITESPACE + _NUMBER_TAIL)
+            )
+            if incomplete:
+                if not read_more():
+                    raise ValueError("Malformed JSON array.")
+                continue
+            position = end
+            state = _AFTER
+            yield value
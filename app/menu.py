@@ -1,6 +1,11 @@
-from app.api_client import ApiClient
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
 from app.data import User, Post, Comment
 
+if TYPE_CHECKING:
+    from app.api_client import ApiClient
+
 
 class Menu:
     """
@@ -9,18 +14,42 @@ class Menu:
     It allows users to perform actions like listing information about users, posts, comments,
     and creating, updating or deleting posts.
 
+    If the client has a cache, the menu warms it in the background while the operator is typing: the
+    list of users at startup, the posts of a user once the user was viewed, and the comments of a post
+    once the post was viewed, so that the following choices are answered locally.
+
     Args:
         api_client(ApiClient): An instance of the ApiClient used to make API requests.
+        prefetch(bool): Whether to warm the cache of the client in the background (default is True).
     """
 
-    def __init__(self, api_client: ApiClient) -> None:
+    def __init__(self, api_client: "ApiClient", prefetch: bool = True) -> None:
         self.api_client = api_client
+        self._prefetcher: Optional[ThreadPoolExecutor] = None
+        if prefetch and api_client.cache is not None:
+            self._prefetcher = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="prefetch"
+            )
+
+    def _prefetch(self, warm: Callable[..., int], *args: str) -> None:
+        """Run a cache warming method of the client in the background, ignoring its failures."""
+        if self._prefetcher is not None:
+            self._prefetcher.submit(warm, *args)
 
     def run(self) -> None:
         """
         Starts the console menu loop. Based on the user's choice, it performes the desired action
         and display the result. It continues to run until the user chooses the option to exit.
         """
+        self._prefetch(self.api_client.warm_users)
+        try:
+            self._loop()
+        finally:
+            if self._prefetcher is not None:
+                self._prefetcher.shutdown(wait=False, cancel_futures=True)
+
+    def _loop(self) -> None:
+        """Show the menu and run the chosen actions until the user exits."""
         while True:
             print("\n=====================================")
             print("Choose the action from the following:")
@@ -36,6 +65,7 @@ class Menu:
             print("0. Exit")
             print("=====================================\n")
             choice = input("Enter your choice: ")
+            response: Any
 
             if choice == "1":
                 response = self.api_client.get_all_users()
@@ -47,6 +77,7 @@ class Menu:
                 user_id_str = input("Enter user id: ")
                 response = self.api_client.get_user(user_id_str)
                 if "error" not in response:
+                    self._prefetch(self.api_client.warm_posts_of_user, user_id_str)
                     print("User details:")
                 print(response)
 
@@ -54,6 +85,7 @@ class Menu:
                 post_id_str = input("Enter post id: ")
                 response = self.api_client.get_posts(post_id_str)
                 if "error" not in response:
+                    self._prefetch(self.api_client.warm_comments_of_post, post_id_str)
                     print("User posts:")
                 print(response)
 
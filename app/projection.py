@@ -0,0 +1,63 @@
+from typing import Any, Dict, Iterable, Optional
+
+# A projection is a tree of the kept keys: a key mapped to None is kept with its whole value, a key mapped
+# to a projection is kept with only the keys of that projection.
+Projection = Dict[str, Any]
+
+
+def compile_fields(fields: Optional[Iterable[str]]) -> Optional[Projection]:
+    """Build the projection of a list of dotted paths, such as `["id", "name", "address.geo.lat"]`.
+
+    A path keeps its whole value, nested objects included, so `address` wins over `address.geo`.
+
+    Args:
+        fields (Optional[Iterable[str]]): The dotted paths to keep, None to keep everything.
+
+    Returns:
+        Optional[Projection]: The projection, or None if `fields` is None.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = [fields]
+    tree: Projection = {}
+    for field in fields:
+        keys = field.split(".")
+        if not all(keys):
+            raise ValueError(f"Invalid field {field!r}.")
+        node = tree
+        for key in keys[:-1]:
+            if key in node and node[key] is None:
+                break
+            node = node.setdefault(key, {})
+        else:
+            node[keys[-1]] = None
+    if not tree:
+        raise ValueError("fields must name at least one field.")
+    return tree
+
+
+def project(data: Any, projection: Optional[Projection]) -> Any:
+    """Keep only the paths of a projection in a record, or in each record of a list.
+
+    The missing paths are skipped. The kept values are shared with `data`, not copied, so the dropped ones
+    can be freed as soon as `data` is.
+
+    Args:
+        data (Any): The decoded record, or list of records.
+        projection (Optional[Projection]): The projection, None to return `data` as is.
+
+    Returns:
+        Any: The projected record, or list of records.
+    """
+    if projection is None:
+        return data
+    if isinstance(data, list):
+        return [project(item, projection) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {
+        key: data[key] if keys is None else project(data[key], keys)
+        for key, keys in projection.items()
+        if key in data
+    }
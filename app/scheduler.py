@@ -0,0 +1,223 @@
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Callable, Deque, Dict, Mapping, Optional, Protocol, TypeVar
+
+
+class _Response(Protocol):
+    @property
+    def status_code(self) -> int: ...
+
+    @property
+    def headers(self) -> Mapping[str, str]: ...
+
+
+R = TypeVar("R", bound=_Response)
+
+# Status codes by which the server says it is overloaded.
+THROTTLED = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header, given either in seconds or as an HTTP date.
+
+    Args:
+        value (Optional[str]): The value of the header.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveScheduler:
+    """
+    Scheduler shared by all the requests of a client, keeping the throughput as high as the server accepts.
+
+    Every request waits for a token of a token bucket refilled at `rate` requests per second, if a rate is
+    set, and for a free slot under the concurrency limit. The limit is adapted AIMD-style: it grows by about
+    one slot per round trip while the latencies stay within `tolerance` times the baseline of their endpoint,
+    and it is multiplied by `backoff` when the latency rises above that or the server answers 429 or 503.
+    The baseline is the lowest of the last `baseline_window` successful latencies of the endpoint, so a
+    cheap endpoint does not set the bar for the others and an unusually fast response is forgotten. The
+    limit is reduced at most once per round trip, so a burst of throttled responses counts as one signal.
+    A `Retry-After` header pauses all the requests until it expires, and the throttled request is retried
+    up to `max_retries` times.
+
+    Args:
+        rate (Optional[float]): The maximum number of requests per second, or None for no rate limit
+            (default is None).
+        burst (float): The number of requests that can be sent at once when the bucket is full
+            (default is 10).
+        initial_limit (float): The initial concurrency limit (default is 4).
+        min_limit (float): The lowest concurrency limit (default is 1).
+        max_limit (float): The highest concurrency limit (default is 64).
+        backoff (float): The factor applied to the limit on congestion (default is 0.5).
+        tolerance (float): How many times the baseline of its endpoint a request may take before it counts as
+            congestion (default is 3).
+        max_retries (int): The number of retries of a throttled request (default is 2).
+        default_retry_after (float): The pause in seconds after a throttled response without a
+            `Retry-After` header (default is 0.5).
+        baseline_window (int): The number of recent successful latencies of an endpoint its baseline is
+            taken from (default is 32).
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: float = 10.0,
+        initial_limit: float = 4.0,
+        min_limit: float = 1.0,
+        max_limit: float = 64.0,
+        backoff: float = 0.5,
+        tolerance: float = 3.0,
+        max_retries: int = 2,
+        default_retry_after: float = 0.5,
+        baseline_window: int = 32,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.max_retries = max_retries
+        self.default_retry_after = default_retry_after
+        self.baseline_window = baseline_window
+        self.in_flight = 0
+        self.throttled = 0
+        self.retries = 0
+        self._tokens = burst
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until the request may be sent."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    self._condition.wait(self._paused_until - now)
+                    continue
+                if self.in_flight >= max(1, int(self.limit)):
+                    self._condition.wait()
+                    continue
+                if self.rate is not None:
+                    self._tokens = min(
+                        self.burst, self._tokens + (now - self._refilled_at) * self.rate
+                    )
+                    self._refilled_at = now
+                    if self._tokens < 1:
+                        self._condition.wait((1 - self._tokens) / self.rate)
+                        continue
+                    self._tokens -= 1
+                self.in_flight += 1
+                return
+
+    def release(
+        self,
+        latency: float,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        endpoint: str = "",
+    ) -> None:
+        """Give back the slot of a finished request and adapt the limit to its outcome.
+
+        Args:
+            latency (float): The latency of the request in seconds.
+            status_code (Optional[int]): The status code of the response, or None if the request failed
+                (default is None).
+            retry_after (Optional[float]): The pause in seconds asked by the server (default is None).
+            endpoint (str): The endpoint template of the request, whose latencies are compared
+                (default is "", shared by the requests without one).
+        """
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if status_code in THROTTLED:
+                self.throttled += 1
+                pause = self.default_retry_after if retry_after is None else retry_after
+                self._paused_until = max(self._paused_until, now + pause)
+                self._decrease(now, latency)
+            elif status_code is not None:
+                latencies = self._latencies.get(endpoint)
+                if latencies is None:
+                    latencies = deque(maxlen=self.baseline_window)
+                    self._latencies[endpoint] = latencies
+                # Only the successful responses set the baseline, as a 304 or a 404 is cheaper to answer.
+                if 200 <= status_code < 300:
+                    latencies.append(latency)
+                if latencies and latency > self.tolerance * min(latencies):
+                    self._decrease(now, latency)
+                else:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def _decrease(self, now: float, latency: float) -> None:
+        """Reduce the limit, at most once per round trip."""
+        if now - self._last_decrease >= latency:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+            self._last_decrease = now
+
+    def run(self, send: Callable[[], R], hold: bool = False, endpoint: str = "") -> R:
+        """Send a request under the scheduler, retrying it while the server throttles it.
+
+        Args:
+            send (Callable[[], R]): The function sending the request. Its result must have the
+                `status_code` and `headers` of the response.
+            hold (bool): Whether to keep the slot of the returned response until the caller calls
+                `release`, for a response whose body is read after `run` returns (default is False).
+            endpoint (str): The endpoint template of the request (default is "").
+
+        Returns:
+            R: The response of the last attempt.
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            start = time.monotonic()
+            try:
+                response = send()
+            except BaseException:
+                self.release(time.monotonic() - start, endpoint=endpoint)
+                raise
+            status_code = response.status_code
+            done = status_code not in THROTTLED or attempt >= self.max_retries
+            if done and hold:
+                return response
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.release(time.monotonic() - start, status_code, retry_after, endpoint)
+            if done:
+                return response
+            attempt += 1
+            with self._condition:
+                self.retries += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Get the state and the counters of the scheduler.
+
+        Returns:
+            Dict[str, float]: The concurrency limit, the requests in flight, and the number of throttled
+              responses and retries.
+        """
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "throttled": self.throttled,
+                "retries": self.retries,
+            }
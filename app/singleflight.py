@@ -0,0 +1,121 @@
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Hashable, TypeVar
+
+if TYPE_CHECKING:
+    import asyncio
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key across threads: the first caller runs the call, and the
+    callers arriving while it is in flight wait for it and get the same result, or the same exception.
+    Once the call has finished, the next caller for the key runs a new one.
+
+    The result is shared by reference, so it should be immutable, for example the raw body of a response
+    that every caller decodes on its own.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> T:
+        """Run a call, or wait for the call already in flight for the same key.
+
+        Args:
+            key (Hashable): The key identifying identical calls, for example the URL of a GET request.
+            call (Callable[[], T]): The function to run if no call is in flight for the key.
+
+        Returns:
+            T: The result of the call.
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                follower = True
+            else:
+                flight = self._flights[key] = Future()
+                follower = False
+        if follower:
+            return flight.result()
+
+        try:
+            result = call()
+        except BaseException as exc:
+            self._land(key)
+            flight.set_exception(exc)
+            raise
+        self._land(key)
+        flight.set_result(result)
+        return result
+
+    def _land(self, key: Hashable) -> None:
+        """Let the next caller for the key run a new call."""
+        with self._lock:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get the counters of the coalescing.
+
+        Returns:
+            Dict[str, int]: The number of calls and the number of them that waited for a call in flight.
+        """
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent calls for the same key on an event loop, like `SingleFlight` does across threads.
+
+    The call runs in its own task, so cancelling one of the waiting callers does not cancel it for the
+    others.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._flights: Dict[Hashable, "asyncio.Future"] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Run a call, or wait for the call already in flight for the same key.
+
+        Args:
+            key (Hashable): The key identifying identical calls, for example the URL of a GET request.
+            call (Callable[[], Awaitable[T]]): The coroutine function to run if no call is in flight for
+                the key.
+
+        Returns:
+            T: The result of the call.
+        """
+        # Imported here so that the threaded clients do not pay for loading asyncio.
+        import asyncio
+
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+        else:
+            flight = self._flights[key] = asyncio.ensure_future(call())
+            flight.add_done_callback(lambda done: self._land(key, done))
+        return await asyncio.shield(flight)
+
+    def _land(self, key: Hashable, flight: "asyncio.Future") -> None:
+        """Let the next caller for the key run a new call."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get the counters of the coalescing.
+
+        Returns:
+            Dict[str, int]: The number of calls and the number of them that waited for a call in flight.
+        """
+        return {"calls": self.calls, "coalesced": self.coalesced}
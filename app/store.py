@@ -0,0 +1,173 @@
+from typing import Callable, Dict, List, Optional, Set, Union
+
+from app.api_client import ApiClient
+from app.data import Comment, Post, User
+
+
+class SnapshotStore:
+    """
+    Local snapshot of the users, posts and comments of the API, with hash indexes on `userId` and `postId`.
+
+    Once filled with `refresh`, join-style questions such as "all the comments on the posts of a user" are
+    answered from memory, with one dictionary lookup per key. Later calls to `refresh` revalidate each
+    collection with its `ETag`, so an unchanged collection costs a 304 response instead of a download, and
+    only the records that changed are replaced in the snapshot and its indexes.
+    """
+
+    def __init__(self) -> None:
+        self.users: Dict[int, User] = {}
+        self.posts: Dict[int, Post] = {}
+        self.comments: Dict[int, Comment] = {}
+        self._posts_by_user: Dict[int, Set[int]] = {}
+        self._comments_by_post: Dict[int, Set[int]] = {}
+        self._etags: Dict[str, str] = {}
+
+    def refresh(self, api_client: ApiClient) -> Dict[str, Dict]:
+        """Fill or update the snapshot from the `/users`, `/posts` and `/comments` collections.
+
+        Args:
+            api_client (ApiClient): The client used to fetch the collections.
+
+        Returns:
+            Dict[str, Dict]: For each collection, the number of added, updated and deleted records, or an
+              error message if the collection could not be fetched
+        """
+        return {
+            "users": self._refresh(api_client, "users", User.from_json, self.users),
+            "posts": self._refresh(api_client, "posts", Post.from_json, self.posts),
+            "comments": self._refresh(
+                api_client, "comments", Comment.from_json, self.comments
+            ),
+        }
+
+    def _refresh(
+        self,
+        api_client: ApiClient,
+        name: str,
+        from_json: Callable[[Dict], Union[User, Post, Comment]],
+        records: Dict,
+    ) -> Dict:
+        """Revalidate one collection and apply the records that changed.
+
+        Args:
+            api_client (ApiClient): The client used to fetch the collection.
+            name (str): The name of the collection.
+            from_json (Callable[[Dict], Union[User, Post, Comment]]): The conversion of a record to a model.
+            records (Dict): The records of the collection in the snapshot, by ID.
+
+        Returns:
+            Dict: The number of added, updated and deleted records, or an error message
+        """
+        path = "/" + name
+        response = api_client.conditional_get(path, self._etags.get(path))
+        if response.status_code == 304:
+            return {"added": 0, "updated": 0, "deleted": 0}
+        if response.status_code != 200:
+            return {
+                "error": f"Failed to refresh {name}.",
+                "status_code": response.status_code,
+                "reason": response.reason,
+            }
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etags[path] = etag
+
+        added = updated = 0
+        seen = set()
+        for data in api_client.codec.loads(response.content):
+            record = from_json(data)
+            seen.add(record.id)
+            previous = records.get(record.id)
+            if previous == record:
+                continue
+            if previous is None:
+                added += 1
+            else:
+                updated += 1
+                self._unindex(previous)
+            records[record.id] = record
+            self._index(record)
+        deleted = [record_id for record_id in records if record_id not in seen]
+        for record_id in deleted:
+            self._unindex(records.pop(record_id))
+        return {"added": added, "updated": updated, "deleted": len(deleted)}
+
+    def _parent_index(self, record: Union[User, Post, Comment]) -> Optional[Set[int]]:
+        """Get the set of IDs in which a record is indexed under its parent, if it has one."""
+        if isinstance(record, Post) and record.userId is not None:
+            return self._posts_by_user.setdefault(record.userId, set())
+        if isinstance(record, Comment) and record.postId is not None:
+            return self._comments_by_post.setdefault(record.postId, set())
+        return None
+
+    def _index(self, record: Union[User, Post, Comment]) -> None:
+        """Add a record to the index of its parent."""
+        siblings = self._parent_index(record)
+        if siblings is not None and record.id is not None:
+            siblings.add(record.id)
+
+    def _unindex(self, record: Union[User, Post, Comment]) -> None:
+        """Remove a record from the index of its parent."""
+        siblings = self._parent_index(record)
+        if siblings is not None and record.id is not None:
+            siblings.discard(record.id)
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        """Get a user of the snapshot.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            Optional[User]: The user, or None if the user is not in the snapshot.
+        """
+        return self.users.get(user_id)
+
+    def get_post(self, post_id: int) -> Optional[Post]:
+        """Get a post of the snapshot.
+
+        Args:
+            post_id (int): The ID of the post.
+
+        Returns:
+            Optional[Post]: The post, or None if the post is not in the snapshot.
+        """
+        return self.posts.get(post_id)
+
+    def posts_of_user(self, user_id: int) -> List[Post]:
+        """Get the posts of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            List[Post]: The posts of the user, sorted by ID.
+        """
+        post_ids = sorted(self._posts_by_user.get(user_id, ()))
+        return [self.posts[post_id] for post_id in post_ids]
+
+    def comments_of_post(self, post_id: int) -> List[Comment]:
+        """Get the comments of a post.
+
+        Args:
+            post_id (int): The ID of the post.
+
+        Returns:
+            List[Comment]: The comments of the post, sorted by ID.
+        """
+        comment_ids = sorted(self._comments_by_post.get(post_id, ()))
+        return [self.comments[comment_id] for comment_id in comment_ids]
+
+    def comments_on_posts_of_user(self, user_id: int) -> List[Comment]:
+        """Get all the comments on the posts of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            List[Comment]: The comments, grouped by post and sorted by ID.
+        """
+        comments: List[Comment] = []
+        for post_id in sorted(self._posts_by_user.get(user_id, ())):
+            comments.extend(self.comments_of_post(post_id))
+        return comments
@@ -0,0 +1,216 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from app.api_client import DEFAULT_PAGE_SIZE, ApiClient, Reply
+
+SYNCED_COLLECTIONS = ("posts", "comments")
+
+
+def content_hash(record: Dict) -> str:
+    """Get a hash of the content of a record, whatever the order of its fields.
+
+    Args:
+        record (Dict): The record.
+
+    Returns:
+        str: The hexadecimal BLAKE2b digest of the canonical JSON of the record.
+    """
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
+class ChangeSet:
+    """The differences of a collection since the previous sync.
+
+    Args:
+        added (List[Dict]): The records that were not in the mirror.
+        updated (List[Dict]): The records whose content changed.
+        deleted (List[int]): The IDs of the records that are gone.
+        requests (int): The number of page requests sent.
+        not_modified (int): The number of pages the server answered with 304.
+    """
+
+    added: List[Dict] = field(default_factory=list)
+    updated: List[Dict] = field(default_factory=list)
+    deleted: List[int] = field(default_factory=list)
+    requests: int = 0
+    not_modified: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.deleted)
+
+    def to_json(self) -> Dict:
+        """Converts the change set to a JSON dictionary.
+
+        Returns:
+            Dict: A dictionary representation of the change set.
+        """
+        return {
+            "added": self.added,
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+        }
+
+
+class DeltaSync:
+    """
+    Keeps track of the versions of the records of `/posts` and `/comments`, to report what changed on the
+    server since the previous sync instead of downloading everything again.
+
+    Each collection is read page by page. The `ETag` of every page is kept, so on the next sync the known
+    pages are revalidated in parallel and the unchanged ones cost a 304 response. The records of the pages
+    that changed are compared with a map of content hashes by ID, so a record shifted to another page by a
+    deletion is not reported as updated. The state is plain JSON data, so a mirror can be kept between runs.
+
+    Args:
+        api_client (ApiClient): The client used to fetch the pages.
+        collections (Iterable[str]): The collections to sync (default is SYNCED_COLLECTIONS).
+        page_size (int): The number of records per page (default is DEFAULT_PAGE_SIZE).
+        state (Optional[Dict]): The `state` of a previous instance (default is None, an empty mirror).
+    """
+
+    def __init__(
+        self,
+        api_client: ApiClient,
+        collections: Iterable[str] = SYNCED_COLLECTIONS,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        state: Optional[Dict] = None,
+    ) -> None:
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+        self.api_client = api_client
+        self.collections = list(collections)
+        self.page_size = page_size
+        self._state: Dict[str, Dict[str, Any]] = {
+            name: {"versions": {}, "pages": []} for name in self.collections
+        }
+        for name, saved in (state or {}).items():
+            if saved.get("page_size") == page_size:
+                self._state[name] = {
+                    "versions": {int(k): v for k, v in saved["versions"].items()},
+                    "pages": saved["pages"],
+                }
+
+    @property
+    def state(self) -> Dict[str, Dict]:
+        """The version map and the pages of each collection, as JSON data."""
+        return {
+            name: {
+                "page_size": self.page_size,
+                "versions": {str(k): v for k, v in collection["versions"].items()},
+                "pages": collection["pages"],
+            }
+            for name, collection in self._state.items()
+        }
+
+    def sync(self) -> Dict[str, Union[ChangeSet, Dict]]:
+        """Sync every collection.
+
+        Returns:
+            Dict[str, Union[ChangeSet, Dict]]: The change set of each collection, or an error message if
+              it could not be fetched
+        """
+        return {name: self.sync_collection(name) for name in self.collections}
+
+    def _fetch(self, path: str, start: int, etag: Optional[str]) -> Reply:
+        """Request a page, conditionally if its `ETag` is known."""
+        params = {"_start": start, "_limit": self.page_size}
+        return self.api_client.conditional_get(path, etag, params)
+
+    def sync_collection(self, name: str) -> Union[ChangeSet, Dict]:
+        """Sync a collection and update its version map.
+
+        The mirror is only updated if every page could be fetched, so a failed sync can be retried.
+
+        Args:
+            name (str): The name of the collection, `posts` or `comments`.
+
+        Returns:
+            Union[ChangeSet, Dict]: The change set, or an error message if a page could not be fetched
+        """
+        path = "/" + name
+        collection = self._state[name]
+        known: List[Dict] = collection["pages"]
+        changes = ChangeSet()
+        pages: List[Dict] = []
+        versions: Dict[int, str] = {}
+
+        def apply(index: int, response: Reply) -> Optional[int]:
+            """Record a page and get its number of records, or None if the request failed."""
+            if response.status_code == 304:
+                changes.not_modified += 1
+                page = known[index]
+                for record_id in page["ids"]:
+                    versions[record_id] = collection["versions"][record_id]
+                pages.append(page)
+                return len(page["ids"])
+            if response.status_code != 200:
+                return None
+            records = self.api_client.codec.loads(response.content)
+            for record in records:
+                if record["id"] in versions:
+                    # Shifted from the previous page while the pages were being read.
+                    continue
+                digest = content_hash(record)
+                previous = collection["versions"].get(record["id"])
+                if previous is None:
+                    changes.added.append(record)
+                elif previous != digest:
+                    changes.updated.append(record)
+                versions[record["id"]] = digest
+            etag = response.headers.get("ETag")
+            pages.append({"etag": etag, "ids": [record["id"] for record in records]})
+            return len(records)
+
+        def failed(start: int, response: Reply) -> Dict:
+            return {
+                "error": f"Failed to sync {name} from {start}.",
+                "status_code": response.status_code,
+                "reason": response.reason,
+            }
+
+        # Revalidate the known pages in parallel, then read the next ones until a page is not full.
+        size = self.page_size
+        count: Optional[int] = size
+        if known:
+            workers = min(self.api_client.pool_maxsize, len(known))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                responses = list(
+                    executor.map(
+                        lambda index: self._fetch(
+                            path, index * size, known[index]["etag"]
+                        ),
+                        range(len(known)),
+                    )
+                )
+            changes.requests += len(responses)
+            for index, response in enumerate(responses):
+                count = apply(index, response)
+                if count is None:
+                    return failed(index * size, response)
+                if count < size:
+                    break
+        while count == size:
+            start = len(pages) * size
+            response = self._fetch(path, start, None)
+            changes.requests += 1
+            count = apply(len(pages), response)
+            if count is None:
+                return failed(start, response)
+            if count == 0:
+                pages.pop()
+
+        changes.deleted = [
+            record_id
+            for record_id in collection["versions"]
+            if record_id not in versions
+        ]
+        collection["versions"] = versions
+        collection["pages"] = pages
+        return changes
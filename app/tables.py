@@ -0,0 +1,246 @@
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from app.data import Comment, Post
+
+# Integer columns store the missing values (for example the ID of a post not created yet) as -1.
+MISSING = -1
+
+
+class StringColumn:
+    """
+    Column of strings packed in a single UTF-8 buffer, with the end offset of every string kept in an
+    integer array and the missing values marked in a bitmap, one bit per row, so that None and the empty
+    string stay apart. It holds no per-string Python object until a value is read.
+    """
+
+    def __init__(self) -> None:
+        self._data = bytearray()
+        self._ends = array("Q")
+        self._nulls = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if index < 0:
+            index += len(self._ends)
+        end = self._ends[index]
+        if self._nulls[index >> 3] & (1 << (index & 7)):
+            return None
+        start = self._ends[index - 1] if index else 0
+        return self._data[start:end].decode()
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        return (self[index] for index in range(len(self._ends)))
+
+    def append(self, value: Optional[str]) -> None:
+        """Append a string, or a missing value, to the column.
+
+        Args:
+            value (Optional[str]): The string to append, None if it is missing.
+        """
+        index = len(self._ends)
+        if index & 7 == 0:
+            self._nulls.append(0)
+        if value is None:
+            self._nulls[index >> 3] |= 1 << (index & 7)
+        else:
+            self._data += value.encode()
+        self._ends.append(len(self._data))
+
+    @property
+    def nbytes(self) -> int:
+        """The size in bytes of the packed strings, their offsets and the bitmap of the missing values."""
+        return (
+            len(self._data) + self._ends.itemsize * len(self._ends) + len(self._nulls)
+        )
+
+
+class _Table:
+    """
+    Columnar container for the records of a collection. The integer fields are stored in `array` columns and
+    the text fields in packed `StringColumn` columns, so loading a whole collection costs a few buffers
+    instead of one dictionary per record. Rows are converted to models only when they are accessed.
+    """
+
+    model: type
+    int_fields: Tuple[str, ...] = ()
+    str_fields: Tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        self.int_columns: Dict[str, "array[int]"] = {
+            name: array("q") for name in self.int_fields
+        }
+        self.str_columns: Dict[str, StringColumn] = {
+            name: StringColumn() for name in self.str_fields
+        }
+
+    def __len__(self) -> int:
+        return len(self.int_columns[self.int_fields[0]])
+
+    def __getitem__(self, index: int):
+        fields: Dict[str, object] = {
+            name: column[index] for name, column in self.str_columns.items()
+        }
+        for name, int_column in self.int_columns.items():
+            value = int_column[index]
+            fields[name] = None if value == MISSING else value
+        return self.model(**fields)
+
+    def column(self, field: str) -> Union["array[int]", StringColumn]:
+        """Get the column of a field.
+
+        Args:
+            field (str): The name of the field.
+
+        Returns:
+            Union[array[int], StringColumn]: The integer or string column of the field.
+        """
+        if field in self.int_columns:
+            return self.int_columns[field]
+        return self.str_columns[field]
+
+    def __iter__(self) -> Iterator:
+        return (self[index] for index in range(len(self)))
+
+    def rows(self, indices: Iterable[int]) -> List:
+        """Convert the rows at the given indices to models.
+
+        Args:
+            indices (Iterable[int]): The indices of the rows, for example a group from `group_by`.
+
+        Returns:
+            List: The models of the rows.
+        """
+        return [self[index] for index in indices]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]):
+        """Create a table from the records returned by the API, for example by `ApiClient.iter_posts`.
+
+        Args:
+            records (Iterable[Dict]): The records of the collection.
+
+        Returns:
+            The table filled with the records.
+        """
+        table = cls()
+        table.extend(records)
+        return table
+
+    def append(self, record: Dict) -> None:
+        """Append a record returned by the API.
+
+        Args:
+            record (Dict): The data of the record.
+
+        Raises:
+            ValueError: If the record is an error message instead of data.
+        """
+        if "error" in record:
+            raise ValueError(record["error"])
+        for name, int_column in self.int_columns.items():
+            value = record.get(name)
+            int_column.append(MISSING if value is None else int(value))
+        for name, str_column in self.str_columns.items():
+            str_column.append(record.get(name))
+
+    def extend(self, records: Iterable[Dict]) -> None:
+        """Append several records returned by the API.
+
+        Args:
+            records (Iterable[Dict]): The data of the records.
+        """
+        for record in records:
+            self.append(record)
+
+    def take(self, indices: Iterable[int]):
+        """Create a new table with the rows at the given indices, copying the columns directly.
+
+        Args:
+            indices (Iterable[int]): The indices of the rows to keep, in the order to keep them.
+
+        Returns:
+            The table with the selected rows.
+        """
+        indices = list(indices)
+        table = type(self)()
+        for name, int_column in self.int_columns.items():
+            table.int_columns[name] = array("q", (int_column[i] for i in indices))
+        for name, str_column in self.str_columns.items():
+            target = table.str_columns[name]
+            for index in indices:
+                target.append(str_column[index])
+        return table
+
+    def where(self, field: str, predicate: Callable[[object], bool]) -> "array[int]":
+        """Find the rows whose field matches a predicate, reading only that column.
+
+        Args:
+            field (str): The name of the column to test.
+            predicate (Callable[[object], bool]): The test applied to every value of the column.
+
+        Returns:
+            array[int]: The indices of the matching rows.
+        """
+        column = self.column(field)
+        return array(
+            "q", (index for index, value in enumerate(column) if predicate(value))
+        )
+
+    def filter(self, **values: int):
+        """Create a new table with the rows whose integer fields are equal to the given values.
+
+        Args:
+            **values (int): The expected value per integer field, for example `userId=1`.
+
+        Returns:
+            The table with the matching rows.
+        """
+        indices: Iterable[int] = range(len(self))
+        for field, expected in values.items():
+            column = self.int_columns[field]
+            indices = [index for index in indices if column[index] == expected]
+        return self.take(indices)
+
+    def group_by(self, field: str) -> Dict[int, "array[int]"]:
+        """Group the row indices by the value of an integer field.
+
+        Args:
+            field (str): The name of the integer column, for example `userId`.
+
+        Returns:
+            Dict[int, array[int]]: The indices of the rows for each value of the field.
+        """
+        groups: Dict[int, "array[int]"] = {}
+        for index, value in enumerate(self.int_columns[field]):
+            group = groups.get(value)
+            if group is None:
+                group = groups[value] = array("q")
+            group.append(index)
+        return groups
+
+    @property
+    def nbytes(self) -> int:
+        """The size in bytes of the buffers of all the columns."""
+        total = sum(column.nbytes for column in self.str_columns.values())
+        for int_column in self.int_columns.values():
+            total += int_column.itemsize * len(int_column)
+        return total
+
+
+class PostTable(_Table):
+    """Columnar container for posts, grouped by `userId`. Its rows are `Post` instances."""
+
+    model = Post
+    int_fields = ("id", "userId")
+    str_fields = ("title", "body")
+
+
+class CommentTable(_Table):
+    """Columnar container for comments, grouped by `postId`. Its rows are `Comment` instances."""
+
+    model = Comment
+    int_fields = ("id", "postId")
+    str_fields = ("name", "email", "body")
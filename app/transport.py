@@ -0,0 +1,223 @@
+import base64
+import gzip
+import io
+import json
+import random
+import threading
+import time
+from typing import IO, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from app.instrumentation import TimedHTTPAdapter
+
+# The response headers kept in a cassette, the others are dropped to keep it small.
+RECORDED_HEADERS = ("Content-Type", "ETag", "Cache-Control", "Retry-After")
+
+
+def _target(url: str) -> str:
+    """Get the path and query string of a URL, so that a cassette can be replayed on any base URL."""
+    parts = urlsplit(url)
+    return parts.path + ("?" + parts.query if parts.query else "")
+
+
+class Cassette:
+    """
+    Recorded HTTP exchanges, saved as one compact JSON object per line, gzipped if the file name ends with
+    `.gz`. An exchange is identified by its method and its path with the query string; the bodies are
+    kept as text when they are valid UTF-8 and in base64 otherwise.
+
+    Args:
+        exchanges (Optional[List[Dict]]): The exchanges already recorded (default is None).
+    """
+
+    def __init__(self, exchanges: Optional[List[Dict]] = None) -> None:
+        self.exchanges: List[Dict] = list(exchanges or [])
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.exchanges)
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        reason: Optional[str],
+        headers: Mapping[str, str],
+        content: bytes,
+        elapsed: float,
+    ) -> None:
+        """Record an exchange.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL of the request.
+            status_code (int): The status code of the response.
+            reason (Optional[str]): The reason phrase of the response.
+            headers (Mapping[str, str]): The headers of the response, only `RECORDED_HEADERS` are kept,
+                whatever the case of their names.
+            content (bytes): The body of the response.
+            elapsed (float): The latency of the exchange in seconds.
+        """
+        found = CaseInsensitiveDict(headers)
+        exchange = {
+            "m": method,
+            "u": _target(url),
+            "s": status_code,
+            "r": reason,
+            "h": {name: found[name] for name in RECORDED_HEADERS if name in found},
+            "t": round(elapsed, 6),
+        }
+        try:
+            exchange["b"] = content.decode()
+        except UnicodeDecodeError:
+            exchange["b64"] = base64.b64encode(content).decode()
+        with self._lock:
+            self.exchanges.append(exchange)
+
+    @staticmethod
+    def _open(path: str, mode: str) -> IO[str]:
+        if path.endswith(".gz"):
+            return io.TextIOWrapper(gzip.GzipFile(path, mode), encoding="utf-8")
+        return open(path, mode, encoding="utf-8")
+
+    def save(self, path: str) -> None:
+        """Write the exchanges to a file.
+
+        Args:
+            path (str): The path of the cassette, gzipped if it ends with `.gz`.
+        """
+        with self._lock, self._open(path, "w") as output:
+            for exchange in self.exchanges:
+                output.write(json.dumps(exchange, separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """Read the exchanges of a file written by `save`.
+
+        Args:
+            path (str): The path of the cassette, gzipped if it ends with `.gz`.
+
+        Returns:
+            Cassette: The recorded exchanges.
+        """
+        with cls._open(path, "r") as lines:
+            return cls([json.loads(line) for line in lines if line.strip()])
+
+
+class RecordingTransport(TimedHTTPAdapter):
+    """
+    Transport sending the requests over the network like the default one, and recording every exchange in
+    a cassette. The responses are read in full before being returned, streamed ones included.
+
+    Args:
+        cassette (Cassette): The cassette receiving the exchanges.
+        **kwargs: The pool options of `requests.adapters.HTTPAdapter`, such as `pool_maxsize`.
+    """
+
+    def __init__(self, cassette: Cassette, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, *args, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        response = super().send(request, *args, **kwargs)
+        content = response.content
+        self.cassette.add(
+            request.method,
+            request.url,
+            response.status_code,
+            response.reason,
+            response.headers,
+            content,
+            time.perf_counter() - start,
+        )
+        return response
+
+
+class ReplayTransport(BaseAdapter):
+    """
+    Transport answering the requests from a cassette, without any network access.
+
+    The exchanges of a method and path are replayed in the order they were recorded, starting over once
+    all were used, so a short recording can feed a long load test. A request that was never recorded fails
+    with a `requests.ConnectionError`. Every response is delayed by `latency` plus a random jitter of up to
+    `jitter` seconds, or by the recorded latency if `recorded_latency` is set.
+
+    Args:
+        cassette (Cassette): The recorded exchanges.
+        latency (float): The delay in seconds added to every response (default is 0).
+        jitter (float): The maximum random delay in seconds added on top of the latency (default is 0).
+        recorded_latency (bool): Whether to use the recorded latency of each exchange instead of
+            `latency` (default is False).
+        seed (Optional[int]): The seed of the jitter, for repeatable runs (default is None).
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        recorded_latency: bool = False,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self.latency = latency
+        self.jitter = jitter
+        self.recorded_latency = recorded_latency
+        self.replayed = 0
+        self._random = random.Random(seed)
+        self._exchanges: Dict[Tuple[str, str], List[Dict]] = {}
+        self._positions: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        for exchange in cassette.exchanges:
+            self._exchanges.setdefault((exchange["m"], exchange["u"]), []).append(
+                exchange
+            )
+
+    def _next(self, method: str, target: str) -> Tuple[Optional[Dict], float]:
+        """Pick the next exchange of a method and path and the delay of its response."""
+        key = (method, target)
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                return None, 0.0
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            self.replayed += 1
+            exchange = exchanges[position % len(exchanges)]
+            base = exchange.get("t", 0.0) if self.recorded_latency else self.latency
+            delay = base + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        return exchange, delay
+
+    def send(self, request, *args, **kwargs) -> requests.Response:
+        exchange, delay = self._next(request.method, _target(request.url))
+        if exchange is None:
+            raise requests.ConnectionError(
+                f"No recorded exchange for {request.method} {request.url}",
+                request=request,
+            )
+        if delay > 0:
+            time.sleep(delay)
+        if "b64" in exchange:
+            content = base64.b64decode(exchange["b64"])
+        else:
+            content = exchange["b"].encode()
+        response = requests.Response()
+        response.status_code = exchange["s"]
+        response.reason = exchange["r"]
+        response.headers = CaseInsensitiveDict(exchange["h"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response._content = content
+        response._content_consumed = True  # type: ignore[attr-defined]
+        return response
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,132 @@
+"""Compare the memory and conversion cost of the `app.data` models against plain dictionaries.
+
+Run from the root of the repository:
+
+    python -m benchmarks.bench_models
+"""
+
+import timeit
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from app.data import Post, User
+
+COUNT = 20_000
+
+POST: Dict[str, Any] = {
+    "userId": 1,
+    "id": 1,
+    "title": "sunt aut facere repellat",
+    "body": "quia et suscipit",
+}
+USER: Dict[str, Any] = {
+    "id": 1,
+    "name": "Leanne Graham",
+    "username": "Bret",
+    "email": "Sincere@april.biz",
+    "address": {"street": "Kulas Light", "city": "Gwenborough"},
+    "phone": "1-770-736-8031 x56442",
+    "website": "hildegard.org",
+    "company": {"name": "Romaguera-Crona"},
+}
+
+
+@dataclass
+class LegacyPost:
+    """The previous, non slotted version of `Post`, converted with `dataclasses.asdict`."""
+
+    title: str
+    body: str
+    id: Optional[int] = None
+    userId: Optional[int] = None
+
+
+@dataclass
+class LegacyUser:
+    """The previous, non slotted version of `User`, converted with `dataclasses.asdict`."""
+
+    name: str
+    username: str
+    email: str
+    adress: Optional[Dict] = None
+    phone: Optional[str] = None
+    website: Optional[str] = None
+    company: Optional[Dict] = None
+    id: Optional[int] = None
+
+
+def legacy_user_from_json(data: Dict) -> LegacyUser:
+    """Build a `LegacyUser` the way callers had to, renaming the `address` key."""
+    fields = dict(data)
+    fields["adress"] = fields.pop("address", None)
+    return LegacyUser(**fields)
+
+
+def bytes_per_object(factory: Callable[[], object]) -> float:
+    """Measure the memory allocated per object by `factory`, excluding the shared nested values."""
+    tracemalloc.start()
+    objects: List[object] = [factory() for _ in range(COUNT)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / COUNT
+
+
+def microseconds(function: Callable[[], object]) -> float:
+    """Measure the time of one call of `function` in microseconds."""
+    timer = timeit.Timer(function)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(3, loops)) / loops * 1e6
+
+
+def main() -> None:
+    legacy_post = LegacyPost(POST["title"], POST["body"], POST["id"], POST["userId"])
+    legacy_user = legacy_user_from_json(USER)
+    post, user = Post.from_json(POST), User.from_json(USER)
+    rows = [
+        (
+            "post dict",
+            bytes_per_object(lambda: dict(POST)),
+            microseconds(lambda: dict(POST)),
+            None,
+        ),
+        (
+            "post dataclass + asdict",
+            bytes_per_object(lambda: LegacyPost(**POST)),
+            microseconds(lambda: LegacyPost(**POST)),
+            microseconds(lambda: asdict(legacy_post)),
+        ),
+        (
+            "post slotted model",
+            bytes_per_object(lambda: Post.from_json(POST)),
+            microseconds(lambda: Post.from_json(POST)),
+            microseconds(post.to_json),
+        ),
+        (
+            "user dict",
+            bytes_per_object(lambda: dict(USER)),
+            microseconds(lambda: dict(USER)),
+            None,
+        ),
+        (
+            "user dataclass + asdict",
+            bytes_per_object(lambda: legacy_user_from_json(USER)),
+            microseconds(lambda: legacy_user_from_json(USER)),
+            microseconds(lambda: asdict(legacy_user)),
+        ),
+        (
+            "user slotted model",
+            bytes_per_object(lambda: User.from_json(USER)),
+            microseconds(lambda: User.from_json(USER)),
+            microseconds(user.to_json),
+        ),
+    ]
+    print(f"{'':26}{'bytes/object':>14}{'build (us)':>12}{'to_json (us)':>14}")
+    for name, size, build, dump in rows:
+        dump_text = "-" if dump is None else f"{dump:.3f}"
+        print(f"{name:26}{size:14.0f}{build:12.3f}{dump_text:>14}")
+
+
+if __name__ == "__main__":
+    main()
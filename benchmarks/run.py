@@ -0,0 +1,337 @@
+"""Benchmark every `ApiClient` method against the local JSONPlaceholder stand-in.
+
+For each single-call and bulk case, and for the JSON encoding and decoding with each installed codec, it
+records the throughput, the p50/p95/p99 latencies and the peak memory of one call, and saves the results
+as JSON so that runs can be compared for regressions:
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json --compare before.json
+
+With `--record` the exchanges with the stand-in are saved to a cassette, which `--replay` serves back from
+memory without any server, with `--latency` and `--jitter` applied by the client, for offline load tests.
+A replayed run must not call more paths than the recorded one, so it takes at most the same `--calls`.
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from app.api_client import ApiClient
+from app.codec import Codec, get_codec, orjson
+from app.data import UserProfile
+from app.transport import Cassette, RecordingTransport, ReplayTransport
+from benchmarks.server import StandInServer, make_dataset
+
+# A case runs one call of a method: it gets the client and the index of the call, and returns the number
+# of records processed by the call.
+Case = Callable[[ApiClient, int], int]
+
+POST = {"title": "title", "body": "body", "userId": 1}
+USER = {"name": "name", "username": "username", "email": "email@example.com"}
+COMMENT = {"name": "name", "email": "email@example.com", "body": "body", "postId": 1}
+
+
+def single_cases(dataset: Dict[str, List[Dict]]) -> Dict[str, Case]:
+    """The cases calling each method of the client once per call."""
+    users, posts, comments = (
+        len(dataset[name]) for name in ("users", "posts", "comments")
+    )
+    return {
+        "get_posts": lambda client, i: _one(client.get_posts(str(i % posts + 1))),
+        "get_comments": lambda client, i: _one(
+            client.get_comments(str(i % comments + 1))
+        ),
+        "get_user": lambda client, i: _one(client.get_user(str(i % users + 1))),
+        "get_all_users": lambda client, i: len(client.get_all_users()),
+        "create_post": lambda client, i: _one(client.create_post(POST)),
+        "update_post": lambda client, i: _one(
+            client.update_post(str(i % posts + 1), POST)
+        ),
+        "delete_post": lambda client, i: _one(client.delete_post(str(i % posts + 1))),
+        "create_user": lambda client, i: _one(client.create_user(USER)),
+        "create_comment": lambda client, i: _one(client.create_comment(COMMENT)),
+        "get_user_with_posts_and_comments": lambda client, i: _profile(
+            client.get_user_with_posts_and_comments(str(i % users + 1))
+        ),
+    }
+
+
+def bulk_cases(dataset: Dict[str, List[Dict]]) -> Dict[str, Case]:
+    """The cases processing a whole collection per call."""
+    post_ids = [str(post["id"]) for post in dataset["posts"]]
+    user_ids = [str(user["id"]) for user in dataset["users"]]
+    comment_ids = [str(comment["id"]) for comment in dataset["comments"]]
+    return {
+        "get_posts_many": lambda client, i: len(client.get_posts_many(post_ids)),
+        "get_users_many": lambda client, i: len(client.get_users_many(user_ids)),
+        "get_comments_many": lambda client, i: len(
+            client.get_comments_many(comment_ids)
+        ),
+        "iter_posts": lambda client, i: sum(1 for _ in client.iter_posts()),
+        "iter_comments": lambda client, i: sum(1 for _ in client.iter_comments()),
+        "iter_users": lambda client, i: sum(1 for _ in client.iter_users()),
+        "stream_posts": lambda client, i: sum(1 for _ in client.stream_posts()),
+        "stream_comments": lambda client, i: sum(1 for _ in client.stream_comments()),
+        "stream_users": lambda client, i: sum(1 for _ in client.stream_users()),
+        "create_posts_bulk": lambda client, i: client.create_posts_bulk(
+            [dict(POST, title=f"title {n}") for n in range(len(post_ids))]
+        )["summary"]["succeeded"],
+        "create_comments_bulk": lambda client, i: client.create_comments_bulk(
+            [dict(COMMENT, body=f"body {n}") for n in range(len(comment_ids))]
+        )["summary"]["succeeded"],
+    }
+
+
+def codec_cases(dataset: Dict[str, List[Dict]]) -> Dict[str, Case]:
+    """The cases encoding and decoding the whole comments collection with each installed JSON codec."""
+    comments = dataset["comments"]
+    payload = get_codec("json").dumps(comments)
+    cases: Dict[str, Case] = {}
+    for name in ["json"] + ([] if orjson is None else ["orjson"]):
+        codec = get_codec(name)
+        cases[f"encode[{name}]"] = _encode_case(codec, comments)
+        cases[f"decode[{name}]"] = _decode_case(codec, payload)
+    return cases
+
+
+def _encode_case(codec: Codec, records: List[Dict]) -> Case:
+    def case(client: ApiClient, i: int) -> int:
+        codec.dumps(records)
+        return len(records)
+
+    return case
+
+
+def _decode_case(codec: Codec, payload: bytes) -> Case:
+    return lambda client, i: len(codec.loads(payload))
+
+
+def _profile(profile: Union[Dict, UserProfile]) -> int:
+    """Check that a profile was assembled and count its user, posts and comments."""
+    if not isinstance(profile, UserProfile):
+        raise RuntimeError(profile)
+    comments = sum(len(post_comments) for post_comments in profile.comments.values())
+    return 1 + len(profile.posts) + comments
+
+
+def _one(response: Dict) -> int:
+    """Check that a single call succeeded and count it as one record."""
+    if "error" in response:
+        raise RuntimeError(response)
+    return 1
+
+
+def percentile(ordered: List[float], percent: float) -> float:
+    """Get a percentile of sorted values with the nearest-rank method."""
+    index = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(case: Case, client: ApiClient, calls: int) -> Dict[str, float]:
+    """Run a case `calls` times and measure it, then run it once more to measure its peak memory.
+
+    Args:
+        case (Case): The case to run.
+        client (ApiClient): The client connected to the stand-in server.
+        calls (int): The number of calls to time.
+
+    Returns:
+        Dict[str, float]: The metrics of the case.
+    """
+    latencies: List[float] = []
+    records = 0
+    start = time.perf_counter()
+    for i in range(calls):
+        call_start = time.perf_counter()
+        records += case(client, i)
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    case(client, calls)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "calls": calls,
+        "seconds": elapsed,
+        "calls_per_second": calls / elapsed,
+        "records_per_second": records / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+def run(
+    calls: int = 200,
+    bulk_calls: int = 5,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    body_size: int = 200,
+    only: Optional[List[str]] = None,
+    codec: Optional[str] = None,
+    record: Optional[str] = None,
+    replay: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run the benchmark suite against a fresh stand-in server.
+
+    Args:
+        calls (int): The number of calls of each single-call case (default is 200).
+        bulk_calls (int): The number of calls of each bulk case (default is 5).
+        latency (float): The latency in seconds added by the server (default is 0).
+        jitter (float): The random latency in seconds added on top of `latency` (default is 0).
+        body_size (int): The length of the body of the posts and comments (default is 200).
+        only (Optional[List[str]]): The names of the cases to run (default is None, all cases).
+        codec (Optional[str]): The name of the JSON codec of the client (default is None, the fastest one
+            installed).
+        record (Optional[str]): The path of a cassette receiving the exchanges with the server
+            (default is None).
+        replay (Optional[str]): The path of a cassette answering the requests instead of the server, with
+            the latency and jitter added by the client (default is None).
+
+    Returns:
+        Dict[str, Any]: The parameters of the run and the metrics of each case.
+    """
+    dataset = make_dataset(body_size=body_size)
+    plan: List[Tuple[str, Case, int]] = [
+        (name, case, calls) for name, case in single_cases(dataset).items()
+    ]
+    plan += [(name, case, bulk_calls) for name, case in bulk_cases(dataset).items()]
+    plan += [(name, case, calls) for name, case in codec_cases(dataset).items()]
+    results: Dict[str, Dict[str, float]] = {}
+    client_codec = get_codec(codec)
+    cassette = Cassette()
+    with contextlib.ExitStack() as stack:
+        if replay:
+            client = ApiClient(
+                "http://replay.invalid",
+                codec=client_codec,
+                transport=ReplayTransport(Cassette.load(replay), latency, jitter),
+            )
+        else:
+            server = stack.enter_context(
+                StandInServer(dataset, latency=latency, jitter=jitter)
+            )
+            transport = RecordingTransport(cassette) if record else None
+            client = ApiClient(server.url, codec=client_codec, transport=transport)
+        with client:
+            for name, case, count in plan:
+                if only and name not in only:
+                    continue
+                results[name] = measure(case, client, count)
+    if record:
+        cassette.save(record)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "calls": calls,
+            "bulk_calls": bulk_calls,
+            "latency": latency,
+            "jitter": jitter,
+            "body_size": body_size,
+            "codec": client_codec.name,
+            "replay": replay,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """List the cases whose throughput dropped by more than `threshold` compared with a baseline run.
+
+    Args:
+        current (Dict[str, Any]): The results of this run.
+        baseline (Dict[str, Any]): The results of the baseline run.
+        threshold (float): The tolerated relative drop, for example 0.1 for 10%.
+
+    Returns:
+        List[str]: A description of each regression.
+    """
+    regressions = []
+    for name, metrics in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = metrics["calls_per_second"] / before["calls_per_second"] - 1
+        if change < -threshold:
+            regressions.append(f"{name}: throughput {change:+.1%}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--calls", type=int, default=200, help="calls per single-call case"
+    )
+    parser.add_argument("--bulk-calls", type=int, default=5, help="calls per bulk case")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="server latency in seconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="server jitter in seconds"
+    )
+    parser.add_argument(
+        "--body-size", type=int, default=200, help="length of the bodies"
+    )
+    parser.add_argument("--only", nargs="*", help="names of the cases to run")
+    parser.add_argument(
+        "--codec", choices=["json", "orjson"], help="JSON codec of the client"
+    )
+    parser.add_argument("--record", help="cassette receiving the exchanges")
+    parser.add_argument("--replay", help="cassette replayed instead of the server")
+    parser.add_argument(
+        "--output", default="bench_results.json", help="JSON results file"
+    )
+    parser.add_argument("--compare", help="JSON results of a baseline run")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="tolerated throughput drop"
+    )
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.calls,
+        args.bulk_calls,
+        args.latency,
+        args.jitter,
+        args.body_size,
+        args.only,
+        args.codec,
+        args.record,
+        args.replay,
+    )
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+
+    width = max([len(name) + 2 for name in report["results"]] + [20])
+    print(
+        f"{'case':{width}}{'calls/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak KiB':>10}"
+    )
+    for name, metrics in report["results"].items():
+        print(
+            f"{name:{width}}{metrics['calls_per_second']:10.1f}{metrics['p50_ms']:9.2f}"
+            f"{metrics['p95_ms']:9.2f}{metrics['p99_ms']:9.2f}{metrics['peak_memory_kib']:10.1f}"
+        )
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""In-process stand-in for the JSONPlaceholder API, used to benchmark the client over real HTTP.
+
+It serves generated `/users`, `/posts` and `/comments` collections with the same routes, filters and
+`_start`/`_limit` pagination as JSONPlaceholder, over keep-alive HTTP/1.1, with a configurable latency and
+payload size. The GET responses carry an `ETag` and honor `If-None-Match`.
+"""
+
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+
+def make_dataset(
+    users: int = 10,
+    posts_per_user: int = 10,
+    comments_per_post: int = 5,
+    body_size: int = 200,
+) -> Dict[str, List[Dict]]:
+    """Generate users, posts and comments shaped like the JSONPlaceholder data.
+
+    Args:
+        users (int): The number of users (default is 10).
+        posts_per_user (int): The number of posts of each user (default is 10).
+        comments_per_post (int): The number of comments of each post (default is 5).
+        body_size (int): The length of the body of each post and comment (default is 200).
+
+    Returns:
+        Dict[str, List[Dict]]: The records of each collection.
+    """
+    text = ("lorem ipsum dolor sit amet " * (body_size // 27 + 1))[:body_size]
+    dataset: Dict[str, List[Dict]] = {"users": [], "posts": [], "comments": []}
+    for user_id in range(1, users + 1):
+        dataset["users"].append(
+            {
+                "id": user_id,
+                "name": f"User {user_id}",
+                "username": f"user{user_id}",
+                "email": f"user{user_id}@example.com",
+                "address": {
+                    "street": "Kulas Light",
+                    "suite": "Apt. 556",
+                    "city": "Gwenborough",
+                    "zipcode": "92998-3874",
+                    "geo": {"lat": "-37.3159", "lng": "81.1496"},
+                },
+                "phone": "1-770-736-8031 x56442",
+                "website": "hildegard.org",
+                "company": {"name": "Romaguera-Crona", "catchPhrase": "", "bs": ""},
+            }
+        )
+    for post_id in range(1, users * posts_per_user + 1):
+        dataset["posts"].append(
+            {
+                "userId": (post_id - 1) // posts_per_user + 1,
+                "id": post_id,
+                "title": f"post {post_id}",
+                "body": text,
+            }
+        )
+    for comment_id in range(1, len(dataset["posts"]) * comments_per_post + 1):
+        dataset["comments"].append(
+            {
+                "postId": (comment_id - 1) // comments_per_post + 1,
+                "id": comment_id,
+                "name": f"comment {comment_id}",
+                "email": f"commenter{comment_id}@example.com",
+                "body": text,
+            }
+        )
+    return dataset
+
+
+# The nested routes: /users/{id}/posts lists the posts with that userId.
+_NESTED = {("users", "posts"): "userId", ("posts", "comments"): "postId"}
+_PATH = re.compile(r"^/(users|posts|comments)(?:/(\d+))?(?:/(posts|comments))?/?$")
+
+
+class StandInServer:
+    """
+    JSONPlaceholder stand-in running in a background thread. Use it as a context manager, or call `start`
+    and `stop`.
+
+    Args:
+        dataset (Optional[Dict[str, List[Dict]]]): The records to serve (default is `make_dataset()`).
+        latency (float): The delay in seconds added to every response (default is 0).
+        jitter (float): The maximum random delay in seconds added on top of `latency` (default is 0).
+    """
+
+    def __init__(
+        self,
+        dataset: Optional[Dict[str, List[Dict]]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+    ) -> None:
+        self.dataset = make_dataset() if dataset is None else dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._next_ids = {
+            name: len(records) + 1 for name, records in self.dataset.items()
+        }
+        self._index = {
+            name: {record["id"]: record for record in records}
+            for name, records in self.dataset.items()
+        }
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "StandInServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def handle(self, method: str, target: str, body: Optional[Dict]) -> Tuple[int, Any]:
+        """Route a request to the dataset.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The path and query string of the request.
+            body (Optional[Dict]): The decoded body of the request.
+
+        Returns:
+            Tuple[int, Any]: The status code and the JSON data of the response.
+        """
+        with self._lock:
+            self.requests += 1
+        parts = urlsplit(target)
+        match = _PATH.match(parts.path)
+        if match is None:
+            return 404, {}
+        name, record_id, nested = match.groups()
+        records = self._index[name]
+
+        if nested is not None:
+            if (name, nested) not in _NESTED or record_id is None or method != "GET":
+                return 404, {}
+            key = _NESTED[(name, nested)]
+            parent = int(record_id)
+            return 200, [r for r in self.dataset[nested] if r.get(key) == parent]
+
+        if record_id is not None:
+            record = records.get(int(record_id))
+            if method == "GET":
+                return (200, record) if record is not None else (404, {})
+            if method == "PUT":
+                return 200, dict(body or {}, id=int(record_id))
+            if method == "DELETE":
+                return 200, {}
+            return 404, {}
+
+        if method == "POST":
+            with self._lock:
+                new_id = self._next_ids[name]
+                self._next_ids[name] += 1
+            return 201, dict(body or {}, id=new_id)
+        if method != "GET":
+            return 404, {}
+
+        query = dict(parse_qsl(parts.query))
+        start = int(query.pop("_start", 0))
+        limit = query.pop("_limit", None)
+        selected = self.dataset[name]
+        for field, value in query.items():
+            selected = [r for r in selected if str(r.get(field)) == value]
+        end = None if limit is None else start + int(limit)
+        return 200, selected[start:end]
+
+    def _make_handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                # The headers and the body are written separately, do not let Nagle hold the body back.
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def _respond(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body: Optional[Dict] = None
+                if raw:
+                    if self.headers.get("Content-Type", "").startswith(
+                        "application/json"
+                    ):
+                        body = json.loads(raw)
+                    else:
+                        body = dict(parse_qsl(raw.decode()))
+                delay = server.latency + random.uniform(0, server.jitter)
+                if delay:
+                    time.sleep(delay)
+                status, data = server.handle(self.command, self.path, body)
+                payload = json.dumps(data).encode()
+                etag = 'W/"' + hashlib.md5(payload).hexdigest() + '"'
+                if self.command == "GET" and status == 200:
+                    if self.headers.get("If-None-Match") == etag:
+                        status, payload = 304, b""
+                self.send_response(status)
+                if status != 304:
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                if self.command == "GET" and status in (200, 304):
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    with StandInServer() as stand_in:
+        print(
+            f"Serving the JSONPlaceholder stand-in on {stand_in.url}, press Ctrl+C to stop."
+        )
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,241 @@
+"""Benchmark the startup time: importing the `app` package and reaching the first prompt of `main.py`.
+
+Every case runs in a fresh interpreter. The import cases use `python -X importtime` and report the total
+import time and the slowest modules, the `main.py` case measures the wall time until the menu asks for a
+choice. The results are saved as JSON so that runs can be compared for regressions:
+
+    python -m benchmarks.startup --output startup_before.json
+    python -m benchmarks.startup --output startup_after.json --compare startup_before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The statements whose import time is measured.
+IMPORT_CASES = {
+    "import app": "import app",
+    "from app import User": "from app import User",
+    "from app import ApiClient": "from app import ApiClient",
+    "from app import AsyncApiClient": "from app import AsyncApiClient",
+}
+
+PROMPT = b"Enter your choice: "
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, float, bool]]:
+    """Parse the report of `python -X importtime`.
+
+    Args:
+        stderr (str): The standard error of the interpreter.
+
+    Returns:
+        List[Tuple[str, float, bool]]: The name of each imported module, its cumulative import time in
+          milliseconds, and whether it was imported at the top level rather than by another module.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        modules.append((name.strip(), int(cumulative) / 1000, not name[1:2].isspace()))
+    return modules
+
+
+def _importtime(statement: str) -> Tuple[List[Tuple[str, float, bool]], float]:
+    """Run a statement in a fresh interpreter with `-X importtime` and time it."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr), (time.perf_counter() - start) * 1000
+
+
+def measure_import(statement: str, runs: int) -> Dict[str, Any]:
+    """Measure the import time of a statement in fresh interpreters.
+
+    The modules already imported by the interpreter startup, such as `site`, are left out, so the time is
+    that of the statement alone.
+
+    Args:
+        statement (str): The Python statement to run, for example `import app`.
+        runs (int): The number of interpreters to start.
+
+    Returns:
+        Dict[str, Any]: The median and best import times in milliseconds, the median wall time of the
+          interpreter, and the five slowest modules of the median run.
+    """
+    startup_modules, _ = _importtime("pass")
+    startup = {name for name, _, _ in startup_modules}
+    samples = []
+    for _ in range(runs):
+        modules, wall = _importtime(statement)
+        modules = [module for module in modules if module[0] not in startup]
+        total = sum(cumulative for _, cumulative, top in modules if top)
+        samples.append((total, wall, modules))
+    samples.sort(key=lambda sample: sample[0])
+    median_total, _, modules = samples[len(samples) // 2]
+    slowest = sorted(modules, key=lambda module: -module[1])[:5]
+    return {
+        "runs": runs,
+        "import_ms": median_total,
+        "best_import_ms": samples[0][0],
+        "wall_ms": statistics.median(sample[1] for sample in samples),
+        "slowest": [[name, cumulative] for name, cumulative, _ in slowest],
+    }
+
+
+def measure_menu(runs: int, timeout: float = 30.0) -> Dict[str, Any]:
+    """Measure the wall time from starting `main.py` to its first menu prompt.
+
+    Args:
+        runs (int): The number of times to start `main.py`.
+        timeout (float): The maximum time in seconds to wait for the prompt (default is 30).
+
+    Returns:
+        Dict[str, Any]: The median and best times in milliseconds.
+    """
+    samples = []
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    env.pop("API_CLIENT_CACHE", None)
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "main.py"],
+            cwd=ROOT,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        assert process.stdout is not None
+        output = b""
+        try:
+            while PROMPT not in output:
+                chunk = os.read(process.stdout.fileno(), 4096)
+                if not chunk or time.perf_counter() - start > timeout:
+                    raise RuntimeError(f"main.py did not show its menu: {output!r}")
+                output += chunk
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            process.kill()
+            process.wait()
+    return {
+        "runs": runs,
+        "wall_ms": statistics.median(samples),
+        "best_wall_ms": min(samples),
+    }
+
+
+def run(runs: int = 5, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the startup benchmark.
+
+    Args:
+        runs (int): The number of fresh interpreters per case (default is 5).
+        only (Optional[List[str]]): The names of the cases to run (default is None, all cases).
+
+    Returns:
+        Dict[str, Any]: The parameters of the run and the metrics of each case.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, statement in IMPORT_CASES.items():
+        if not only or name in only:
+            results[name] = measure_import(statement, runs)
+    if not only or "main.py" in only:
+        results["main.py"] = measure_menu(runs)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "runs": runs,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+    min_delta_ms: float = 5.0,
+) -> List[str]:
+    """List the cases whose startup time grew by more than `threshold` compared with a baseline run.
+
+    Args:
+        current (Dict[str, Any]): The results of this run.
+        baseline (Dict[str, Any]): The results of the baseline run.
+        threshold (float): The tolerated relative growth, for example 0.2 for 20%.
+        min_delta_ms (float): The growth in milliseconds below which a case is never flagged, so that the
+            noise on near-zero times is ignored (default is 5).
+
+    Returns:
+        List[str]: A description of each regression.
+    """
+    regressions = []
+    for name, metrics in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        metric = "import_ms" if "import_ms" in metrics else "wall_ms"
+        delta = metrics[metric] - before[metric]
+        if delta > min_delta_ms and delta > threshold * before[metric]:
+            change = delta / before[metric] if before[metric] else float("inf")
+            regressions.append(f"{name}: {metric} {change:+.1%}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--runs", type=int, default=5, help="fresh interpreters per case"
+    )
+    parser.add_argument("--only", nargs="*", help="names of the cases to run")
+    parser.add_argument(
+        "--output", default="startup_results.json", help="JSON results file"
+    )
+    parser.add_argument("--compare", help="JSON results of a baseline run")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="tolerated startup growth"
+    )
+    args = parser.parse_args(argv)
+
+    report = run(args.runs, args.only)
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+
+    print(f"{'case':32}{'import ms':>11}{'wall ms':>10}  slowest modules")
+    for name, metrics in report["results"].items():
+        import_ms = metrics.get("import_ms")
+        slowest = ", ".join(
+            f"{module} {ms:.1f}" for module, ms in metrics.get("slowest", [])[:3]
+        )
+        print(
+            f"{name:32}{'' if import_ms is None else f'{import_ms:.1f}':>11}"
+            f"{metrics['wall_ms']:10.1f}  {slowest}"
+        )
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,104 @@
+import argparse
+import os
+import sys
+
 from app.api_client import ApiClient
+from app.cache import Cache, ResponseCache
+from app.data import COLLECTIONS, FORMATS
 from app.menu import Menu
 
-
 if __name__ == "__main__":
 
     url_adress = "https://jsonplaceholder.typicode.com"
 
-    api_client = ApiClient(url_adress)
+    parser = argparse.ArgumentParser(description="Client for the JSONPlaceholder API.")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="run the JSON commands of FILE, or of stdin if FILE is -, and print NDJSON results",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=10, help="concurrent commands in batch mode"
+    )
+    parser.add_argument(
+        "--export",
+        metavar="DIR",
+        help="export the collections to DIR, one file per collection, and exit",
+    )
+    parser.add_argument(
+        "--collections",
+        nargs="*",
+        choices=COLLECTIONS,
+        default=list(COLLECTIONS),
+        help="collections to export",
+    )
+    parser.add_argument(
+        "--format", choices=FORMATS, default="ndjson", help="format of the export"
+    )
+    parser.add_argument(
+        "--compress", action="store_true", help="gzip the exported files"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        help="worker processes encoding the export, 0 for none (default: CPUs)",
+    )
+    args = parser.parse_args()
+
+    # Set API_CLIENT_CACHE to the path of a database file to keep the cache between runs.
+    cache_path = os.environ.get("API_CLIENT_CACHE")
+    cache: Cache
+    if cache_path:
+        from app.cache import SqliteCache
+
+        cache = SqliteCache(cache_path, ttls={"/users": 300})
+    else:
+        cache = ResponseCache(ttls={"/users": 300})
+    api_client = ApiClient(url_adress, pool_maxsize=args.workers, cache=cache)
+
+    # The batch and export modes are imported only when used, to keep the menu quick to start.
+    if args.batch:
+        from app.batch import run_batch
+
+        commands = sys.stdin if args.batch == "-" else open(args.batch)
+        with api_client, commands:
+            summary = run_batch(api_client, commands, sys.stdout, args.workers)
+        print(
+            f"{summary['commands']} commands, {summary['failed']} failed "
+            f"in {summary['seconds']:.2f}s",
+            file=sys.stderr,
+        )
+        sys.exit(1 if summary["failed"] else 0)
+
+    if args.export:
+        from app.export import export_dataset
+
+        with api_client:
+            report = export_dataset(
+                api_client,
+                args.export,
+                args.collections,
+                args.format,
+                args.compress,
+                args.processes,
+            )
+        for name, collection in report["collections"].items():
+            status = collection["error"]["error"] if "error" in collection else "ok"
+            print(
+                f"{name}: {collection['records']} records, {collection['bytes']} bytes "
+                f"to {collection['path']} ({status})",
+                file=sys.stderr,
+            )
+        print(
+            f"{report['records']} records, {report['bytes']} bytes in {report['seconds']:.2f}s "
+            f"({report['records_per_second']:.0f} records/s, "
+            f"{report['bytes_per_second'] / 1e6:.2f} MB/s)",
+            file=sys.stderr,
+        )
+        failed = any(
+            "error" in collection for collection in report["collections"].values()
+        )
+        sys.exit(1 if failed else 0)
 
     menu = Menu(api_client)
     menu.run()
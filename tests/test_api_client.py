@@ -1,7 +1,14 @@
+import json
+import threading
+import time
+import requests
 import requests_mock
 import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from benchmarks.server import StandInServer, make_dataset
 from app.api_client import ApiClient
-from typing import Dict
+from app.data import Comment, Post
+from typing import Dict, List, Union
 
 adapter = requests_mock.Adapter()
 
@@ -313,6 +320,19 @@ def test_update_post(
         assert response == expected_result
 
 
+def test_update_post_leaves_out_unset_fields(api_client: ApiClient):
+    """Test that the fields of a model left unset are not sent as nulls that would clear them.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    url = "https://jsonplaceholder.typicode.com/posts/1"
+    with requests_mock.Mocker() as mock:
+        mock.put(url, json={"id": 1})
+        api_client.update_post("1", Post(title="Title", body="Body").to_json())
+        assert mock.last_request.json() == {"title": "Title", "body": "Body"}
+
+
 @pytest.mark.delete
 @pytest.mark.parametrize(
     "post_id, status_code, expected_result",
@@ -341,3 +361,252 @@ def test_delete_post(
         mock.delete(url, status_code=status_code)
         response = api_client.delete_post(post_id=post_id)
         assert response == expected_result
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler that counts the TCP connections opened by the client."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self) -> None:
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self) -> None:
+        body = json.dumps({"id": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """Fixture to start a local keep-alive HTTP server in a background thread."""
+    _CountingHandler.connections = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.get
+@pytest.mark.parametrize("keep_alive, expected_connections", [(True, 1), (False, 5)])
+def test_connection_reuse(
+    keep_alive: bool, expected_connections: int, local_server: str
+):
+    """Test that the pooled session reuses a single connection for repeated calls.
+
+    Args:
+        keep_alive (bool): Whether the client keeps the connections open.
+        expected_connections (int): The number of connections the server should see.
+        local_server (str): The base URL of the local server.
+    """
+    with ApiClient(local_server, keep_alive=keep_alive) as api_client:
+        for _ in range(5):
+            assert api_client.get_posts("1") == {"id": 1}
+    assert _CountingHandler.connections == expected_connections
+
+
+@pytest.mark.get
+def test_get_posts_many(api_client: ApiClient):
+    """Test that `get_posts_many` keeps the input order and reports per-ID errors.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    url = "https://jsonplaceholder.typicode.com/posts/"
+    with requests_mock.Mocker() as mock:
+        for post_id in range(1, 21):
+            mock.get(url + str(post_id), json={"id": post_id})
+        mock.get(url + "404", status_code=404)
+        mock.get(url + "500", exc=requests.exceptions.ConnectTimeout("timed out"))
+        response = api_client.get_posts_many(
+            [*range(20, 0, -1), "404", "500"], max_workers=4
+        )
+    assert response[:20] == [{"id": post_id} for post_id in range(20, 0, -1)]
+    assert response[20] == {
+        "error": "Failed to fetch post 404.",
+        "status_code": 404,
+        "reason": None,
+    }
+    assert response[21] == {
+        "error": "Failed to fetch post 500.",
+        "status_code": None,
+        "reason": "timed out",
+    }
+
+
+@pytest.mark.get
+def test_iter_posts(api_client: ApiClient):
+    """Test that `iter_posts` walks every page until a short page is returned.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    url = "https://jsonplaceholder.typicode.com/posts?userId=1&_limit=2&_start="
+    posts = [{"id": post_id, "userId": 1} for post_id in range(5)]
+    with requests_mock.Mocker() as mock:
+        for start in (0, 2, 4):
+            mock.get(url + str(start), json=posts[start : start + 2], complete_qs=True)
+        assert list(api_client.iter_posts(user_id="1", page_size=2)) == posts
+        assert mock.call_count == 3
+
+
+@pytest.mark.get
+def test_iter_comments_stops_on_error(api_client: ApiClient):
+    """Test that `iter_comments` yields the error message of a failed page and stops.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    url = "https://jsonplaceholder.typicode.com/comments?_limit=1&_start="
+    with requests_mock.Mocker() as mock:
+        mock.get(url + "0", json=[{"id": 1}], complete_qs=True)
+        mock.get(url + "1", status_code=500, complete_qs=True)
+        assert list(api_client.iter_comments(page_size=1)) == [
+            {"id": 1},
+            {
+                "error": "Failed to fetch comments from 1.",
+                "status_code": 500,
+                "reason": None,
+            },
+        ]
+
+
+@pytest.mark.create
+def test_create_posts_bulk(api_client: ApiClient):
+    """Test that `create_posts_bulk` keeps the input order, accepts models and reports per-item errors.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+
+    def create(request, context):
+        post = request.json()
+        if post["title"] == "timeout":
+            raise requests.exceptions.ConnectTimeout("timed out")
+        if post["title"] == "bad":
+            context.status_code = 400
+            return {}
+        context.status_code = 201
+        return dict(post, id=int(post["title"]) + 100)
+
+    posts = [{"title": str(i), "body": "body", "userId": 1} for i in range(20)]
+    items: List[Union[Dict, Post]] = [
+        Post(title="20", body="body", userId=1),
+        *posts,
+        {"title": "bad"},
+        {"title": "timeout"},
+    ]
+    with requests_mock.Mocker() as mock:
+        mock.post("https://jsonplaceholder.typicode.com/posts", json=create)
+        bulk = api_client.create_posts_bulk(iter(items), max_workers=4)
+    results = bulk["results"]
+    assert results[0]["id"] == 120
+    assert [result["id"] for result in results[1:21]] == list(range(100, 120))
+    assert results[21] == {
+        "error": "Failed to create post.",
+        "status_code": 400,
+        "reason": None,
+    }
+    assert results[22] == {
+        "error": "Failed to create post.",
+        "status_code": None,
+        "reason": "timed out",
+    }
+    summary = bulk["summary"]
+    assert (summary["items"], summary["succeeded"], summary["failed"]) == (23, 21, 2)
+    assert summary["items_per_second"] > 0
+
+
+@pytest.mark.create
+def test_create_comments_bulk_dedup(api_client: ApiClient):
+    """Test that identical comments are created once when deduplication is on.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    comment = {"name": "n", "email": "e", "body": "b", "postId": 1}
+    with requests_mock.Mocker() as mock:
+        mock.post(
+            "https://jsonplaceholder.typicode.com/comments",
+            json=dict(comment, id=501),
+            status_code=201,
+        )
+        bulk = api_client.create_comments_bulk(
+            [comment, dict(reversed(comment.items())), comment], dedup=True
+        )
+        assert mock.call_count == 1
+    assert bulk["results"] == [dict(comment, id=501)] * 3
+    assert bulk["results"][0] is not bulk["results"][1]
+    assert bulk["summary"]["deduplicated"] == 2 and bulk["summary"]["requests"] == 1
+
+
+@pytest.mark.get
+def test_get_user_with_posts_and_comments():
+    """Test that the profile is assembled from the nested routes in two round trips."""
+    dataset = make_dataset(users=2, posts_per_user=4, comments_per_post=3)
+    with StandInServer(dataset, latency=0.1) as server, ApiClient(
+        server.url
+    ) as api_client:
+        start = time.perf_counter()
+        profile = api_client.get_user_with_posts_and_comments("2")
+        elapsed = time.perf_counter() - start
+        assert server.requests == 2 + 4
+    assert elapsed < 0.3
+    assert profile.user.id == 2
+    assert [post.id for post in profile.posts] == [5, 6, 7, 8]
+    assert [comment.postId for comment in profile.comments[5]] == [5, 5, 5]
+    assert isinstance(profile.comments[8][0], Comment)
+    assert profile.to_json()["posts"][0]["comments"][0] == dataset["comments"][12]
+
+
+@pytest.mark.get
+def test_get_user_with_posts_and_comments_error(api_client: ApiClient):
+    """Test that the error message of a failed nested request is returned.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    base = "https://jsonplaceholder.typicode.com"
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            base + "/users/1",
+            json={"id": 1, "name": "n", "username": "u", "email": "e"},
+        )
+        mock.get(base + "/users/1/posts", json=[{"id": 1, "title": "t", "body": "b"}])
+        mock.get(base + "/posts/1/comments", status_code=500, reason="Boom")
+        result = api_client.get_user_with_posts_and_comments("1")
+    assert result == {
+        "error": "Failed to fetch comments of post 1.",
+        "status_code": 500,
+        "reason": "Boom",
+    }
+
+
+@pytest.mark.get
+def test_read_methods_fields():
+    """Test that the read methods and the iterators keep only the requested fields."""
+    fields = ["id", "name", "address.geo.lat"]
+    dataset = make_dataset(users=3, posts_per_user=2)
+    with StandInServer(dataset) as server, ApiClient(server.url) as api_client:
+        user = api_client.get_user("2", fields=fields)
+        users = api_client.get_all_users(fields=["id"])
+        many = api_client.get_posts_many([1, 2], fields=["title"])
+        paged = list(api_client.iter_users(page_size=2, fields=fields))
+        streamed = list(api_client.stream_posts("1", fields=["id", "userId"]))
+        with pytest.raises(ValueError):
+            api_client.get_user("2", as_model=True, fields=fields)
+    assert user == {"id": 2, "name": "User 2", "address": {"geo": {"lat": "-37.3159"}}}
+    assert users == [{"id": 1}, {"id": 2}, {"id": 3}]
+    assert many == [{"title": post["title"]} for post in dataset["posts"][:2]]
+    assert paged[1] == user and len(paged) == 3
+    assert streamed == [{"id": 1, "userId": 1}, {"id": 2, "userId": 1}]
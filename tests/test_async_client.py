@@ -0,0 +1,146 @@
+import asyncio
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from benchmarks.server import StandInServer, make_dataset
+from app.async_client import AsyncApiClient
+from typing import Dict
+
+POST = {"userId": 1, "id": 3, "title": "title", "body": "body"}
+
+
+def _make_app() -> web.Application:
+    """Create a small JSONPlaceholder stand-in serving post 3 and accepting new posts."""
+
+    async def get_post(request: web.Request) -> web.Response:
+        if request.match_info["post_id"] == "3":
+            return web.json_response(POST)
+        return web.json_response({}, status=404)
+
+    async def create_post(request: web.Request) -> web.Response:
+        post = await request.json()
+        if post.get("id") is None:
+            post["id"] = 101
+        return web.json_response(post, status=201)
+
+    async def delete_post(request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/posts/{post_id}", get_post)
+    app.router.add_post("/posts", create_post)
+    app.router.add_delete("/posts/{post_id}", delete_post)
+    return app
+
+
+async def _run(coroutine_factory):
+    """Start the stand-in server and run `coroutine_factory(client)` against it."""
+    async with TestServer(_make_app()) as server:
+        async with AsyncApiClient(str(server.make_url(""))) as api_client:
+            return await coroutine_factory(api_client)
+
+
+@pytest.mark.get
+@pytest.mark.parametrize(
+    "post_id, expected_result",
+    [
+        ("3", POST),
+        (
+            "111",
+            {
+                "error": "Failed to fetch post 111.",
+                "status_code": 404,
+                "reason": "Not Found",
+            },
+        ),
+    ],
+)
+def test_async_get_posts(post_id: str, expected_result: Dict):
+    """Test the `get_posts` coroutine of the AsyncApiClient for a success and a failure scenario.
+
+    Args:
+        post_id (str): The id of the post.
+        expected_result (Dict): The expected response of the API.
+    """
+    response = asyncio.run(_run(lambda api_client: api_client.get_posts(post_id)))
+    assert response == expected_result
+
+
+@pytest.mark.create
+def test_async_create_post():
+    """Test that the `create_post` coroutine sends the post data as JSON and returns the created post."""
+    post_data = {"title": "title", "body": "body", "userId": 5, "id": None}
+    response = asyncio.run(_run(lambda api_client: api_client.create_post(post_data)))
+    assert response == {"title": "title", "body": "body", "userId": 5, "id": 101}
+
+
+@pytest.mark.delete
+def test_async_delete_post():
+    """Test the `delete_post` coroutine of the AsyncApiClient."""
+    response = asyncio.run(_run(lambda api_client: api_client.delete_post("6")))
+    assert response == {"message": "Post 6 deleted successfully."}
+
+
+@pytest.mark.get
+def test_async_concurrent_requests():
+    """Test that many concurrent requests share the pooled session on one event loop."""
+
+    async def fetch_many(api_client: AsyncApiClient):
+        return await asyncio.gather(*(api_client.get_posts("3") for _ in range(200)))
+
+    responses = asyncio.run(_run(fetch_many))
+    assert responses == [POST] * 200
+
+
+@pytest.mark.get
+def test_async_get_posts_many():
+    """Test that `get_posts_many` keeps the input order and reports per-ID errors."""
+    response = asyncio.run(
+        _run(lambda api_client: api_client.get_posts_many(["3", "7", "3"], 2))
+    )
+    assert response == [
+        POST,
+        {"error": "Failed to fetch post 7.", "status_code": 404, "reason": "Not Found"},
+        POST,
+    ]
+
+
+@pytest.mark.create
+def test_async_create_posts_bulk():
+    """Test that `create_posts_bulk` keeps the input order and deduplicates identical posts."""
+    posts = [{"title": str(i), "body": "body", "userId": 1, "id": i} for i in range(10)]
+
+    async def create(api_client):
+        return await api_client.create_posts_bulk(
+            posts + posts[:3], concurrency=4, dedup=True
+        )
+
+    bulk = asyncio.run(_run(create))
+    assert bulk["results"] == posts + posts[:3]
+    assert bulk["summary"]["deduplicated"] == 3 and bulk["summary"]["failed"] == 0
+
+
+@pytest.mark.get
+def test_async_get_user_with_posts_and_comments():
+    """Test that the async profile is assembled from the nested routes with the same requests."""
+    dataset = make_dataset(users=2, posts_per_user=3, comments_per_post=2)
+
+    async def fetch(url):
+        async with AsyncApiClient(url) as api_client:
+            return await api_client.get_user_with_posts_and_comments("1")
+
+    with StandInServer(dataset) as server:
+        profile = asyncio.run(fetch(server.url))
+        assert server.requests == 2 + 3
+    assert profile.user.name == "User 1"
+    assert [post.id for post in profile.posts] == [1, 2, 3]
+    assert [comment.id for comment in profile.comments[2]] == [3, 4]
+
+
+@pytest.mark.get
+def test_async_get_posts_fields():
+    """Test that the async read methods keep only the requested fields."""
+    post = asyncio.run(
+        _run(lambda api_client: api_client.get_posts("3", fields=["id", "title"]))
+    )
+    assert post == {"id": 3, "title": "title"}
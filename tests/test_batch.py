@@ -0,0 +1,74 @@
+import io
+import json
+import pytest
+import requests_mock
+from benchmarks.server import StandInServer
+from app.api_client import ApiClient
+from app.batch import parse_command, run_batch
+
+
+def test_parse_command():
+    """Test that the commands are mapped to the arguments of the client methods."""
+    assert parse_command('{"action": "get_user", "user_id": 3}') == ("get_user", ["3"])
+    assert parse_command(
+        '{"action": "update_post", "post_id": "1", "data": {"title": "t"}}'
+    ) == ("update_post", ["1", {"title": "t"}])
+    for line in ("[]", '{"action": "drop"}', '{"action": "get_post"}', "{"):
+        with pytest.raises(ValueError):
+            parse_command(line)
+
+
+def test_run_batch_streams_one_result_per_command():
+    """Test that every command gets one NDJSON result line, failures included."""
+    lines = [json.dumps({"action": "get_post", "post_id": i}) for i in range(1, 21)]
+    lines += [
+        "# a comment",
+        json.dumps({"action": "create_post", "data": {"title": "t", "userId": 1}}),
+        json.dumps({"action": "get_user", "user_id": 1000}),
+        json.dumps({"action": "get_all_users"}),
+        "not json",
+    ]
+    output = io.StringIO()
+    with StandInServer(latency=0.05) as server, ApiClient(server.url) as api_client:
+        summary = run_batch(api_client, iter(lines), output, max_workers=8)
+
+    results = {
+        result["line"]: result
+        for result in map(json.loads, output.getvalue().splitlines())
+    }
+    assert len(results) == 24 and 21 not in results
+    assert [results[i]["result"]["id"] for i in range(1, 21)] == list(range(1, 21))
+    assert results[22]["ok"] and results[22]["result"]["id"] == 101
+    assert not results[23]["ok"] and results[23]["result"]["status_code"] == 404
+    assert results[24]["ok"] and len(results[24]["result"]) == 10
+    assert not results[25]["ok"] and "Invalid JSON" in results[25]["error"]
+    assert (summary["commands"], summary["succeeded"], summary["failed"]) == (24, 22, 2)
+    # 20 reads of 50 ms on 8 workers take 3 rounds, not 20.
+    assert summary["seconds"] < 0.05 * 10
+
+
+def test_run_batch_reports_undecodable_responses():
+    """Test that a response that is not JSON fails its command without stopping the batch."""
+    lines = [json.dumps({"action": "get_post", "post_id": i}) for i in range(1, 5)]
+    output = io.StringIO()
+    with requests_mock.Mocker() as mock:
+        for post_id in range(1, 5):
+            mock.get(
+                f"https://jsonplaceholder.typicode.com/posts/{post_id}",
+                json={"id": post_id},
+            )
+        mock.get(
+            "https://jsonplaceholder.typicode.com/posts/3", text="<html>busy</html>"
+        )
+        api_client = ApiClient("https://jsonplaceholder.typicode.com")
+        summary = run_batch(api_client, lines, output, max_workers=2)
+
+    results = {
+        result["line"]: result
+        for result in map(json.loads, output.getvalue().splitlines())
+    }
+    assert not results[3]["ok"] and results[3]["result"]["error"] == (
+        "Failed to run get_post."
+    )
+    assert [results[i]["ok"] for i in (1, 2, 4)] == [True, True, True]
+    assert (summary["commands"], summary["failed"]) == (4, 1)
@@ -0,0 +1,40 @@
+from benchmarks import startup
+from benchmarks.run import compare, percentile, run
+from benchmarks.server import StandInServer
+from app.api_client import ApiClient
+
+
+def test_stand_in_server_routes():
+    """Test that the stand-in server answers like JSONPlaceholder."""
+    with StandInServer() as server, ApiClient(server.url) as api_client:
+        assert api_client.get_user("1")["username"] == "user1"
+        assert len(list(api_client.iter_posts(user_id="2", page_size=3))) == 10
+        assert api_client.get_posts("1000")["status_code"] == 404
+        assert api_client.create_post({"title": "t", "body": "b"})["id"] == 101
+
+
+def test_benchmark_suite_smoke():
+    """Test that the suite measures every case and flags throughput regressions."""
+    report = run(calls=3, bulk_calls=1)
+    assert "get_posts" in report["results"] and "stream_comments" in report["results"]
+    metrics = report["results"]["get_posts"]
+    assert metrics["p50_ms"] <= metrics["p99_ms"]
+    baseline = {"results": {"get_posts": dict(metrics, calls_per_second=1e12)}}
+    regressions = compare(report, baseline, 0.1)
+    assert len(regressions) == 1 and regressions[0].startswith("get_posts")
+
+
+def test_percentile_nearest_rank():
+    """Test that the percentiles take the smallest value with the given share of the values at or below it."""
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentile([float(n) for n in range(30)], 95) == 28.0
+    assert percentile([1.0], 99) == 1.0
+
+
+def test_startup_benchmark_smoke():
+    """Test that the startup benchmark measures the imports and the first menu prompt."""
+    report = startup.run(runs=1, only=["import app", "main.py"])
+    assert report["results"]["import app"]["import_ms"] >= 0
+    assert report["results"]["main.py"]["wall_ms"] > 0
+    baseline = {"results": {"main.py": {"wall_ms": 1.0}}}
+    assert startup.compare(report, baseline, 0.2)[0].startswith("main.py")
@@ -0,0 +1,142 @@
+import multiprocessing
+import requests_mock
+import pytest
+from app.api_client import ApiClient
+from app.cache import ResponseCache, SqliteCache
+
+URL = "https://jsonplaceholder.typicode.com"
+
+
+@pytest.fixture
+def api_client():
+    """Fixture to create an instance of the API client with a cache."""
+    return ApiClient(url_adress=URL, cache=ResponseCache(default_ttl=60))
+
+
+def test_cache_lru_eviction():
+    """Test that the cache evicts the least recently used entries past its limits."""
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.set("a", "/users", b"1234", None)
+    cache.set("b", "/users", b"1234", None)
+    cache.get("a")
+    cache.set("c", "/users", b"1234", None)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.set("d", "/users", b"12345678", None)
+    assert len(cache) == 1 and cache.size == 8
+
+
+@pytest.mark.get
+def test_fresh_entries_are_served_from_cache(api_client: ApiClient):
+    """Test that repeated reads of a fresh resource only hit the server once.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    with requests_mock.Mocker() as mock:
+        mock.get(URL + "/users", json=[{"id": 1}])
+        assert api_client.get_all_users() == [{"id": 1}]
+        assert api_client.get_all_users() == [{"id": 1}]
+        assert mock.call_count == 1
+
+
+@pytest.mark.get
+def test_stale_entries_are_revalidated(api_client: ApiClient):
+    """Test that a stale entry is revalidated with `If-None-Match` and a 304 reuses it.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    assert isinstance(api_client.cache, ResponseCache)
+    api_client.cache.ttls["/posts/{id}"] = 0
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            URL + "/posts/1",
+            [
+                {"json": {"id": 1}, "headers": {"ETag": 'W/"abc"'}},
+                {"status_code": 304},
+            ],
+        )
+        assert api_client.get_posts("1") == {"id": 1}
+        assert api_client.get_posts("1") == {"id": 1}
+        assert mock.request_history[1].headers["If-None-Match"] == 'W/"abc"'
+
+
+@pytest.mark.update
+def test_writes_invalidate_the_post(api_client: ApiClient):
+    """Test that a successful update or deletion drops the cached post.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            URL + "/posts/1", [{"json": {"id": 1}}, {"json": {"id": 1, "title": "new"}}]
+        )
+        mock.put(URL + "/posts/1", json={"id": 1, "title": "new"})
+        mock.delete(URL + "/posts/1")
+        api_client.get_posts("1")
+        api_client.update_post("1", {"title": "new"})
+        assert api_client.get_posts("1") == {"id": 1, "title": "new"}
+        api_client.delete_post("1")
+        assert isinstance(api_client.cache, ResponseCache)
+        assert len(api_client.cache) == 0
+
+
+def _fill_cache(path: str, worker: int) -> None:
+    """Write entries to a shared SQLite cache from another process."""
+    cache = SqliteCache(path, max_entries=1000)
+    for i in range(50):
+        cache.set(f"{worker}-{i}", "/posts/{id}", b"x" * 100, None)
+        cache.get(f"{worker}-{i}")
+
+
+def test_sqlite_cache_lru_eviction(tmp_path):
+    """Test that the SQLite cache evicts the least recently used entries past its limits."""
+    cache = SqliteCache(str(tmp_path / "cache.db"), max_entries=2, max_bytes=10)
+    cache.set("a", "/users", b"1234", None)
+    cache.set("b", "/users", b"1234", None)
+    cache.get("a")
+    cache.set("c", "/users", b"1234", None)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.set("d", "/users", b"12345678", None)
+    assert len(cache) == 1 and cache.size == 8
+
+
+def test_sqlite_cache_ttls_and_revalidation(tmp_path):
+    """Test that the entries expire after their TTL and can be refreshed or invalidated."""
+    cache = SqliteCache(str(tmp_path / "cache.db"), ttls={"/users": 0})
+    cache.set("users", "/users", b"[]", 'W/"abc"')
+    entry = cache.get("users")
+    assert entry is not None and not entry.is_fresh() and entry.etag == 'W/"abc"'
+    cache.ttls["/users"] = 60
+    cache.refresh("users", "/users")
+    assert cache.get("users").is_fresh()
+    cache.invalidate("users")
+    assert cache.get("users") is None
+
+
+@pytest.mark.get
+def test_sqlite_cache_warm_start(tmp_path):
+    """Test that a new client reuses the responses cached on disk by a previous one."""
+    path = str(tmp_path / "cache.db")
+    with requests_mock.Mocker() as mock:
+        mock.get(URL + "/users/1", json={"id": 1})
+        ApiClient(URL, cache=SqliteCache(path)).get_user("1")
+        assert ApiClient(URL, cache=SqliteCache(path)).get_user("1") == {"id": 1}
+        assert mock.call_count == 1
+
+
+def test_sqlite_cache_is_shared_by_processes(tmp_path):
+    """Test that several processes can write to the same cache file at once."""
+    path = str(tmp_path / "cache.db")
+    SqliteCache(path)
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_fill_cache, args=(path, i)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert len(SqliteCache(path)) == 200
@@ -0,0 +1,38 @@
+import pytest
+import requests_mock
+from app.api_client import ApiClient
+from app.codec import StdlibCodec, get_codec, orjson
+
+URL = "https://jsonplaceholder.typicode.com"
+POST = {"title": "tïtle", "body": "body", "userId": 1, "id": None}
+
+
+@pytest.mark.parametrize("name", ["json", "orjson"])
+def test_codecs_round_trip(name: str):
+    """Test that every codec encodes compact UTF-8 JSON and decodes it back."""
+    if name == "orjson" and orjson is None:
+        pytest.skip("orjson is not installed")
+    codec = get_codec(name)
+    assert codec.name == name
+    content = codec.dumps(POST)
+    assert content == StdlibCodec().dumps(POST)
+    assert codec.loads(content) == POST
+
+
+def test_unknown_codec():
+    """Test that an unknown codec name is rejected."""
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+@pytest.mark.create
+@pytest.mark.parametrize("codec", [None, StdlibCodec()])
+def test_writes_send_json_bodies(codec):
+    """Test that the write methods send their data as a JSON body, without the fields set to None."""
+    with requests_mock.Mocker() as mock:
+        mock.post(URL + "/posts", json=dict(POST, id=101), status_code=201)
+        response = ApiClient(URL, codec=codec).create_post(POST)
+        assert response == dict(POST, id=101)
+        request = mock.last_request
+        assert request.headers["Content-Type"].startswith("application/json")
+        assert request.json() == {k: v for k, v in POST.items() if v is not None}
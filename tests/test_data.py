@@ -0,0 +1,52 @@
+import requests_mock
+import pytest
+from app.api_client import ApiClient
+from app.data import Comment, Post, User
+
+USER = {
+    "id": 1,
+    "name": "Leanne Graham",
+    "username": "Bret",
+    "email": "Sincere@april.biz",
+    "address": {"street": "Kulas Light", "geo": {"lat": "-37.3159", "lng": "81.1496"}},
+    "phone": "1-770-736-8031 x56442",
+    "website": "hildegard.org",
+    "company": {"name": "Romaguera-Crona"},
+}
+POST = {"userId": 1, "id": 1, "title": "title", "body": "body"}
+COMMENT = {"postId": 1, "id": 1, "name": "name", "email": "email", "body": "body"}
+
+
+@pytest.mark.parametrize(
+    "model, data", [(User, USER), (Post, POST), (Comment, COMMENT)]
+)
+def test_json_round_trip(model, data):
+    """Test that `from_json` and `to_json` round trip the API data without copying it.
+
+    Args:
+        model: The model class.
+        data: The data returned by the API.
+    """
+    instance = model.from_json(data)
+    assert instance.to_json() == data
+    assert not hasattr(instance, "__dict__")
+
+
+def test_to_json_does_not_deep_copy():
+    """Test that the nested values of a user are shared, not copied."""
+    user = User.from_json(USER)
+    assert user.to_json()["address"] is USER["address"]
+
+
+@pytest.mark.get
+def test_get_user_as_model():
+    """Test that the read methods can return models, and still return the error messages."""
+    api_client = ApiClient(url_adress="https://jsonplaceholder.typicode.com")
+    url = "https://jsonplaceholder.typicode.com/users"
+    with requests_mock.Mocker() as mock:
+        mock.get(url + "/1", json=USER)
+        mock.get(url + "/11", status_code=404)
+        mock.get(url, json=[USER])
+        assert api_client.get_user("1", as_model=True) == User.from_json(USER)
+        assert api_client.get_all_users(as_model=True) == [User.from_json(USER)]
+        assert "error" in api_client.get_user("11", as_model=True)
@@ -0,0 +1,79 @@
+import csv
+import gzip
+import json
+
+import pytest
+import requests
+import requests_mock
+from benchmarks.server import StandInServer, make_dataset
+from app.api_client import ApiClient
+from app.export import export_collection, export_dataset, flatten
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_export_ndjson(tmp_path, processes):
+    """Test that every collection is exported in order, in chunks encoded by the worker processes."""
+    dataset = make_dataset(users=5, posts_per_user=4, comments_per_post=3)
+    with StandInServer(dataset) as server, ApiClient(server.url) as api_client:
+        report = export_dataset(
+            api_client, str(tmp_path), compress=True, processes=processes, chunk_size=7
+        )
+
+    for name in ("users", "posts", "comments"):
+        with gzip.open(tmp_path / f"{name}.ndjson.gz", "rt") as lines:
+            assert [json.loads(line) for line in lines] == dataset[name]
+        collection = report["collections"][name]
+        assert collection["records"] == len(dataset[name])
+        assert collection["bytes"] == (tmp_path / f"{name}.ndjson.gz").stat().st_size
+    assert report["records"] == 5 + 20 + 60
+    assert report["bytes"] == sum(c["bytes"] for c in report["collections"].values())
+    assert report["records_per_second"] > 0 and report["bytes_per_second"] > 0
+
+
+def test_export_csv_flattens_records(tmp_path):
+    """Test that the CSV export has one header row and dotted columns for the nested objects."""
+    dataset = make_dataset(users=3)
+    with StandInServer(dataset) as server, ApiClient(server.url) as api_client:
+        export_dataset(
+            api_client, str(tmp_path), ["users"], "csv", processes=0, chunk_size=2
+        )
+
+    with open(tmp_path / "users.csv", newline="") as rows:
+        users = list(csv.DictReader(rows))
+    assert [user["id"] for user in users] == ["1", "2", "3"]
+    assert users[0]["address.geo.lat"] == dataset["users"][0]["address"]["geo"]["lat"]
+
+
+def test_export_collection_stops_on_error(tmp_path):
+    """Test that the records before a failure are kept and the failure is reported."""
+    error = {"error": "Failed to fetch posts.", "status_code": 500, "reason": "Boom"}
+    path = str(tmp_path / "posts.ndjson")
+    report = export_collection([{"id": 1}, error, {"id": 2}], path)
+    assert report["records"] == 1 and report["error"] == error
+    with open(path) as lines:
+        assert lines.read() == '{"id":1}\n'
+
+
+def test_flatten():
+    """Test that the nested keys are joined with dots."""
+    assert flatten({"a": 1, "b": {"c": 2, "d": {"e": 3}}}) == {
+        "a": 1,
+        "b.c": 2,
+        "b.d.e": 3,
+    }
+
+
+def test_export_reports_connection_errors(tmp_path):
+    """Test that a collection that cannot be downloaded is reported without stopping the others."""
+    with requests_mock.Mocker() as mock:
+        mock.get("https://jsonplaceholder.typicode.com/users", json=[{"id": 1}])
+        mock.get(
+            "https://jsonplaceholder.typicode.com/posts", exc=requests.ConnectionError
+        )
+        api_client = ApiClient("https://jsonplaceholder.typicode.com")
+        report = export_dataset(
+            api_client, str(tmp_path), ["users", "posts"], processes=0
+        )
+
+    assert report["collections"]["users"]["records"] == 1
+    assert report["collections"]["posts"]["error"]["error"] == "Failed to fetch posts."
@@ -0,0 +1,72 @@
+import itertools
+import time
+import requests_mock
+from concurrent.futures import ThreadPoolExecutor
+from app.api_client import ApiClient
+from app.hedging import HedgePolicy
+
+
+def _slow_then_fast():
+    """Create a send function whose first call is slow and the following ones are fast."""
+    calls = itertools.count()
+
+    def send():
+        call = next(calls)
+        time.sleep(0.5 if call == 0 else 0.01)
+        return call
+
+    return send
+
+
+def test_hedge_wins_over_slow_attempt():
+    """Test that a slow first attempt is hedged and the hedge answer is used."""
+    policy = HedgePolicy(initial_delay=0.05)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        start = time.perf_counter()
+        assert policy.run(_slow_then_fast(), executor) == 1
+        assert time.perf_counter() - start < 0.4
+    assert policy.stats()["hedges_fired"] == 1
+    assert policy.stats()["hedges_won"] == 1
+
+
+def test_hedge_budget():
+    """Test that no hedge is sent once the budget is spent."""
+    policy = HedgePolicy(initial_delay=0.05, budget=0.0, burst=0.0)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert policy.run(_slow_then_fast(), executor) == 0
+    assert policy.stats()["hedges_fired"] == 0
+
+
+def test_hedge_delay_follows_percentile():
+    """Test that the hedge delay is taken from the recent latencies."""
+    policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0)
+    for latency in range(1, 11):
+        policy.record(latency / 100)
+    assert policy.delay() == 0.09
+
+    # Past the window, the oldest latencies are dropped: the last 1000 of them are 1 to 1000 ms.
+    policy = HedgePolicy(percentile=95, window=1000, min_delay=0)
+    for sample in range(1024):
+        policy.record((sample % 1000 + 1) / 1000)
+    assert policy.delay() == 0.95
+
+
+def test_hedge_delay_updates_once_the_window_is_full():
+    """Test that the hedge delay keeps following the latencies after the window is full."""
+    policy = HedgePolicy(window=1000, min_delay=0)
+    for _ in range(1000):
+        policy.record(0.01)
+    assert policy.delay() == 0.01
+    for _ in range(1000):
+        policy.record(1.0)
+    assert policy.delay() == 1.0
+
+
+def test_client_hedges_reads():
+    """Test that the read methods of the client go through the hedging policy."""
+    policy = HedgePolicy()
+    with ApiClient("https://jsonplaceholder.typicode.com", hedge=policy) as api_client:
+        with requests_mock.Mocker() as mock:
+            mock.get("https://jsonplaceholder.typicode.com/users/1", json={"id": 1})
+            assert api_client.get_user("1") == {"id": 1}
+    assert policy.stats()["requests"] == 1
@@ -0,0 +1,104 @@
+import socket
+
+import pytest
+import urllib3
+import requests
+import requests_mock
+from benchmarks.server import StandInServer
+from app.api_client import ApiClient
+from app.instrumentation import ClientStats, RequestEvent
+
+
+def test_hooks_receive_wire_events():
+    """Test that the hooks see the endpoint template, sizes, timings and connection reuse."""
+    events = []
+    with StandInServer() as server, ApiClient(
+        server.url, hooks=[events.append]
+    ) as api_client:
+        api_client.get_posts("1")
+        api_client.get_posts("2")
+        api_client.create_post({"title": "t", "body": "b", "userId": 1})
+
+    first, second, created = events
+    assert (first.method, first.endpoint, first.status_code) == (
+        "GET",
+        "/posts/{id}",
+        200,
+    )
+    assert first.url == server.url + "/posts/1"
+    assert first.reused is False and first.dns is not None and first.connect is not None
+    assert second.reused is True and second.connect is None
+    assert first.bytes_in > 0 and first.bytes_out > 0
+    assert 0 <= first.ttfb <= first.total
+    assert (created.method, created.endpoint, created.status_code) == (
+        "POST",
+        "/posts",
+        201,
+    )
+    assert created.bytes_out > first.bytes_out
+
+
+def test_stats_histograms_and_errors():
+    """Test that the stats aggregate the latencies and count the errors per endpoint."""
+    with requests_mock.Mocker() as mock:
+        mock.get("https://jsonplaceholder.typicode.com/posts/1", json={"id": 1})
+        mock.get("https://jsonplaceholder.typicode.com/posts/2", status_code=404)
+        mock.get(
+            "https://jsonplaceholder.typicode.com/posts/3",
+            exc=requests.ConnectionError,
+        )
+        api_client = ApiClient("https://jsonplaceholder.typicode.com")
+        api_client.get_posts("1")
+        api_client.get_posts("2")
+        with pytest.raises(requests.ConnectionError):
+            api_client.get_posts("3")
+
+    stats = api_client.stats()["endpoints"]["GET /posts/{id}"]
+    assert stats["count"] == 3
+    assert stats["errors"] == 2
+    assert stats["status_codes"] == {200: 1, 404: 1}
+    assert sum(stats["latency_buckets"].values()) == 3
+
+
+def test_client_stats_buckets():
+    """Test that the latencies fall into the right histogram buckets."""
+    stats = ClientStats()
+    for total in (0.0005, 0.03, 60.0):
+        stats(RequestEvent("GET", "/users", "", 200, 0, 0, total))
+    buckets = stats.snapshot()["GET /users"]["latency_buckets"]
+    assert buckets["0.001"] == 1 and buckets["0.05"] == 1 and buckets["+Inf"] == 1
+    stats.reset()
+    assert stats.snapshot() == {}
+
+
+@pytest.mark.parametrize("host", ["127.0.0.1", "localhost"])
+def test_failed_connection_is_attempted_once_and_not_reused(monkeypatch, host):
+    """Test that a connect timeout is not retried and that its event is not reported as reused."""
+    attempts = []
+
+    def create_connection(address, *args, **kwargs):
+        attempts.append(address)
+        raise socket.timeout("timed out")
+
+    monkeypatch.setattr(urllib3.util.connection, "create_connection", create_connection)
+    events = []
+    api_client = ApiClient(f"http://{host}:8080", hooks=[events.append])
+    with pytest.raises(requests.ConnectionError):
+        api_client.get_posts("1")
+    assert len(attempts) == 1
+    (event,) = events
+    assert event.reused is False and event.error is not None
+
+
+def test_failed_stream_emits_an_error_event():
+    """Test that a streamed request that cannot be sent is still recorded in the stats."""
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "https://jsonplaceholder.typicode.com/posts", exc=requests.ConnectionError
+        )
+        api_client = ApiClient("https://jsonplaceholder.typicode.com")
+        with pytest.raises(requests.ConnectionError):
+            list(api_client.stream_posts())
+
+    stats = api_client.stats()["endpoints"]["GET /posts"]
+    assert stats["count"] == 1 and stats["errors"] == 1
@@ -0,0 +1,86 @@
+import json
+import requests_mock
+import pytest
+from app.api_client import ApiClient
+from app.jsonstream import iter_json_array
+from typing import List
+
+RECORDS = [
+    {"id": 1, "name": "Leanne Graham", "address": {"geo": {"lat": "-37.3159"}}},
+    {"id": 2, "name": "Ervin Howell ünïcödé", "tags": ["a", "b"]},
+    12345,
+    'text with "quotes" and ] brackets',
+    None,
+    [],
+]
+
+
+def _split(data: bytes, size: int) -> List[bytes]:
+    """Split the data in chunks of `size` bytes."""
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 4096])
+def test_iter_json_array_any_chunking(chunk_size: int):
+    """Test that the decoded records do not depend on where the chunks are split.
+
+    Args:
+        chunk_size (int): The size of the chunks fed to the decoder.
+    """
+    data = json.dumps(RECORDS, indent=2, ensure_ascii=False).encode()
+    assert list(iter_json_array(_split(data, chunk_size))) == RECORDS
+
+
+@pytest.mark.parametrize(
+    "chunks, expected",
+    [
+        ([b"[-4.", b"5]"], [-4.5]),
+        ([b"[12e", b"3]"], [12e3]),
+        ([b"[1.5E", b"+2]"], [1.5e2]),
+        ([b"[1.5e-", b"2, 7]"], [1.5e-2, 7]),
+        ([b"[1", b"0, tr", b"ue]"], [10, True]),
+    ],
+)
+def test_iter_json_array_split_numbers(chunks: List[bytes], expected: List):
+    """Test that a number split inside its fraction or its exponent is read in full.
+
+    Args:
+        chunks (List[bytes]): The chunks fed to the decoder.
+        expected (List): The decoded elements.
+    """
+    assert list(iter_json_array(chunks)) == expected
+
+
+def test_iter_json_array_is_incremental():
+    """Test that the first record is yielded before the rest of the body is read."""
+
+    def chunks():
+        yield b'[{"id": 1}, '
+        raise AssertionError("The decoder read past the first record.")
+
+    assert next(iter_json_array(chunks())) == {"id": 1}
+
+
+@pytest.mark.parametrize("data", [b"", b'{"id": 1}', b"[1, 2", b"[1 2]"])
+def test_iter_json_array_malformed(data: bytes):
+    """Test that bodies which are not a well formed JSON array are rejected.
+
+    Args:
+        data (bytes): The malformed body.
+    """
+    with pytest.raises(ValueError):
+        list(iter_json_array([data]))
+
+
+@pytest.mark.get
+def test_stream_users():
+    """Test that `stream_users` yields the users and the error message of a failed request."""
+    api_client = ApiClient(url_adress="https://jsonplaceholder.typicode.com")
+    url = "https://jsonplaceholder.typicode.com/users"
+    with requests_mock.Mocker() as mock:
+        mock.get(url, json=RECORDS[:2])
+        assert list(api_client.stream_users()) == RECORDS[:2]
+        mock.get(url, status_code=503)
+        assert list(api_client.stream_users()) == [
+            {"error": "Failed to fetch users.", "status_code": 503, "reason": None}
+        ]
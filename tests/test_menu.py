@@ -0,0 +1,42 @@
+import time
+import pytest
+from benchmarks.server import StandInServer
+from app.api_client import ApiClient
+from app.cache import ResponseCache
+from app.menu import Menu
+
+
+def _typing(monkeypatch, answers):
+    """Feed the answers to `input`, waiting a little before each choice like an operator would."""
+    answers = iter(answers)
+
+    def fake_input(prompt: str) -> str:
+        if prompt.startswith("Enter your choice"):
+            time.sleep(0.2)
+        return next(answers)
+
+    monkeypatch.setattr("builtins.input", fake_input)
+
+
+def test_menu_prefetches_related_resources(monkeypatch, capsys):
+    """Test that the menu warms the cache so that the next choices do not wait for the server."""
+    _typing(monkeypatch, ["2", "1", "3", "5", "4", "21", "0"])
+    with StandInServer(latency=0.02) as server:
+        with ApiClient(server.url, cache=ResponseCache()) as api_client:
+            Menu(api_client).run()
+        # The users list, the posts of user 1 and the comments of post 5, and nothing else.
+        assert server.requests == 3
+    output = capsys.readouterr().out
+    assert (
+        "'username': 'user1'" in output and "'id': 21, 'name': 'comment 21'" in output
+    )
+
+
+@pytest.mark.parametrize("cache", [None, ResponseCache()])
+def test_menu_without_prefetch(monkeypatch, cache):
+    """Test that nothing is fetched in the background without a cache or with prefetching off."""
+    _typing(monkeypatch, ["2", "1", "0"])
+    with StandInServer() as server:
+        with ApiClient(server.url, cache=cache) as api_client:
+            Menu(api_client, prefetch=cache is None).run()
+        assert server.requests == 1
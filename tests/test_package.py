@@ -0,0 +1,24 @@
+import subprocess
+import sys
+import pytest
+import app
+
+
+def test_lazy_attributes():
+    """Test that the package exposes its classes and rejects unknown names."""
+    from app.api_client import ApiClient
+
+    assert app.ApiClient is ApiClient
+    assert "SnapshotStore" in dir(app)
+    with pytest.raises(AttributeError):
+        app.Missing
+
+
+def test_import_does_not_load_http_libraries():
+    """Test that importing the package and its models leaves requests and aiohttp unloaded."""
+    code = (
+        "import sys, app; from app import User, Post;"
+        "assert 'requests' not in sys.modules and 'aiohttp' not in sys.modules;"
+        "app.ApiClient; assert 'requests' in sys.modules and 'aiohttp' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,35 @@
+import pytest
+from app.projection import compile_fields, project
+
+USER = {
+    "id": 1,
+    "name": "n",
+    "email": "e",
+    "address": {"city": "c", "geo": {"lat": "1", "lng": "2"}},
+    "company": {"name": "co"},
+}
+
+
+def test_compile_fields():
+    """Test that the dotted paths become a tree, a whole value winning over its nested paths."""
+    assert compile_fields(None) is None
+    assert compile_fields(["id", "address.geo.lat", "address.city"]) == {
+        "id": None,
+        "address": {"geo": {"lat": None}, "city": None},
+    }
+    assert compile_fields(["address", "address.geo"]) == {"address": None}
+    assert compile_fields(["address.geo", "address"]) == {"address": None}
+    assert compile_fields("name") == {"name": None}
+    for fields in ([], ["a..b"], [""]):
+        with pytest.raises(ValueError):
+            compile_fields(fields)
+
+
+def test_project():
+    """Test that only the requested paths are kept, in records and lists of records."""
+    projection = compile_fields(["id", "email", "address.geo.lat", "missing.key"])
+    expected = {"id": 1, "email": "e", "address": {"geo": {"lat": "1"}}}
+    assert project(USER, projection) == expected
+    assert project([USER, {"id": 2}], projection) == [expected, {"id": 2}]
+    assert project(USER, compile_fields(["company"]))["company"] is USER["company"]
+    assert project(USER, None) is USER
@@ -0,0 +1,144 @@
+import threading
+import time
+import requests_mock
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from typing import NamedTuple, Optional
+from app.api_client import ApiClient
+from app.scheduler import AdaptiveScheduler, parse_retry_after
+
+
+class _Reply(NamedTuple):
+    status_code: int
+    headers: dict
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("3", 3.0), ("-1", 0.0), (None, None), ("soon", None)],
+)
+def test_parse_retry_after(value: Optional[str], expected: Optional[float]):
+    """Test the parsing of `Retry-After` headers given in seconds.
+
+    Args:
+        value (Optional[str]): The value of the header.
+        expected (Optional[float]): The expected number of seconds.
+    """
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_date():
+    """Test the parsing of `Retry-After` headers given as an HTTP date."""
+    assert 5 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+def test_limit_increases_then_backs_off():
+    """Test that the limit grows with fast responses and is cut on throttling."""
+    scheduler = AdaptiveScheduler(initial_limit=4, max_retries=0)
+
+    def send():
+        time.sleep(0.002)
+        return _Reply(200, {})
+
+    for _ in range(20):
+        scheduler.run(send)
+    grown = scheduler.stats()["limit"]
+    assert grown > 6
+    scheduler.run(lambda: _Reply(429, {"Retry-After": "0"}))
+    assert scheduler.stats()["limit"] == pytest.approx(grown / 2)
+    assert scheduler.stats()["throttled"] == 1
+
+
+def test_limit_recovers_from_an_unusually_fast_response():
+    """Test that a fast response only lowers the baseline of its endpoint for a while."""
+
+    def reply(status_code, latency):
+        def send():
+            time.sleep(latency)
+            return _Reply(status_code, {})
+
+        return send
+
+    scheduler = AdaptiveScheduler(initial_limit=4, baseline_window=8)
+    scheduler.run(reply(304, 0), endpoint="/posts")
+    scheduler.run(reply(200, 0.002), endpoint="/users/{id}")
+    for _ in range(10):
+        scheduler.run(reply(200, 0.01), endpoint="/posts")
+    assert scheduler.stats()["limit"] > 4
+
+    scheduler = AdaptiveScheduler(initial_limit=4, baseline_window=8)
+    scheduler.run(reply(200, 0.002), endpoint="/posts")
+    for _ in range(40):
+        scheduler.run(reply(200, 0.01), endpoint="/posts")
+    assert scheduler.stats()["limit"] > 4
+
+
+def test_concurrency_limit():
+    """Test that no more requests than the limit are in flight at once."""
+    scheduler = AdaptiveScheduler(initial_limit=2, max_limit=2)
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def send():
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return _Reply(200, {})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: scheduler.run(send), range(32)))
+    assert peak == 2
+
+
+def test_rate_limit():
+    """Test that the token bucket paces the requests past the burst."""
+    scheduler = AdaptiveScheduler(rate=100, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        scheduler.run(lambda: _Reply(200, {}))
+    assert time.monotonic() - start >= 0.09
+
+
+def test_client_retries_throttled_requests():
+    """Test that a throttled request is retried after the `Retry-After` pause."""
+    scheduler = AdaptiveScheduler()
+    api_client = ApiClient("https://jsonplaceholder.typicode.com", scheduler=scheduler)
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "https://jsonplaceholder.typicode.com/users/1",
+            [
+                {"status_code": 429, "headers": {"Retry-After": "0.05"}},
+                {"json": {"id": 1}},
+            ],
+        )
+        assert api_client.get_user("1") == {"id": 1}
+    assert scheduler.stats()["retries"] == 1
+
+
+def test_streams_hold_a_slot_and_retry_throttled_requests():
+    """Test that a streamed request holds a slot until its body is read and is retried when throttled."""
+    scheduler = AdaptiveScheduler(initial_limit=1)
+    api_client = ApiClient("https://jsonplaceholder.typicode.com", scheduler=scheduler)
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            "https://jsonplaceholder.typicode.com/users",
+            [
+                {"status_code": 503, "headers": {"Retry-After": "0.05"}},
+                {"json": [{"id": 1}, {"id": 2}]},
+            ],
+        )
+        users = api_client.stream_users()
+        assert next(users) == {"id": 1}
+        assert scheduler.stats()["in_flight"] == 1
+        assert list(users) == [{"id": 2}]
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 0 and stats["retries"] == 1
+    assert api_client.stats()["endpoints"]["GET /users"]["status_codes"] == {
+        503: 1,
+        200: 1,
+    }
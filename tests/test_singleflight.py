@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+import pytest
+from benchmarks.server import StandInServer
+from app.api_client import ApiClient
+from app.async_client import AsyncApiClient
+from app.singleflight import SingleFlight
+
+
+def test_concurrent_reads_share_one_request():
+    """Test that concurrent reads of the same post send one request and each get their own copy."""
+    with StandInServer(latency=0.2) as server, ApiClient(server.url) as api_client:
+        posts = api_client.get_posts_many(["1"] * 8, max_workers=8)
+        assert server.requests == 1
+        assert all(post == posts[0] for post in posts) and posts[0]["id"] == 1
+        assert posts[0] is not posts[1]
+        assert api_client.stats()["coalescing"] == {"calls": 8, "coalesced": 7}
+
+        errors = api_client.get_posts_many(["1000"] * 4, max_workers=4)
+        assert server.requests == 2
+        assert all(error["status_code"] == 404 for error in errors)
+
+
+def test_coalescing_can_be_disabled():
+    """Test that every read sends its own request when coalescing is off."""
+    with StandInServer(latency=0.1) as server, ApiClient(
+        server.url, coalesce=False
+    ) as api_client:
+        api_client.get_posts_many(["1"] * 4, max_workers=4)
+        assert server.requests == 4
+
+
+def test_single_flight_shares_exceptions():
+    """Test that the callers waiting for a failed call get its exception, and that the key is freed."""
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait()
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flights.do("key", fail)
+        except ValueError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    while flights.stats()["coalesced"] == 0:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert flights.do("key", lambda: 1) == 1
+
+
+def test_async_concurrent_reads_share_one_request():
+    """Test that concurrent tasks reading the same user send one request."""
+
+    async def read_all(url):
+        async with AsyncApiClient(url) as api_client:
+            return await asyncio.gather(*(api_client.get_user("1") for _ in range(5)))
+
+    with StandInServer(latency=0.1) as server:
+        users = asyncio.run(read_all(server.url))
+        assert server.requests == 1
+        assert [user["id"] for user in users] == [1] * 5
+
+
+@pytest.mark.parametrize("coalesce", [True, False])
+def test_async_cancelled_waiter_does_not_cancel_others(coalesce):
+    """Test that cancelling one of the waiting tasks leaves the shared request running for the others."""
+
+    async def read(url):
+        async with AsyncApiClient(url, coalesce=coalesce) as api_client:
+            first = asyncio.ensure_future(api_client.get_posts("1"))
+            second = asyncio.ensure_future(api_client.get_posts("1"))
+            await asyncio.sleep(0.02)
+            first.cancel()
+            return await second
+
+    with StandInServer(latency=0.1) as server:
+        assert asyncio.run(read(server.url))["id"] == 1
@@ -0,0 +1,90 @@
+import requests_mock
+import pytest
+from app.api_client import ApiClient
+from app.store import SnapshotStore
+
+URL = "https://jsonplaceholder.typicode.com"
+USERS = [
+    {"id": 1, "name": "Leanne Graham", "username": "Bret", "email": "a@b.c"},
+    {"id": 2, "name": "Ervin Howell", "username": "Antonette", "email": "d@e.f"},
+]
+POSTS = [
+    {"userId": 1, "id": 1, "title": "first", "body": "body"},
+    {"userId": 1, "id": 2, "title": "second", "body": "body"},
+    {"userId": 2, "id": 3, "title": "third", "body": "body"},
+]
+COMMENTS = [
+    {"postId": 1, "id": 1, "name": "name", "email": "x@y.z", "body": "one"},
+    {"postId": 2, "id": 2, "name": "name", "email": "x@y.z", "body": "two"},
+    {"postId": 3, "id": 3, "name": "name", "email": "x@y.z", "body": "three"},
+]
+
+
+@pytest.fixture
+def api_client():
+    """Fixture to create an instance of the API client."""
+    return ApiClient(url_adress=URL)
+
+
+def test_snapshot_lookups(api_client: ApiClient):
+    """Test that the snapshot answers join-style lookups from its indexes.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    store = SnapshotStore()
+    with requests_mock.Mocker() as mock:
+        mock.get(URL + "/users", json=USERS)
+        mock.get(URL + "/posts", json=POSTS)
+        mock.get(URL + "/comments", json=COMMENTS)
+        result = store.refresh(api_client)
+    assert result["comments"] == {"added": 3, "updated": 0, "deleted": 0}
+    assert [post.id for post in store.posts_of_user(1)] == [1, 2]
+    assert [comment.body for comment in store.comments_on_posts_of_user(1)] == [
+        "one",
+        "two",
+    ]
+    user = store.get_user(2)
+    assert user is not None and user.username == "Antonette"
+
+
+def test_snapshot_incremental_refresh(api_client: ApiClient):
+    """Test that unchanged collections are revalidated and only changes are applied.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    store = SnapshotStore()
+    moved_post = dict(POSTS[1], userId=2)
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            URL + "/users",
+            [{"json": USERS, "headers": {"ETag": '"u1"'}}, {"status_code": 304}],
+        )
+        mock.get(URL + "/posts", [{"json": POSTS}, {"json": [POSTS[0], moved_post]}])
+        mock.get(URL + "/comments", json=COMMENTS)
+        store.refresh(api_client)
+        result = store.refresh(api_client)
+        assert mock.request_history[3].headers["If-None-Match"] == '"u1"'
+    assert result["users"] == {"added": 0, "updated": 0, "deleted": 0}
+    assert result["posts"] == {"added": 0, "updated": 1, "deleted": 1}
+    assert [post.id for post in store.posts_of_user(2)] == [2]
+    assert [post.id for post in store.posts_of_user(1)] == [1]
+
+
+def test_snapshot_refresh_error(api_client: ApiClient):
+    """Test that a failed collection is reported with an error message.
+
+    Args:
+        api_client (ApiClient): An instance of the ApiClient to test.
+    """
+    with requests_mock.Mocker() as mock:
+        mock.get(URL + "/users", status_code=500)
+        mock.get(URL + "/posts", json=[])
+        mock.get(URL + "/comments", json=[])
+        result = SnapshotStore().refresh(api_client)
+    assert result["users"] == {
+        "error": "Failed to refresh users.",
+        "status_code": 500,
+        "reason": None,
+    }
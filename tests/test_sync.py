@@ -0,0 +1,65 @@
+import json
+
+import requests_mock
+from benchmarks.server import StandInServer, make_dataset
+from app.api_client import ApiClient
+from app.sync import ChangeSet, DeltaSync, content_hash
+
+
+def test_delta_sync_change_sets():
+    """Test that a sync reports the added, updated and deleted records, revalidating the pages by ETag."""
+    dataset = make_dataset(users=2, posts_per_user=5, comments_per_post=1)
+    with StandInServer(dataset) as server, ApiClient(server.url) as api_client:
+        sync = DeltaSync(api_client, page_size=4)
+        first = sync.sync()
+        assert [len(first[name].added) for name in ("posts", "comments")] == [10, 10]
+        assert first["posts"].requests == 3
+
+        unchanged = sync.sync()
+        assert not unchanged["posts"] and not unchanged["comments"]
+        assert unchanged["posts"].not_modified == 3
+
+        posts = dataset["posts"]
+        posts[9] = dict(posts[9], title="edited")
+        posts.append(dict(posts[0], id=11))
+        deleted = posts.pop(1)
+        changes = sync.sync()["posts"]
+        assert changes.added == [posts[-1]]
+        assert changes.updated == [posts[8]]
+        assert changes.deleted == [deleted["id"]]
+        assert changes.requests == 3 and changes.not_modified == 0
+
+        # A new instance resumes from the saved state.
+        state = json.loads(json.dumps(sync.state))
+        resumed = DeltaSync(api_client, page_size=4, state=state).sync()
+        assert resumed["posts"].not_modified == 3 and not resumed["posts"]
+
+
+def test_delta_sync_keeps_state_on_error():
+    """Test that a failed page leaves the mirror as it was, so the next sync reports the changes."""
+    base = "https://jsonplaceholder.typicode.com"
+    api_client = ApiClient(base)
+    sync = DeltaSync(api_client, ["posts"], page_size=2)
+    with requests_mock.Mocker() as mock:
+        mock.get(base + "/posts?_start=0&_limit=2", json=[{"id": 1}, {"id": 2}])
+        mock.get(base + "/posts?_start=2&_limit=2", status_code=503, reason="Busy")
+        result = sync.sync_collection("posts")
+    assert result == {
+        "error": "Failed to sync posts from 2.",
+        "status_code": 503,
+        "reason": "Busy",
+    }
+    assert sync.state["posts"]["versions"] == {}
+
+    with requests_mock.Mocker() as mock:
+        mock.get(base + "/posts?_start=0&_limit=2", json=[{"id": 1}, {"id": 2}])
+        mock.get(base + "/posts?_start=2&_limit=2", json=[])
+        changes = sync.sync_collection("posts")
+    assert isinstance(changes, ChangeSet) and len(changes.added) == 2
+    assert sync.state["posts"]["pages"] == [{"etag": None, "ids": [1, 2]}]
+
+
+def test_content_hash_ignores_field_order():
+    """Test that the hash only depends on the content of the record."""
+    assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+    assert content_hash({"a": 1}) != content_hash({"a": 2})
@@ -0,0 +1,56 @@
+import pytest
+from app.data import Comment, Post
+from app.tables import CommentTable, PostTable
+
+POSTS = [
+    {"userId": user_id, "id": post_id, "title": f"título {post_id}", "body": "body"}
+    for post_id, user_id in enumerate([1, 2, 1, 3, 2, 1], start=1)
+]
+COMMENTS = [
+    {"postId": 1, "id": 1, "name": "name", "email": "a@b.c", "body": "first"},
+    {"postId": 2, "id": 2, "name": "name", "email": "d@e.f", "body": ""},
+]
+
+
+def test_rows_are_converted_lazily():
+    """Test that the rows of a table convert back to the models of the records."""
+    table = PostTable.from_records(POSTS)
+    assert len(table) == 6
+    assert table[0] == Post.from_json(POSTS[0])
+    assert table[-1] == Post.from_json(POSTS[-1])
+    assert list(CommentTable.from_records(COMMENTS)) == [
+        Comment.from_json(comment) for comment in COMMENTS
+    ]
+
+
+def test_group_by_and_filter():
+    """Test grouping and filtering on the integer columns."""
+    table = PostTable.from_records(POSTS)
+    groups = table.group_by("userId")
+    assert {user_id: list(rows) for user_id, rows in groups.items()} == {
+        1: [0, 2, 5],
+        2: [1, 4],
+        3: [3],
+    }
+    assert [post.id for post in table.rows(groups[2])] == [2, 5]
+    assert [post.id for post in table.filter(userId=1)] == [1, 3, 6]
+    assert list(table.where("title", lambda title: title.endswith("4"))) == [3]
+
+
+def test_missing_strings_round_trip():
+    """Test that a missing string comes back as None and an empty one as an empty string."""
+    posts = [
+        {"userId": 1, "id": index, "title": "t", "body": None if index % 3 else ""}
+        for index in range(1, 11)
+    ]
+    table = PostTable.from_records(posts)
+    assert list(table) == [Post.from_json(post) for post in posts]
+    assert list(table.take([9, 2]).column("body")) == [None, ""]
+    with pytest.raises(IndexError):
+        table.column("body")[10]
+
+
+def test_error_records_are_rejected():
+    """Test that an error message from the API is not stored as a row."""
+    with pytest.raises(ValueError, match="Failed to fetch posts"):
+        PostTable.from_records([{"error": "Failed to fetch posts from 0."}])
@@ -0,0 +1,102 @@
+import time
+
+import pytest
+import requests
+from benchmarks.server import StandInServer
+from app.api_client import ApiClient
+from app.transport import Cassette, RecordingTransport, ReplayTransport
+
+
+def _record(path):
+    """Record a few exchanges against the stand-in server and save them to a cassette."""
+    cassette = Cassette()
+    with StandInServer() as server, ApiClient(
+        server.url, transport=RecordingTransport(cassette)
+    ) as api_client:
+        recorded = {
+            "post": api_client.get_posts("1"),
+            "user": api_client.get_user("2"),
+            "missing": api_client.get_posts("1000"),
+            "created": api_client.create_post({"title": "t", "body": "b", "userId": 1}),
+            "stream": list(api_client.stream_posts("1")),
+        }
+        requests_seen = server.requests
+    cassette.save(path)
+    return recorded, requests_seen
+
+
+def test_replay_matches_recording(tmp_path):
+    """Test that a saved cassette answers the same requests offline with the same results."""
+    path = str(tmp_path / "exchanges.ndjson.gz")
+    recorded, requests_seen = _record(path)
+    cassette = Cassette.load(path)
+    assert len(cassette) == requests_seen == 5
+
+    transport = ReplayTransport(cassette)
+    with ApiClient("http://replay.invalid", transport=transport) as api_client:
+        assert api_client.get_posts("1") == recorded["post"]
+        assert api_client.get_user("2") == recorded["user"]
+        assert api_client.get_posts("1000") == recorded["missing"]
+        assert api_client.create_post({"title": "t"}) == recorded["created"]
+        assert list(api_client.stream_posts("1")) == recorded["stream"]
+        # The exchanges of a path start over once they were all replayed.
+        assert api_client.get_posts("1") == recorded["post"]
+        with pytest.raises(requests.ConnectionError):
+            api_client.get_posts("2")
+    assert transport.replayed == 6
+    assert api_client.stats()["endpoints"]["GET /posts/{id}"]["count"] == 4
+
+
+def test_replay_latency_and_jitter():
+    """Test that the replayed responses are delayed by the latency and the jitter."""
+    cassette = Cassette()
+    cassette.add("GET", "http://a/posts/1", 200, "OK", {}, b'{"id": 1}', 0.05)
+    transport = ReplayTransport(cassette, latency=0.02, jitter=0.02, seed=1)
+    with ApiClient("http://b", transport=transport, coalesce=False) as api_client:
+        start = time.perf_counter()
+        for _ in range(5):
+            assert api_client.get_posts("1") == {"id": 1}
+        elapsed = time.perf_counter() - start
+    assert 0.1 <= elapsed < 0.5
+
+    replayed = ReplayTransport(cassette, recorded_latency=True)
+    with ApiClient("http://b", transport=replayed) as api_client:
+        start = time.perf_counter()
+        api_client.get_posts("1")
+        assert time.perf_counter() - start >= 0.05
+
+
+def test_cassette_keeps_binary_bodies(tmp_path):
+    """Test that the bodies that are not UTF-8 are kept in base64."""
+    cassette = Cassette()
+    cassette.add(
+        "GET", "http://a/blob?x=1", 200, "OK", {"ETag": '"v1"'}, b"\xff\x00", 0
+    )
+    path = str(tmp_path / "exchanges.ndjson")
+    cassette.save(path)
+    (exchange,) = Cassette.load(path).exchanges
+    assert exchange["u"] == "/blob?x=1" and exchange["h"] == {"ETag": '"v1"'}
+
+    session = requests.Session()
+    session.mount("http://", ReplayTransport(Cassette([exchange])))
+    response = session.get("http://other/blob?x=1")
+    assert response.content == b"\xff\x00"
+    assert response.headers["etag"] == '"v1"'
+
+
+def test_cassette_finds_headers_whatever_their_case():
+    """Test that the recorded headers are kept when the server sends them in lowercase."""
+    cassette = Cassette()
+    cassette.add(
+        "GET",
+        "http://a/posts",
+        200,
+        "OK",
+        {"etag": '"v1"', "content-type": "application/json", "x-other": "1"},
+        b"[]",
+        0,
+    )
+    assert cassette.exchanges[0]["h"] == {
+        "Content-Type": "application/json",
+        "ETag": '"v1"',
+    }